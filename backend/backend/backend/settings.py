@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
 import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -262,6 +263,12 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# File uploads
+# https://docs.djangoproject.com/en/4.2/ref/settings/#file-upload-max-memory-size
+# Uploads up to 16 MiB (most frontend dist bundles) stay in memory; larger
+# ones are spooled to a temporary file by Django's upload handler
+FILE_UPLOAD_MAX_MEMORY_SIZE = 16 * 1024 * 1024
+
 # ----------------------------------------------------------------------------
 # Environment / Debug
 # ----------------------------------------------------------------------------
@@ -337,6 +344,11 @@ LOGGING = {
             'level': 'INFO',
             'propagate': True,
         },
+        'dashboard': {
+            'handlers': ['file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
@@ -393,6 +405,14 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Encode JSON responses with orjson when drf-orjson-renderer is installed;
+# large payloads such as deployment logs serialize much faster
+if importlib.util.find_spec('drf_orjson_renderer') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'drf_orjson_renderer.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+
 # OAuth2 Provider settings
 OAUTH2_PROVIDER = {
     'OAUTH2_VALIDATOR_CLASS': 'authentication.custom_oauth2_validator.CustomOAuth2Validator',
@@ -168,6 +168,8 @@ def get_backend_public_key():
 # --- Simple encryption/decryption for secrets (using AES-GCM) ---
 from cryptography.fernet import Fernet
 from django.conf import settings
+from functools import lru_cache
+import hmac
 
 def get_secret_key():
     """Get or generate encryption key for secrets"""
@@ -179,15 +181,26 @@ def get_secret_key():
     # Fernet requires base64-encoded 32-byte key
     return base64.urlsafe_b64encode(hashed)
 
+@lru_cache(maxsize=4)
+def _secret_fernet(key: bytes) -> Fernet:
+    """Fernet instance for a secret key, built once instead of per value"""
+    return Fernet(key)
+
 def encrypt_value(value: str) -> str:
     """Encrypt a string value for storage"""
-    f = Fernet(get_secret_key())
+    f = _secret_fernet(get_secret_key())
     encrypted = f.encrypt(value.encode())
     return base64.b64encode(encrypted).decode()
 
+def digest_value(value: str) -> str:
+    """Keyed digest of a value; unlike encrypt_value it is deterministic, so it can be looked up"""
+    from hashlib import sha256
+    digest_key = sha256(b"secret-digest:" + settings.SECRET_KEY.encode()).digest()
+    return hmac.new(digest_key, value.encode(), sha256).hexdigest()
+
 def decrypt_value(encrypted_value: str) -> str:
     """Decrypt a stored encrypted value"""
-    f = Fernet(get_secret_key())
+    f = _secret_fernet(get_secret_key())
     encrypted_bytes = base64.b64decode(encrypted_value.encode())
     decrypted = f.decrypt(encrypted_bytes)
     return decrypted.decode()
@@ -6,11 +6,67 @@ from authentication.cookie_oauth2 import CookieOAuth2Authentication
 from django.utils import timezone
 from datetime import timedelta
 import random
+import threading
+import time
 import psutil
 import platform
 from .alert_system import AlertSystem
 
 
+# Previous (bytes_recv, bytes_sent, monotonic time) sample so the
+# performance widget can report a throughput rate instead of lifetime totals.
+_net_sample_lock = threading.Lock()
+_last_net_sample = None
+
+
+# Disk usage moves slowly compared to CPU/network, so it is refreshed on a
+# longer interval; host facts that never change are read once at import.
+DISK_USAGE_TTL_SECONDS = 60
+_disk_usage_lock = threading.Lock()
+_disk_usage_cache = {'value': None, 'expires_at': 0.0}
+
+STATIC_SYSTEM_INFO = {
+    'cpu_count': psutil.cpu_count(),
+    'system': platform.system(),
+    'hostname': platform.node(),
+}
+
+
+def get_cached_disk_usage():
+    """Return psutil.disk_usage('/'), refreshed at most every DISK_USAGE_TTL_SECONDS."""
+    now = time.monotonic()
+    with _disk_usage_lock:
+        if _disk_usage_cache['value'] is None or now >= _disk_usage_cache['expires_at']:
+            _disk_usage_cache['value'] = psutil.disk_usage('/')
+            _disk_usage_cache['expires_at'] = now + DISK_USAGE_TTL_SECONDS
+        return _disk_usage_cache['value']
+
+
+def get_network_rates_mbps():
+    """Return (in, out) throughput in Mbps since the previous call."""
+    global _last_net_sample
+
+    net_io = psutil.net_io_counters()
+    now = time.monotonic()
+    current = (net_io.bytes_recv, net_io.bytes_sent, now)
+
+    with _net_sample_lock:
+        previous = _last_net_sample
+        _last_net_sample = current
+
+    if previous is None or now <= previous[2]:
+        return 0.0, 0.0
+
+    elapsed = now - previous[2]
+    # Counters can wrap or reset (e.g. interface restart); treat that as idle.
+    recv_delta = max(current[0] - previous[0], 0)
+    sent_delta = max(current[1] - previous[1], 0)
+    return (
+        round(recv_delta * 8 / elapsed / 1e6, 2),
+        round(sent_delta * 8 / elapsed / 1e6, 2),
+    )
+
+
 class AlertsWidgetView(APIView):
     
     authentication_classes = [CookieOAuth2Authentication]
@@ -124,12 +180,8 @@ class PerformanceWidgetView(APIView):
 
         cpu_percent = psutil.cpu_percent(interval=1)
         memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        net_io = psutil.net_io_counters()
-
-
-        network_in_mbps = round((net_io.bytes_recv / 1024 / 1024), 2)
-        network_out_mbps = round((net_io.bytes_sent / 1024 / 1024), 2)
+        disk = get_cached_disk_usage()
+        network_in_mbps, network_out_mbps = get_network_rates_mbps()
 
         try:
             load_avg = psutil.getloadavg()[0]  # 1-minute load average
@@ -139,7 +191,7 @@ class PerformanceWidgetView(APIView):
         
         performance_data = {
             'cpu_usage': round(cpu_percent, 1),
-            'cpu_count': psutil.cpu_count(),
+            'cpu_count': STATIC_SYSTEM_INFO['cpu_count'],
             'memory_usage': round(memory.percent, 1),
             'memory_used_gb': round(memory.used / (1024**3), 2),
             'memory_total_gb': round(memory.total / (1024**3), 2),
@@ -149,8 +201,8 @@ class PerformanceWidgetView(APIView):
             'network_in_mb': network_in_mbps,
             'network_out_mb': network_out_mbps,
             'load_average': round(load_avg, 2),
-            'system': platform.system(),
-            'hostname': platform.node()
+            'system': STATIC_SYSTEM_INFO['system'],
+            'hostname': STATIC_SYSTEM_INFO['hostname']
         }
         return Response(performance_data)
 
@@ -1,12 +1,16 @@
+import logging
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from authentication.cookie_oauth2 import CookieOAuth2Authentication
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from accounts.models import WidgetLayout
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 class WidgetLayoutView(APIView):
@@ -43,36 +47,28 @@ class WidgetLayoutView(APIView):
         layout = request.data.get('layout', [])
         available_widgets = request.data.get('available_widgets', [])
 
-        print(f"DEBUG: request.user = {request.user}, type = {type(request.user)}")
-        print(f"DEBUG: User model = {User}")
-
         try:
             if isinstance(request.user, str):
                 user_obj = User.objects.get(username=request.user)
                 user_id = user_obj.id
             elif hasattr(request.user, 'pk'):
                 user_id = request.user.pk
-                print(f"DEBUG: Got user_id from pk: {user_id}")
 
                 user_obj = User.objects.get(pk=user_id)
-                print(f"DEBUG: Fetched user_obj type: {type(user_obj)}, isinstance check: {isinstance(user_obj, User)}")
             elif hasattr(request.user, 'id'):
                 user_id = request.user.id
-                print(f"DEBUG: Got user_id from id: {user_id}")
 
                 user_obj = User.objects.get(pk=user_id)
             else:
                 user_obj = User.objects.get(username=str(request.user))
                 user_id = user_obj.id
             
-            print(f"DEBUG: Final user_id = {user_id}, user_obj = {user_obj}, type = {type(user_obj)}")
-            
         except User.DoesNotExist:
             return Response({
                 'error': 'User not found'
             }, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            print(f"DEBUG: Exception getting user: {e}")
+            logger.warning("Failed to resolve user for widget layout save: %s", e)
             return Response({
                 'error': f'Authentication error: {str(e)}'
             }, status=status.HTTP_401_UNAUTHORIZED)
@@ -83,8 +79,6 @@ class WidgetLayoutView(APIView):
             widget_layout.available_widgets = available_widgets
             widget_layout.save()
         except WidgetLayout.DoesNotExist:
-            print(f"DEBUG: Creating new WidgetLayout with user_id={user_id}")
-
             widget_layout = WidgetLayout.objects.create(
                 user=user_obj,
                 layout=layout,
@@ -124,22 +118,25 @@ class WidgetLibraryView(APIView):
                 'error': 'widget_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        widget_layout, created = WidgetLayout.objects.get_or_create(
-            user=request.user,
-            defaults={
-                'layout': [],
-                'available_widgets': []
-            }
-        )
-
-        available = widget_layout.available_widgets
-        if not any(w.get('id') == widget_id for w in available):
-            available.append({
-                'id': widget_id,
-                'config': widget_config
-            })
-            widget_layout.available_widgets = available
-            widget_layout.save()
+        # Lock the row so concurrent tabs can't lose each other's additions
+        with transaction.atomic():
+            widget_layout, created = WidgetLayout.objects.select_for_update().get_or_create(
+                user=request.user,
+                defaults={
+                    'layout': [],
+                    'available_widgets': []
+                }
+            )
+
+            available = widget_layout.available_widgets
+            existing_ids = {w.get('id') for w in available}
+            if widget_id not in existing_ids:
+                available.append({
+                    'id': widget_id,
+                    'config': widget_config
+                })
+                widget_layout.available_widgets = available
+                widget_layout.save(update_fields=['available_widgets', 'updated_at'])
 
         return Response({
             'status': 'success',
@@ -156,13 +153,14 @@ class WidgetLibraryView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            widget_layout = WidgetLayout.objects.get(user=request.user)
-
-            widget_layout.available_widgets = [
-                w for w in widget_layout.available_widgets 
-                if w.get('id') != widget_id
-            ]
-            widget_layout.save()
+            with transaction.atomic():
+                widget_layout = WidgetLayout.objects.select_for_update().get(user=request.user)
+
+                widget_layout.available_widgets = [
+                    w for w in widget_layout.available_widgets
+                    if w.get('id') != widget_id
+                ]
+                widget_layout.save(update_fields=['available_widgets', 'updated_at'])
 
             return Response({
                 'status': 'success',
@@ -3,7 +3,6 @@
 
 import os
 import sys
-import signal
 # Ensure project root is in sys.path for all import contexts
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
@@ -41,15 +40,18 @@ def main():
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
     try:
         from django.core.management import execute_from_command_line
-        # Ensure server ID is generated/persisted on every run (after Django sets up the path)
-        try:
-            backend_dir = os.path.dirname(os.path.abspath(__file__))
-            if backend_dir not in sys.path:
-                sys.path.insert(0, backend_dir)
-            from dashboard.views import get_stable_server_id
-            get_stable_server_id()
-        except Exception:
-            pass
+        # Ensure server ID is generated/persisted (after Django sets up the path).
+        # Once dashboard/serverid.dat exists there is nothing to do, so skip
+        # importing dashboard.views entirely.
+        backend_dir = os.path.dirname(os.path.abspath(__file__))
+        if not os.path.exists(os.path.join(backend_dir, 'dashboard', 'serverid.dat')):
+            try:
+                if backend_dir not in sys.path:
+                    sys.path.insert(0, backend_dir)
+                from dashboard.views import get_stable_server_id
+                get_stable_server_id()
+            except Exception:
+                pass
     except ImportError as exc:
         raise ImportError(
             "Couldn't import Django. Are you sure it's installed and "
@@ -60,20 +62,16 @@ def main():
 
 
 if __name__ == '__main__':
-    import sys
-    
     # Always run with HTTPS on port 13527 using provided certs with WebSocket support
     if len(sys.argv) == 1 or (len(sys.argv) == 2 and sys.argv[1] == 'runserver'):
         # Use Uvicorn for full ASGI support (HTTP + WebSocket)
+        import signal
         try:
             import uvicorn
-            import django
             
-            # Set up Django
+            # The reloader process only supervises workers; each worker sets
+            # Django up itself through backend.asgi, so skip django.setup() here
             os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
-            django.setup()
-            
-            # Register signal handler AFTER django.setup()
             signal.signal(signal.SIGINT, signal_handler)
             
             # Get certificate paths
@@ -99,6 +97,9 @@ if __name__ == '__main__':
                 ssl_certfile=ssl_certfile,
                 reload=True,  # Enable hot reload
                 reload_dirs=[cert_dir],  # Watch the backend directory
+                # Only Python sources trigger a reload; watchfiles honours these
+                reload_includes=['*.py'],
+                reload_excludes=['*.pyc', '__pycache__/*', '*.pem', '*.sqlite3', '*.db', '*.log', 'logs/*'],
                 log_level="info",
                 timeout_graceful_shutdown=0  # Don't wait for graceful shutdown
             )
@@ -5,11 +5,104 @@ Automatically detects Django, FastAPI, Node.js frameworks and extracts API endpo
 
 import os
 import json
+import hashlib
 import re
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 import ast
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # Fall back to plain substring checks
+
+
+# Route/schema patterns used by the extractors, compiled once at import.
+# Django routes: path()/re_path()/url() with an optional name= kwarg. The
+# name is only searched for inside the same call (one level of nested
+# parentheses such as as_view() is allowed), which keeps matching linear.
+DJANGO_URL_RE = re.compile(
+    r'\b(?:path|re_path|url)\(\s*r?["\']([^"\']+)["\']'
+    r'(?:(?:[^()]|\([^()]*\))*?\bname\s*=\s*["\']([^"\']+)["\'])?'
+)
+FASTAPI_ROUTE_RE = re.compile(r'@app\.(get|post|put|delete|patch)\(["\']([^"\']+)["\']')
+EXPRESS_ROUTE_RE = re.compile(r'(?:app|router)\.(get|post|put|delete|patch)\(["\']([^"\']+)["\']')
+MONGOOSE_SCHEMA_RE = re.compile(r'new\s+(?:mongoose\.)?Schema\s*\(\s*\{([^}]+)\}', re.DOTALL)
+MONGOOSE_FIELD_RE = re.compile(r'(\w+)\s*:\s*(\w+)')
+
+# Every framework signature pattern contains at least one of these literals,
+# so files without any of them can skip the regex scan entirely.
+SIGNATURE_LITERALS = (
+    'django', 'DJANGO_SETTINGS_MODULE', 'fastapi', 'FastAPI(',
+    '@app.', 'express', 'app.listen',
+)
+
+
+def _build_literal_automaton(literals):
+    """Build an Aho-Corasick automaton for literals, or None without pyahocorasick"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for literal in literals:
+        automaton.add_word(literal, literal)
+    automaton.make_automaton()
+    return automaton
+
+
+SIGNATURE_AUTOMATON = _build_literal_automaton(SIGNATURE_LITERALS)
+
+# Dependency, build and cache directories that never hold the project's own
+# source; they are pruned from the walk (as are hidden directories).
+SKIP_DIRS = frozenset({
+    'node_modules', '.git', '.venv', 'venv', '__pycache__', 'dist', 'build',
+    '.next', 'target', 'vendor', 'site-packages',
+})
+
+# Signature scans read files in chunks and give up after the first MiB.
+SCAN_CHUNK_CHARS = 64 * 1024
+SCAN_OVERLAP = 128
+SCAN_MAX_CHARS = 1024 * 1024
+
+# Per-file reads and scans fan out over a thread pool once a tree is big
+# enough for the pool overhead to pay off.
+PARALLEL_MIN_FILES = 32
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
+
+# On-disk cache of detect_framework() results, keyed by a fingerprint of the
+# backend directory. Bump the version whenever the result format changes.
+DETECTOR_CACHE_VERSION = 2
+DETECTOR_CACHE_DIR = (
+    Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+    / 'alterion_panel' / 'backend_detector'
+)
+
+
+def pattern_literal(pattern: str) -> Optional[str]:
+    """Return the plain text a regex pattern matches, or None if it uses regex syntax"""
+    literal = []
+    chars = iter(pattern)
+    for char in chars:
+        if char == '\\':
+            escaped = next(chars, '')
+            if not escaped or escaped.isalnum():
+                return None  # Trailing backslash or a class like \d / \s
+            literal.append(escaped)
+        elif char in '.^$*+?{}[]|()':
+            return None
+        else:
+            literal.append(char)
+    return ''.join(literal)
+
+
+def contains_signature_literal(content: str) -> bool:
+    """Return True if content contains any of SIGNATURE_LITERALS"""
+    if SIGNATURE_AUTOMATON is not None:
+        return next(SIGNATURE_AUTOMATON.iter(content), None) is not None
+    return any(literal in content for literal in SIGNATURE_LITERALS)
+
 
 class BackendDetector:
     """
@@ -37,6 +130,36 @@ class BackendDetector:
         }
     }
     
+    # File names (matched at any depth) that mark an upload as a backend
+    # project. Stacks without a signature above still deploy as 'other' with
+    # the user's start command, so their manifests count too
+    MANIFEST_FILES = tuple(sorted(
+        {filename for signature in FRAMEWORK_SIGNATURES.values() for filename in signature['files']}
+        | {'requirements.txt', 'pyproject.toml', 'setup.py', 'Pipfile',
+           'go.mod', 'Cargo.toml', 'pom.xml', 'build.gradle', 'build.gradle.kts',
+           'composer.json', 'Gemfile'}
+    ))
+    
+    # Confidence at which detection stops looking at other frameworks
+    CONFIDENCE_SATURATION = 0.9
+    
+    # Signature patterns that are plain text are matched with substring
+    # tests; the rest share one alternation. Either way a pattern is named
+    # "<framework>_<index>".
+    LITERAL_PATTERNS = {
+        f'{name}_{index}': pattern_literal(pattern)
+        for name, signature in FRAMEWORK_SIGNATURES.items()
+        for index, pattern in enumerate(signature['patterns'])
+        if pattern_literal(pattern) is not None
+    }
+    COMBINED_PATTERN = re.compile('|'.join(
+        f'(?P<{name}_{index}>{pattern})'
+        for name, signature in FRAMEWORK_SIGNATURES.items()
+        for index, pattern in enumerate(signature['patterns'])
+        if pattern_literal(pattern) is None
+    ))
+    SIGNATURE_GROUPS = frozenset(LITERAL_PATTERNS) | frozenset(COMBINED_PATTERN.groupindex)
+    
     def __init__(self, backend_path: str):
         """
         Initialize detector with path to backend folder.
@@ -47,14 +170,79 @@ class BackendDetector:
         self.backend_path = Path(backend_path)
         if not self.backend_path.exists():
             raise ValueError(f"Backend path does not exist: {backend_path}")
+        
+        self._file_index = None
+        self._path_cache = {}
+        self._source_cache = {}
     
-    def detect_framework(self) -> Dict:
+    def detect_framework(self, use_cache: bool = True) -> Dict:
         """
         Detect backend framework and extract configuration.
         
+        Results are cached on disk under DETECTOR_CACHE_DIR and reused while
+        the source tree fingerprint (see get_fingerprint) is unchanged.
+        
+        Args:
+            use_cache: Set False to force a full scan
+        
         Returns:
             Dict containing framework detection results
         """
+        if not use_cache:
+            return self._detect_framework_uncached()
+        
+        cache_file = DETECTOR_CACHE_DIR / f'{self.get_fingerprint()}.json'
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+        
+        results = self._detect_framework_uncached()
+        
+        try:
+            DETECTOR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(results, f)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass  # Caching is best-effort
+        
+        return results
+    
+    def get_fingerprint(self) -> str:
+        """
+        Fingerprint of the backend's source tree for result caching.
+        
+        Combines the resolved path with the (relative path, mtime_ns, size)
+        of every file in the scan index, so editing, adding or removing any
+        file the scan could read changes the key. The index is reused by the
+        scan itself, so this costs one stat() per file.
+        
+        Returns:
+            Hex digest identifying the current tree state
+        """
+        root = self.backend_path.resolve()
+        base = str(self.backend_path)
+        parts = [DETECTOR_CACHE_VERSION, str(root)]
+        
+        paths = sorted(
+            path
+            for paths in self._get_file_index()['basenames'].values()
+            for path in paths
+        )
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            parts.append((os.path.relpath(path, base), stat.st_mtime_ns, stat.st_size))
+        
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+    
+    def _detect_framework_uncached(self) -> Dict:
+        """Run the full detection scan (see detect_framework)"""
         results = {
             'framework': 'other',
             'confidence': 0.0,
@@ -65,18 +253,37 @@ class BackendDetector:
             'port': 8000
         }
         
+        # Signature files come straight from the file index
+        signature_files = {
+            framework_name: self._find_signature_files(signature)
+            for framework_name, signature in self.FRAMEWORK_SIGNATURES.items()
+        }
+        
+        def confidences(matched_patterns):
+            for framework_name, signature in self.FRAMEWORK_SIGNATURES.items():
+                yield framework_name, signature, self._signature_confidence(
+                    framework_name, signature, signature_files[framework_name], matched_patterns
+                )
+        
+        # Scan the codebase once for every framework pattern, stopping as
+        # soon as any framework is certain enough
+        matched_patterns = self._scan_codebase_patterns(
+            lambda matched: any(c >= self.CONFIDENCE_SATURATION for _, _, c in confidences(matched))
+        )
+        
         # Check each framework
-        for framework_name, signature in self.FRAMEWORK_SIGNATURES.items():
-            confidence, found_files = self._check_framework_signature(signature)
-            
+        for framework_name, signature, confidence in confidences(matched_patterns):
             if confidence > results['confidence']:
                 results['framework'] = framework_name
                 results['confidence'] = confidence
-                results['detected_files'] = found_files
+                results['detected_files'] = signature_files[framework_name]
                 results['port'] = signature['default_port']
                 results['suggested_start_command'] = signature['start_cmd'].format(
                     port=signature['default_port']
                 )
+            
+            if confidence >= self.CONFIDENCE_SATURATION:
+                break
         
         # Extract APIs and models based on detected framework
         if results['framework'] == 'django':
@@ -91,65 +298,253 @@ class BackendDetector:
         
         return results
     
-    def _check_framework_signature(self, signature: Dict) -> Tuple[float, List[str]]:
+    def _get_file_index(self) -> Dict[str, Dict[str, List[str]]]:
         """
-        Check if framework signature matches files in backend path.
+        Walk the backend tree once with os.scandir and index every file.
+        
+        Paths are kept as plain strings; Path objects are only built for the
+        names and extensions that are actually looked up (see _indexed_paths).
         
         Returns:
-            Tuple of (confidence score 0-1, list of matching files)
+            Dict with 'exts' (extension -> paths) and 'basenames' (filename -> paths)
+        """
+        if self._file_index is None:
+            by_ext = defaultdict(list)
+            by_name = defaultdict(list)
+            
+            # Same top-down, depth-first order as os.walk, without its per-level
+            # list building; DirEntry type checks reuse the directory listing
+            stack = [str(self.backend_path)]
+            while stack:
+                try:
+                    with os.scandir(stack.pop()) as it:
+                        entries = list(it)
+                except OSError:
+                    continue
+                
+                subdirs = []
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    
+                    name = entry.name
+                    if not is_dir:
+                        by_name[name].append(entry.path)
+                        by_ext[os.path.splitext(name)[1]].append(entry.path)
+                    elif name not in SKIP_DIRS and not name.startswith('.') and not entry.is_symlink():
+                        subdirs.append(entry.path)
+                stack.extend(reversed(subdirs))
+            
+            self._file_index = {'exts': by_ext, 'basenames': by_name}
+        return self._file_index
+    
+    def _indexed_paths(self, kind: str, key: str) -> List[Path]:
+        """Return the Path objects for one file index bucket, built once"""
+        cache_key = (kind, key)
+        paths = self._path_cache.get(cache_key)
+        if paths is None:
+            paths = [Path(path) for path in self._get_file_index()[kind].get(key, ())]
+            self._path_cache[cache_key] = paths
+        return paths
+    
+    def _files_named(self, filename: str) -> List[Path]:
+        """Return all indexed files with the given basename"""
+        return self._indexed_paths('basenames', filename)
+    
+    def _files_with_ext(self, ext: str) -> List[Path]:
+        """Return all indexed files with the given extension (e.g. '.py')"""
+        return self._indexed_paths('exts', ext)
+    
+    def _get_source_entry(self, file_path: Path) -> list:
+        """Return the [(mtime, size), source, ast-or-None] cache entry for a file"""
+        stat = file_path.stat()
+        key = (stat.st_mtime, stat.st_size)
+        
+        cached = self._source_cache.get(file_path)
+        if cached is None or cached[0] != key:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                cached = [key, f.read(), None]
+            self._source_cache[file_path] = cached
+        return cached
+    
+    def _read_source(self, file_path: Path) -> str:
+        """Read a source file, memoized per detector on (mtime, size)"""
+        return self._get_source_entry(file_path)[1]
+    
+    def _prefetch_sources(self, files: List[Path]) -> None:
+        """Load files into the source cache concurrently for larger trees"""
+        if len(files) < PARALLEL_MIN_FILES:
+            return
+        
+        def load(file_path):
+            try:
+                self._get_source_entry(file_path)
+            except Exception:
+                pass
+        
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+            list(executor.map(load, files))
+    
+    def _parse_file(self, file_path: Path, needles: Tuple[str, ...] = ()) -> Optional[ast.AST]:
+        """
+        Parse a Python file, memoized per detector on (mtime, size).
+        
+        Args:
+            file_path: Python source file
+            needles: Substrings of which at least one must appear in the
+                source for the caller to find anything; when none do, the
+                file is not parsed and None is returned
+        
+        Returns:
+            Parsed module, or None if the needle prefilter ruled the file out
+        """
+        cached = self._get_source_entry(file_path)
+        
+        content = cached[1]
+        if needles and not any(needle in content for needle in needles):
+            return None
+        
+        if cached[2] is None:
+            cached[2] = ast.parse(content)
+        return cached[2]
+    
+    def _find_signature_files(self, signature: Dict) -> List[str]:
+        """
+        Find a framework's signature files in the backend path.
+        
+        Returns:
+            List of matching files relative to the backend path (up to 3 per name)
         """
         found_files = []
-        pattern_matches = 0
-        total_checks = len(signature['files']) + len(signature['patterns'])
         
-        # Check for signature files
         for filename in signature['files']:
-            matching_files = list(self.backend_path.rglob(filename))
+            matching_files = self._files_named(filename)
             if matching_files:
                 found_files.extend([str(f.relative_to(self.backend_path)) for f in matching_files[:3]])
         
-        # Check for code patterns in Python/JS files
-        for pattern in signature['patterns']:
-            if self._search_pattern_in_codebase(pattern):
-                pattern_matches += 1
+        return found_files
+    
+    @staticmethod
+    def _signature_confidence(framework_name: str, signature: Dict,
+                              found_files: List[str], matched_patterns: set) -> float:
+        """
+        Score how well the codebase matches a framework signature.
+        
+        Returns:
+            Confidence score weighting signature files 0.6 and code patterns 0.4
+        """
+        pattern_matches = sum(
+            1 for index in range(len(signature['patterns']))
+            if f'{framework_name}_{index}' in matched_patterns
+        )
         
-        # Calculate confidence score
         file_score = len(found_files) / max(len(signature['files']), 1)
         pattern_score = pattern_matches / max(len(signature['patterns']), 1)
-        confidence = (file_score * 0.6 + pattern_score * 0.4)
-        
-        return confidence, found_files
+        return file_score * 0.6 + pattern_score * 0.4
     
-    def _search_pattern_in_codebase(self, pattern: str) -> bool:
-        """Search for regex pattern in Python/JS files"""
+    def _scan_codebase_patterns(self, is_saturated: Optional[Callable[[set], bool]] = None) -> set:
+        """
+        Scan Python/JS files once for all framework signature patterns.
+        
+        Args:
+            is_saturated: Optional callback given the groups matched so far;
+                returning True stops the scan early
+        
+        Returns:
+            Set of SIGNATURE_GROUPS names that matched somewhere
+        """
         extensions = ['.py', '.js', '.ts']
+        all_groups = self.SIGNATURE_GROUPS
+        matched = set()
+        
+        def done():
+            return matched >= all_groups or (is_saturated is not None and is_saturated(matched))
         
-        for ext in extensions:
-            for file_path in self.backend_path.rglob(f'*{ext}'):
+        if done():
+            return matched
+        
+        files = [file_path for ext in extensions for file_path in self._files_with_ext(ext)]
+        
+        if len(files) < PARALLEL_MIN_FILES:
+            for file_path in files:
                 try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        if re.search(pattern, content):
-                            return True
+                    matched |= self._scan_file_patterns(file_path)
                 except Exception:
                     continue
-        return False
+                
+                if done():
+                    break
+            return matched
+        
+        executor = ThreadPoolExecutor(max_workers=SCAN_WORKERS)
+        try:
+            futures = [executor.submit(self._scan_file_patterns, file_path) for file_path in files]
+            for future in as_completed(futures):
+                try:
+                    matched |= future.result()
+                except Exception:
+                    continue
+                
+                if done():
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return matched
+    
+    def _scan_file_patterns(self, file_path: Path) -> set:
+        """
+        Stream one file through the signature patterns in fixed-size chunks.
+        
+        Only the first SCAN_MAX_CHARS characters are read, since framework
+        imports and app setup sit near the top of a file. Consecutive
+        chunks overlap by SCAN_OVERLAP characters so matches spanning a
+        chunk boundary are not lost.
+        
+        Returns:
+            Set of SIGNATURE_GROUPS names that matched in this file
+        """
+        all_groups = self.SIGNATURE_GROUPS
+        matched = set()
+        scanned = 0
+        tail = ''
+        
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            while scanned < SCAN_MAX_CHARS:
+                chunk = f.read(SCAN_CHUNK_CHARS)
+                if not chunk:
+                    break
+                scanned += len(chunk)
+                
+                window = tail + chunk
+                if contains_signature_literal(window):
+                    for group, literal in self.LITERAL_PATTERNS.items():
+                        if literal in window:
+                            matched.add(group)
+                    if self.COMBINED_PATTERN.groupindex:
+                        for match in self.COMBINED_PATTERN.finditer(window):
+                            matched.add(match.lastgroup)
+                    if matched >= all_groups:
+                        break
+                tail = chunk[-SCAN_OVERLAP:]
+        
+        return matched
     
     def _extract_django_apis(self) -> List[Dict]:
         """Extract Django REST Framework API endpoints"""
         apis = []
         
         # Look for urls.py files
-        for urls_file in self.backend_path.rglob('urls.py'):
+        for urls_file in self._files_named('urls.py'):
             try:
                 with open(urls_file, 'r', encoding='utf-8') as f:
                     content = f.read()
                     
-                    # Find path() and re_path() patterns
-                    patterns = re.findall(
-                        r'path\(["\']([^"\']+)["\'].*?name=["\']([^"\']+)["\']',
-                        content
-                    )
+                    # Find path(), re_path() and url() patterns
+                    if 'path(' not in content and 'url(' not in content:
+                        continue
+                    patterns = DJANGO_URL_RE.findall(content)
                     
                     for path, name in patterns:
                         apis.append({
@@ -162,7 +557,7 @@ class BackendDetector:
                 continue
         
         # Look for ViewSets and APIViews
-        for view_file in self.backend_path.rglob('views.py'):
+        for view_file in self._files_named('views.py'):
             apis.extend(self._extract_django_viewset_apis(view_file))
         
         return apis
@@ -172,31 +567,28 @@ class BackendDetector:
         apis = []
         
         try:
-            with open(view_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                tree = ast.parse(content)
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.ClassDef):
-                        # Check if it's a ViewSet or APIView
-                        base_names = [base.id for base in node.bases if hasattr(base, 'id')]
+            tree = self._parse_file(view_file, ('ViewSet', 'APIView'))
+            if tree is not None:
+                for node in self._iter_classes(tree):
+                    # Check if it's a ViewSet or APIView
+                    base_names = [base.id for base in node.bases if base.__class__ is ast.Name]
+                    
+                    if any('ViewSet' in name or 'APIView' in name for name in base_names):
+                        # Extract methods (get, post, put, delete, etc.)
+                        methods = []
+                        for item in node.body:
+                            if item.__class__ is ast.FunctionDef:
+                                method_name = item.name.upper()
+                                if method_name in ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']:
+                                    methods.append(method_name)
                         
-                        if any('ViewSet' in name or 'APIView' in name for name in base_names):
-                            # Extract methods (get, post, put, delete, etc.)
-                            methods = []
-                            for item in node.body:
-                                if isinstance(item, ast.FunctionDef):
-                                    method_name = item.name.upper()
-                                    if method_name in ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']:
-                                        methods.append(method_name)
-                            
-                            if methods:
-                                apis.append({
-                                    'name': node.name,
-                                    'file': str(view_file.relative_to(self.backend_path)),
-                                    'methods': methods,
-                                    'type': 'ViewSet' if 'ViewSet' in str(base_names) else 'APIView'
-                                })
+                        if methods:
+                            apis.append({
+                                'name': node.name,
+                                'file': str(view_file.relative_to(self.backend_path)),
+                                'methods': methods,
+                                'type': 'ViewSet' if 'ViewSet' in str(base_names) else 'APIView'
+                            })
         except Exception:
             pass
         
@@ -206,38 +598,35 @@ class BackendDetector:
         """Extract Django models and their fields"""
         models = []
         
-        for model_file in self.backend_path.rglob('models.py'):
+        for model_file in self._files_named('models.py'):
             try:
-                with open(model_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    tree = ast.parse(content)
-                    
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.ClassDef):
-                            # Check if inherits from models.Model
-                            base_names = [self._get_full_name(base) for base in node.bases]
+                tree = self._parse_file(model_file, ('Model',))
+                if tree is not None:
+                    for node in self._iter_classes(tree):
+                        # Check if inherits from models.Model
+                        base_names = [self._get_full_name(base) for base in node.bases]
+                        
+                        if any('Model' in name for name in base_names):
+                            fields = []
                             
-                            if any('Model' in name for name in base_names):
-                                fields = []
-                                
-                                # Extract field definitions
-                                for item in node.body:
-                                    if isinstance(item, ast.Assign):
-                                        for target in item.targets:
-                                            if isinstance(target, ast.Name):
-                                                field_type = self._extract_field_type(item.value)
-                                                if field_type:
-                                                    fields.append({
-                                                        'name': target.id,
-                                                        'type': field_type
-                                                    })
-                                
-                                if fields:
-                                    models.append({
-                                        'name': node.name,
-                                        'file': str(model_file.relative_to(self.backend_path)),
-                                        'fields': fields
-                                    })
+                            # Extract field definitions
+                            for item in node.body:
+                                if item.__class__ is ast.Assign:
+                                    for target in item.targets:
+                                        if target.__class__ is ast.Name:
+                                            field_type = self._extract_field_type(item.value)
+                                            if field_type:
+                                                fields.append({
+                                                    'name': target.id,
+                                                    'type': field_type
+                                                })
+                            
+                            if fields:
+                                models.append({
+                                    'name': node.name,
+                                    'file': str(model_file.relative_to(self.backend_path)),
+                                    'fields': fields
+                                })
             except Exception:
                 continue
         
@@ -247,23 +636,24 @@ class BackendDetector:
         """Extract FastAPI endpoints"""
         apis = []
         
-        for py_file in self.backend_path.rglob('*.py'):
+        py_files = self._files_with_ext('.py')
+        self._prefetch_sources(py_files)
+        
+        for py_file in py_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                    # Find decorator-based routes: @app.get("/path")
-                    patterns = re.findall(
-                        r'@app\.(get|post|put|delete|patch)\(["\']([^"\']+)["\']',
-                        content
-                    )
-                    
-                    for method, path in patterns:
-                        apis.append({
-                            'path': path,
-                            'method': method.upper(),
-                            'file': str(py_file.relative_to(self.backend_path))
-                        })
+                content = self._read_source(py_file)
+                
+                # Find decorator-based routes: @app.get("/path")
+                if '@app.' not in content:
+                    continue
+                patterns = FASTAPI_ROUTE_RE.findall(content)
+                
+                for method, path in patterns:
+                    apis.append({
+                        'path': path,
+                        'method': method.upper(),
+                        'file': str(py_file.relative_to(self.backend_path))
+                    })
             except Exception:
                 continue
         
@@ -273,35 +663,35 @@ class BackendDetector:
         """Extract Pydantic models from FastAPI"""
         models = []
         
-        for py_file in self.backend_path.rglob('*.py'):
+        py_files = self._files_with_ext('.py')
+        self._prefetch_sources(py_files)
+        
+        for py_file in py_files:
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    tree = ast.parse(content)
-                    
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.ClassDef):
-                            # Check if inherits from BaseModel
-                            base_names = [self._get_full_name(base) for base in node.bases]
+                tree = self._parse_file(py_file, ('BaseModel',))
+                if tree is not None:
+                    for node in self._iter_classes(tree):
+                        # Check if inherits from BaseModel
+                        base_names = [self._get_full_name(base) for base in node.bases]
+                        
+                        if any('BaseModel' in name for name in base_names):
+                            fields = []
                             
-                            if any('BaseModel' in name for name in base_names):
-                                fields = []
-                                
-                                # Extract field annotations
-                                for item in node.body:
-                                    if isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
-                                        field_type = self._get_full_name(item.annotation)
-                                        fields.append({
-                                            'name': item.target.id,
-                                            'type': field_type
-                                        })
-                                
-                                if fields:
-                                    models.append({
-                                        'name': node.name,
-                                        'file': str(py_file.relative_to(self.backend_path)),
-                                        'fields': fields
+                            # Extract field annotations
+                            for item in node.body:
+                                if item.__class__ is ast.AnnAssign and item.target.__class__ is ast.Name:
+                                    field_type = self._get_full_name(item.annotation)
+                                    fields.append({
+                                        'name': item.target.id,
+                                        'type': field_type
                                     })
+                            
+                            if fields:
+                                models.append({
+                                    'name': node.name,
+                                    'file': str(py_file.relative_to(self.backend_path)),
+                                    'fields': fields
+                                })
             except Exception:
                 continue
         
@@ -311,23 +701,24 @@ class BackendDetector:
         """Extract Express.js API endpoints"""
         apis = []
         
-        for js_file in self.backend_path.rglob('*.js'):
+        js_files = self._files_with_ext('.js')
+        self._prefetch_sources(js_files)
+        
+        for js_file in js_files:
             try:
-                with open(js_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                    # Find Express routes: app.get('/path', ...)
-                    patterns = re.findall(
-                        r'(?:app|router)\.(get|post|put|delete|patch)\(["\']([^"\']+)["\']',
-                        content
-                    )
-                    
-                    for method, path in patterns:
-                        apis.append({
-                            'path': path,
-                            'method': method.upper(),
-                            'file': str(js_file.relative_to(self.backend_path))
-                        })
+                content = self._read_source(js_file)
+                
+                # Find Express routes: app.get('/path', ...)
+                if 'app.' not in content and 'router.' not in content:
+                    continue
+                patterns = EXPRESS_ROUTE_RE.findall(content)
+                
+                for method, path in patterns:
+                    apis.append({
+                        'path': path,
+                        'method': method.upper(),
+                        'file': str(js_file.relative_to(self.backend_path))
+                    })
             except Exception:
                 continue
         
@@ -337,52 +728,73 @@ class BackendDetector:
         """Extract Node.js/Mongoose models"""
         models = []
         
-        for js_file in self.backend_path.rglob('*.js'):
+        js_files = self._files_with_ext('.js')
+        self._prefetch_sources(js_files)
+        
+        for js_file in js_files:
             try:
-                with open(js_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = self._read_source(js_file)
+                
+                # Find Mongoose schema definitions
+                if 'Schema' not in content:
+                    continue
+                
+                for match in MONGOOSE_SCHEMA_RE.finditer(content):
+                    fields = []
+                    # Extract field definitions within the schema body's bounds
+                    field_patterns = MONGOOSE_FIELD_RE.findall(content, match.start(1), match.end(1))
                     
-                    # Find Mongoose schema definitions
-                    schema_pattern = r'new\s+(?:mongoose\.)?Schema\s*\(\s*\{([^}]+)\}'
-                    matches = re.findall(schema_pattern, content, re.DOTALL)
+                    for field_name, field_type in field_patterns:
+                        fields.append({
+                            'name': field_name,
+                            'type': field_type
+                        })
                     
-                    for match in matches:
-                        fields = []
-                        # Extract field definitions
-                        field_patterns = re.findall(r'(\w+)\s*:\s*(\w+)', match)
-                        
-                        for field_name, field_type in field_patterns:
-                            fields.append({
-                                'name': field_name,
-                                'type': field_type
-                            })
-                        
-                        if fields:
-                            models.append({
-                                'name': js_file.stem,
-                                'file': str(js_file.relative_to(self.backend_path)),
-                                'fields': fields
-                            })
+                    if fields:
+                        models.append({
+                            'name': js_file.stem,
+                            'file': str(js_file.relative_to(self.backend_path)),
+                            'fields': fields
+                        })
             except Exception:
                 continue
         
         return models
     
+    @staticmethod
+    def _iter_classes(tree: ast.Module):
+        """
+        Yield module-level classes and classes nested inside them.
+        
+        Only class bodies are descended into, so function bodies and
+        expressions are never visited. Order matches ast.walk (breadth-first).
+        """
+        pending = deque(tree.body)
+        while pending:
+            node = pending.popleft()
+            if node.__class__ is ast.ClassDef:
+                yield node
+                pending.extend(node.body)
+    
     @staticmethod
     def _get_full_name(node) -> str:
         """Get full name from AST node"""
-        if isinstance(node, ast.Name):
+        node_class = node.__class__
+        if node_class is ast.Name:
             return node.id
-        elif isinstance(node, ast.Attribute):
+        elif node_class is ast.Attribute:
             return f"{BackendDetector._get_full_name(node.value)}.{node.attr}"
         return str(node)
     
     @staticmethod
     def _extract_field_type(node) -> Optional[str]:
         """Extract Django field type from assignment"""
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Attribute):
-                return node.func.attr
-            elif isinstance(node.func, ast.Name):
-                return node.func.id
+        if node.__class__ is not ast.Call:
+            return None
+        
+        func_class = node.func.__class__
+        if func_class is ast.Attribute:
+            return node.func.attr
+        elif func_class is ast.Name:
+            return node.func.id
         return None
@@ -1,7 +1,8 @@
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Concat
 from django.contrib.auth import get_user_model
-from django.core.validators import URLValidator
-import json
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -43,6 +44,9 @@ class Project(models.Model):
     class Meta:
         ordering = ['-updated_at']
         unique_together = ['user', 'slug']
+        indexes = [
+            models.Index(fields=['user', '-updated_at']),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.build_type})"
@@ -72,7 +76,8 @@ class BackendConfig(models.Model):
     
     # Process management
     process_id = models.IntegerField(null=True, blank=True, help_text="PID of running backend process")
-    is_running = models.BooleanField(default=False)
+    process_create_time = models.FloatField(null=True, blank=True, help_text="Start time of that process, to detect PID reuse")
+    is_running = models.BooleanField(default=False, db_index=True)
     last_started = models.DateTimeField(null=True, blank=True)
     last_stopped = models.DateTimeField(null=True, blank=True)
     
@@ -92,7 +97,7 @@ class DomainConfig(models.Model):
     domain_name = models.CharField(max_length=255)
     
     # DNS verification
-    dns_verified = models.BooleanField(default=False)
+    dns_verified = models.BooleanField(default=False, db_index=True)
     expected_ip = models.GenericIPAddressField(help_text="Server IP that domain should point to")
     actual_ip = models.GenericIPAddressField(null=True, blank=True, help_text="Current A-record IP")
     last_verified = models.DateTimeField(null=True, blank=True)
@@ -133,7 +138,7 @@ class Deployment(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='deployments')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='deployments')
     
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
     logs = models.TextField(blank=True, help_text="Deployment logs and output")
     
     # Deployment metadata
@@ -145,15 +150,58 @@ class Deployment(models.Model):
     
     class Meta:
         ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['project', '-started_at']),
+            models.Index(fields=['user', '-started_at']),
+        ]
     
     def __str__(self):
         return f"{self.project.name} - {self.status} ({self.started_at.strftime('%Y-%m-%d %H:%M')})"
     
+    # Statuses of deployments that have not finished yet
+    ACTIVE_STATUSES = ('pending', 'validating')
+    
+    @classmethod
+    def fail_abandoned(cls, started_before=None):
+        """
+        Mark unfinished deployments as failed.
+        
+        Queued deployments only live in the worker process that accepted
+        them, so a restart leaves their rows 'pending' or 'validating' with
+        nothing left to finish them.
+        
+        Args:
+            started_before: Only touch deployments started before this time;
+                None fails every unfinished deployment (use at startup)
+        
+        Returns:
+            Number of deployments marked as failed
+        """
+        now = timezone.now()
+        line = f"[{now.isoformat()}] Deployment abandoned: the worker running it stopped\n"
+        
+        abandoned = cls.objects.filter(status__in=cls.ACTIVE_STATUSES)
+        if started_before is not None:
+            abandoned = abandoned.filter(started_at__lt=started_before)
+        return abandoned.update(
+            status='failed',
+            completed_at=now,
+            logs=Concat(F('logs'), Value(line), output_field=models.TextField()),
+        )
+    
     def add_log(self, message):
-        """Helper method to append log messages"""
-        timestamp = models.DateTimeField(auto_now_add=True)
-        self.logs += f"[{timestamp}] {message}\n"
-        self.save(update_fields=['logs'])
+        """
+        Helper method to append log messages.
+        
+        The line is appended in the database with a single UPDATE using
+        string concatenation, so the existing log text is never re-sent.
+        """
+        line = f"[{timezone.now().isoformat()}] {message}\n"
+        self.logs += line
+        if self.pk is not None:
+            Deployment.objects.filter(pk=self.pk).update(
+                logs=Concat(F('logs'), Value(line), output_field=models.TextField())
+            )
 
 
 class ComponentLibrary(models.Model):
@@ -173,7 +221,7 @@ class ComponentLibrary(models.Model):
     category = models.CharField(max_length=100, default='custom')
     tags = models.JSONField(default=list, help_text="Tags for component search")
     
-    is_public = models.BooleanField(default=False, help_text="Share with other users")
+    is_public = models.BooleanField(default=False, db_index=True, help_text="Share with other users")
     usage_count = models.IntegerField(default=0)
     
     created_at = models.DateTimeField(auto_now_add=True)
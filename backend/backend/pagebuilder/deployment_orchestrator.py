@@ -3,17 +3,157 @@ Deployment Orchestration System
 Coordinates the full deployment workflow: validation, NGINX config, backend startup, frontend deploy.
 """
 
+import asyncio
+import copy
 import os
+import queue
 import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
-from datetime import datetime
+from typing import Callable, Dict, Generator, List, Optional, Tuple
 import hashlib
+import socket
 
 from .backend_detector import BackendDetector
 from .dns_verifier import DNSVerifier
 from .nginx_generator import NginxConfigGenerator
-from .process_manager import ProcessManager
+from .process_manager import PREWARM_FRAMEWORKS, ProcessManager
+
+
+# Worker threads for per-file copies; file copies release the GIL, so
+# thousands of small dist chunks overlap well.
+COPY_WORKERS = 16
+COPY_BATCH_SIZE = 64
+
+# Backend pre-compilation runs here rather than on deploy_project's own
+# pool, which is joined even when the deployment returns early
+PREWARM_WORKERS = 2
+_prewarm_executor = ThreadPoolExecutor(max_workers=PREWARM_WORKERS, thread_name_prefix='prewarm')
+
+# Read size for hashing; large blocks keep hashing bandwidth-bound
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Files above this size are read on a separate thread while hashing, with
+# a fixed set of rotating buffers
+HASH_READAHEAD_MIN_SIZE = 64 * 1024 * 1024
+HASH_READAHEAD_BUFFERS = 4
+
+
+def _parallel_copytree(src: str, dst: str, workers: int = COPY_WORKERS) -> None:
+    """
+    Copy a directory tree with per-file copies spread over a thread pool.
+    
+    Fallback for _fast_copytree when the native copier is unavailable.
+    Directories are created up front in the calling thread; their metadata
+    is copied last so file writes don't disturb the mtimes.
+    """
+    src, dst = os.fspath(src), os.fspath(dst)
+    directories = []
+    pairs = []
+    
+    for root, dirs, files in os.walk(src, followlinks=True):
+        target_root = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(target_root, exist_ok=True)
+        directories.append((root, target_root))
+        pairs.extend((os.path.join(root, name), os.path.join(target_root, name)) for name in files)
+    
+    def copy_batch(batch):
+        for source, target in batch:
+            shutil.copy2(source, target)
+    
+    # Submit files in fixed-size batches so each pool round trip covers
+    # many small copies (ThreadPoolExecutor.map ignores chunksize)
+    batches = [pairs[i:i + COPY_BATCH_SIZE] for i in range(0, len(pairs), COPY_BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(copy_batch, batches):
+            pass
+    
+    for source_dir, target_dir in reversed(directories):
+        shutil.copystat(source_dir, target_dir)
+
+
+def _hash_with_readahead(f, file_hash) -> None:
+    """
+    Feed a file into file_hash while a reader thread fills the next buffers.
+    
+    Both readinto and hash updates release the GIL, so disk reads overlap
+    with hashing instead of alternating with it.
+    """
+    free_buffers = queue.Queue()
+    filled_buffers = queue.Queue()
+    for _ in range(HASH_READAHEAD_BUFFERS):
+        free_buffers.put(bytearray(HASH_BLOCK_SIZE))
+    
+    def reader():
+        try:
+            while True:
+                buffer = free_buffers.get()
+                size = f.readinto(buffer)
+                filled_buffers.put((buffer, size))
+                if not size:
+                    return
+        except Exception as e:
+            filled_buffers.put((e, 0))
+    
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    
+    while True:
+        buffer, size = filled_buffers.get()
+        if isinstance(buffer, Exception):
+            raise buffer
+        if not size:
+            break
+        file_hash.update(memoryview(buffer)[:size])
+        free_buffers.put(buffer)
+    
+    thread.join()
+
+
+_LOG_LEVELS = {level: level.upper() for level in ("info", "success", "warning", "error")}
+
+
+def _log_entry(message: str, level: str = "info") -> str:
+    """Format one deployment log line"""
+    label = _LOG_LEVELS.get(level) or level.upper()
+    return f"[{time.strftime('%H:%M:%S')}] [{label}] {message}"
+
+
+def _fast_copytree(src: str, dst: str) -> None:
+    """
+    Copy a directory tree with the platform's native copier.
+    
+    Uses multithreaded robocopy on Windows and ``cp -a --reflink=auto``
+    elsewhere, falling back to _parallel_copytree if the tool is
+    unavailable or fails. dst is created first so all paths behave like copytree.
+    """
+    src, dst = os.fspath(src), os.fspath(dst)
+    os.makedirs(dst, exist_ok=True)
+    
+    try:
+        if sys.platform == 'win32':
+            process = subprocess.run(
+                ['robocopy', src, dst, '/E', '/MT:16', '/NDL', '/NFL', '/NP', '/NJH', '/NJS'],
+                capture_output=True
+            )
+            # robocopy exit codes 0-3 mean files were copied without failures
+            if process.returncode <= 3:
+                return
+        else:
+            process = subprocess.run(
+                ['cp', '-a', '--reflink=auto', os.path.join(src, '.'), dst],
+                capture_output=True
+            )
+            if process.returncode == 0:
+                return
+    except OSError:
+        pass
+    
+    _parallel_copytree(src, dst)
 
 
 class DeploymentOrchestrator:
@@ -21,6 +161,22 @@ class DeploymentOrchestrator:
     Orchestrates the complete deployment process for full-stack applications.
     """
     
+    # Backoff schedule (seconds) while waiting for a new backend's port,
+    # capped at BACKEND_STARTUP_TIMEOUT overall
+    BACKEND_STARTUP_DELAYS = (0.05, 0.1, 0.2, 0.4, 0.8, 1.5)
+    BACKEND_STARTUP_TIMEOUT = 5.0
+    
+    # Successful DNS verifications are reused for a short while across
+    # redeploys. The views share one orchestrator per process, but the cache
+    # stays on the class so orchestrators built elsewhere reuse it too.
+    DNS_CACHE_TTL = 60
+    _dns_cache: Dict[tuple, tuple] = {}
+    _dns_cache_lock = threading.Lock()
+    
+    # Backend detection results per (absolute path, detector fingerprint)
+    _detect_cache: Dict[tuple, Dict] = {}
+    _detect_cache_lock = threading.Lock()
+    
     def __init__(self, 
                  deployment_root: str = "/var/www",
                  nginx_sites_available: str = "/etc/nginx/sites-available",
@@ -49,7 +205,9 @@ class DeploymentOrchestrator:
                       ssl_cert_path: str = "",
                       ssl_key_path: str = "",
                       verify_dns: bool = True,
-                      restart_backend: bool = True) -> Dict:
+                      restart_backend: bool = True,
+                      skip_nginx_reload: bool = False,
+                      on_log: Optional[Callable[[str], None]] = None) -> Dict:
         """
         Execute complete deployment workflow.
         
@@ -65,6 +223,9 @@ class DeploymentOrchestrator:
             ssl_key_path: Path to SSL private key
             verify_dns: Whether to verify DNS before deploying
             restart_backend: Whether to restart backend if already running
+            skip_nginx_reload: Write and enable the site but leave the NGINX
+                test and reload to the caller (see deploy_projects)
+            on_log: Called with each log entry as soon as it is written
             
         Returns:
             Dict with deployment results
@@ -81,90 +242,140 @@ class DeploymentOrchestrator:
         
         def log(message: str, level: str = "info"):
             """Helper to add log entries"""
-            entry = f"[{datetime.now().strftime('%H:%M:%S')}] [{level.upper()}] {message}"
+            entry = _log_entry(message, level)
             deployment_log.append(entry)
             result['logs'].append(entry)
+            if on_log is not None:
+                on_log(entry)
         
         try:
             # Step 1: Validate frontend path
             log("Validating frontend files...", "info")
-            if not Path(frontend_dist_path).exists():
+            frontend_dist_path = os.fspath(frontend_dist_path)
+            if not os.path.exists(frontend_dist_path):
                 log(f"Frontend dist path does not exist: {frontend_dist_path}", "error")
                 result['errors'].append("Frontend dist path not found")
                 return result
             
             # Check for index.html
-            index_html = Path(frontend_dist_path) / "index.html"
-            if not index_html.exists():
+            if not os.path.exists(os.path.join(frontend_dist_path, "index.html")):
                 log("Warning: index.html not found in dist folder", "warning")
             
             log("Frontend validation successful", "success")
             
-            # Step 2: DNS Verification (if domain provided)
-            dns_verified = False
-            if domain and verify_dns:
-                log(f"Verifying DNS for domain {domain}...", "info")
-                
-                # Get server IP if not provided
-                if not expected_ip:
-                    expected_ip = self.dns_verifier.get_server_public_ip()
-                    if expected_ip:
-                        log(f"Detected server IP: {expected_ip}", "info")
-                    else:
-                        log("Warning: Could not detect server IP", "warning")
-                
-                if expected_ip:
-                    dns_result = self.dns_verifier.verify_domain(domain, expected_ip)
-                    if dns_result['verified']:
-                        log(f"DNS verified: {domain} -> {expected_ip}", "success")
-                        dns_verified = True
-                    else:
-                        log(f"DNS verification failed: {dns_result['message']}", "error")
-                        result['errors'].append(f"DNS verification failed: {dns_result['message']}")
-                        # Don't return here - allow deployment to continue without DNS
+            # Steps 2-4 don't depend on each other: the DNS lookups, the
+            # backend scan and the frontend copy run concurrently, and their
+            # results are logged in step order below
+            project_deploy_path = self.deployment_root / project_name
+            frontend_deploy_path = project_deploy_path / "dist"
             
-            # Step 3: Backend Detection and Configuration (if backend provided)
-            backend_config = None
-            if backend_path and Path(backend_path).exists():
-                log("Detecting backend framework...", "info")
-                
-                try:
-                    detector = BackendDetector(backend_path)
-                    backend_config = detector.detect_framework()
-                    
-                    log(f"Detected framework: {backend_config['framework']} "
-                        f"(confidence: {backend_config['confidence']:.2%})", "success")
-                    log(f"Found {len(backend_config['detected_apis'])} APIs", "info")
-                    log(f"Found {len(backend_config['detected_models'])} models", "info")
-                except Exception as e:
-                    log(f"Backend detection error: {str(e)}", "error")
-                    result['errors'].append(f"Backend detection failed: {str(e)}")
+            def lookup_dns():
+                server_ip = expected_ip or self.get_server_public_ip()
+                dns_result = self.verify_domain(domain, server_ip) if server_ip else None
+                return server_ip, dns_result
             
-            # Step 4: Deploy Frontend
-            log("Deploying frontend files...", "info")
+            def detect_backend():
+                return self.detect_backend(backend_path)
             
-            # Create project deployment directory
-            project_deploy_path = self.deployment_root / project_name
-            frontend_deploy_path = project_deploy_path / "dist"
+            # Hash of the last deployed dist, kept next to (not inside) the
+            # served directory
+            deploy_hash_path = project_deploy_path / ".deploy_hash"
             
-            try:
+            def deploy_frontend():
+                source_hash = self.calculate_directory_hash(frontend_dist_path)
+                replaced = frontend_deploy_path.exists()
+                
+                # Skip the copy when the deployed files already match
+                if replaced:
+                    try:
+                        if deploy_hash_path.read_text().strip() == source_hash:
+                            return 'unchanged'
+                    except OSError:
+                        pass
+                
                 # Remove existing deployment if present
-                if frontend_deploy_path.exists():
-                    log("Removing existing frontend deployment...", "info")
+                deploy_hash_path.unlink(missing_ok=True)
+                if replaced:
                     shutil.rmtree(frontend_deploy_path)
                 
-                # Create directory structure
+                # Create directory structure and copy frontend files
                 frontend_deploy_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Copy frontend files
-                shutil.copytree(frontend_dist_path, frontend_deploy_path)
-                log(f"Frontend deployed to {frontend_deploy_path}", "success")
-                result['deployment_path'] = str(frontend_deploy_path)
+                _fast_copytree(frontend_dist_path, frontend_deploy_path)
+                deploy_hash_path.write_text(source_hash)
+                return 'replaced' if replaced else 'created'
             
-            except Exception as e:
-                log(f"Frontend deployment error: {str(e)}", "error")
-                result['errors'].append(f"Frontend deployment failed: {str(e)}")
-                return result
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                dns_future = executor.submit(lookup_dns) if domain and verify_dns else None
+                detect_future = (
+                    executor.submit(detect_backend)
+                    if backend_path and os.path.exists(backend_path) else None
+                )
+                frontend_future = executor.submit(deploy_frontend)
+                
+                # Step 2: DNS Verification (if domain provided)
+                dns_verified = False
+                if dns_future is not None:
+                    log(f"Verifying DNS for domain {domain}...", "info")
+                    
+                    # Get server IP if not provided
+                    ip_detected = not expected_ip
+                    expected_ip, dns_result = dns_future.result()
+                    if ip_detected:
+                        if expected_ip:
+                            log(f"Detected server IP: {expected_ip}", "info")
+                        else:
+                            log("Warning: Could not detect server IP", "warning")
+                    
+                    if dns_result is not None:
+                        if dns_result['verified']:
+                            log(f"DNS verified: {domain} -> {expected_ip}", "success")
+                            dns_verified = True
+                        else:
+                            log(f"DNS verification failed: {dns_result['message']}", "error")
+                            result['errors'].append(f"DNS verification failed: {dns_result['message']}")
+                            # Don't return here - allow deployment to continue without DNS
+                
+                # Step 3: Backend Detection and Configuration (if backend provided)
+                backend_config = None
+                prewarm_future = None
+                if detect_future is not None:
+                    log("Detecting backend framework...", "info")
+                    
+                    try:
+                        backend_config = detect_future.result()
+                        
+                        # Compile the backend while the frontend copy finishes;
+                        # on its own pool, so an early return doesn't wait for it
+                        if backend_config['framework'] in PREWARM_FRAMEWORKS:
+                            prewarm_future = _prewarm_executor.submit(
+                                self.process_manager.prewarm_backend,
+                                backend_config['framework'], backend_path
+                            )
+                        
+                        log(f"Detected framework: {backend_config['framework']} "
+                            f"(confidence: {backend_config['confidence']:.2%})", "success")
+                        log(f"Found {len(backend_config['detected_apis'])} APIs", "info")
+                        log(f"Found {len(backend_config['detected_models'])} models", "info")
+                    except Exception as e:
+                        log(f"Backend detection error: {str(e)}", "error")
+                        result['errors'].append(f"Backend detection failed: {str(e)}")
+                
+                # Step 4: Deploy Frontend
+                log("Deploying frontend files...", "info")
+                
+                try:
+                    frontend_status = frontend_future.result()
+                    if frontend_status == 'unchanged':
+                        log("Frontend unchanged, skipping copy", "info")
+                    elif frontend_status == 'replaced':
+                        log("Replaced existing frontend deployment", "info")
+                    log(f"Frontend deployed to {frontend_deploy_path}", "success")
+                    result['deployment_path'] = str(frontend_deploy_path)
+                
+                except Exception as e:
+                    log(f"Frontend deployment error: {str(e)}", "error")
+                    result['errors'].append(f"Frontend deployment failed: {str(e)}")
+                    return result
             
             # Step 5: Start/Restart Backend (if configured)
             backend_pid = None
@@ -175,6 +386,12 @@ class DeploymentOrchestrator:
                 
                 backend_port = backend_config.get('port', 8000)
                 
+                if prewarm_future is not None:
+                    if prewarm_future.result():
+                        log("Backend sources pre-compiled", "info")
+                    else:
+                        log("Backend pre-compilation incomplete, modules compile on import", "warning")
+                
                 # Check if backend is already running
                 if restart_backend:
                     existing_status = self.process_manager.get_process_status(project_id)
@@ -201,9 +418,10 @@ class DeploymentOrchestrator:
                         log(f"Backend started on port {backend_port} (PID {backend_pid})", "success")
                         result['backend_pid'] = backend_pid
                         
-                        # Health check
-                        import time
-                        time.sleep(3)  # Wait for backend to start
+                        # Health check once the backend accepts connections
+                        startup_time = self._wait_for_port(backend_port)
+                        if startup_time is not None:
+                            log(f"Backend accepting connections after {startup_time:.2f}s", "info")
                         health = self.process_manager.health_check(backend_port)
                         if health['healthy']:
                             log(f"Backend health check passed ({health['response_time']}ms)", "success")
@@ -239,20 +457,11 @@ class DeploymentOrchestrator:
                     self.nginx_generator.enable_site(domain)
                     log(f"NGINX site enabled for {domain}", "success")
                     
-                    # Test NGINX configuration
-                    test_result = self.nginx_generator.test_config()
-                    if test_result['success']:
-                        log("NGINX configuration test passed", "success")
-                        
-                        # Reload NGINX
-                        reload_result = self.nginx_generator.reload_nginx()
-                        if reload_result['success']:
-                            log("NGINX reloaded successfully", "success")
-                        else:
-                            log(f"NGINX reload warning: {reload_result['error']}", "warning")
+                    # Test NGINX configuration and reload
+                    if skip_nginx_reload:
+                        log("NGINX test and reload deferred to the end of the batch", "info")
                     else:
-                        log(f"NGINX configuration test failed: {test_result['error']}", "error")
-                        result['errors'].append(f"NGINX config invalid: {test_result['error']}")
+                        self._test_and_reload_nginx(log, result['errors'])
                 
                 except Exception as e:
                     log(f"NGINX configuration error: {str(e)}", "error")
@@ -271,14 +480,249 @@ class DeploymentOrchestrator:
         
         return result
     
-    def rollback_deployment(self, project_id: str, project_name: str, domain: Optional[str] = None) -> Dict:
+    def detect_backend(self, backend_path: str) -> Dict:
+        """
+        Detect a backend's framework, reusing the result while it is unchanged.
+        
+        Results are kept in memory keyed by the detector's source tree
+        fingerprint, so an unchanged redeploy skips both the scan and the
+        detector's on-disk cache read. upload_backend drops the entry for a
+        path whenever new files are extracted there.
+        """
+        detector = BackendDetector(backend_path)
+        key = (os.path.abspath(backend_path), detector.get_fingerprint())
+        
+        with self._detect_cache_lock:
+            cached = self._detect_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        backend_config = detector.detect_framework()
+        with self._detect_cache_lock:
+            # Only the latest fingerprint per path is worth keeping
+            for stale_key in [k for k in self._detect_cache if k[0] == key[0]]:
+                del self._detect_cache[stale_key]
+            self._detect_cache[key] = copy.deepcopy(backend_config)
+        return backend_config
+    
+    @classmethod
+    def invalidate_detection(cls, backend_path: str) -> None:
+        """Forget cached detection results for a backend path"""
+        path = os.path.abspath(backend_path)
+        with cls._detect_cache_lock:
+            for key in [k for k in cls._detect_cache if k[0] == path]:
+                del cls._detect_cache[key]
+    
+    def _wait_for_port(self, port: int, host: str = "127.0.0.1") -> Optional[float]:
+        """
+        Poll until a TCP port accepts connections, backing off between tries.
+        
+        Returns:
+            Seconds until the port accepted, or None on timeout
+        """
+        start = time.monotonic()
+        delays = iter(self.BACKEND_STARTUP_DELAYS)
+        delay = 0.0
+        
+        while True:
+            try:
+                with socket.create_connection((host, port), timeout=0.5):
+                    return time.monotonic() - start
+            except OSError:
+                pass
+            
+            delay = next(delays, delay)
+            remaining = self.BACKEND_STARTUP_TIMEOUT - (time.monotonic() - start)
+            if remaining <= 0:
+                return None
+            time.sleep(min(delay, remaining))
+    
+    def _cached_dns_lookup(self, key: tuple, ttl: float, lookup, should_cache):
+        """Return a cached lookup result younger than ttl, else call lookup()"""
+        now = time.monotonic()
+        with self._dns_cache_lock:
+            cached = self._dns_cache.get(key)
+            if cached is not None and now - cached[0] < ttl:
+                return cached[1]
+        
+        value = lookup()
+        if should_cache(value):
+            with self._dns_cache_lock:
+                self._dns_cache[key] = (time.monotonic(), value)
+        return value
+    
+    def verify_domain(self, domain: str, expected_ip: str) -> Dict:
+        """Verify a domain's A-record, reusing a recent successful verification"""
+        return self._cached_dns_lookup(
+            ('verify', domain, expected_ip),
+            self.DNS_CACHE_TTL,
+            lambda: self.dns_verifier.verify_domain(domain, expected_ip),
+            lambda dns_result: dns_result['verified']
+        )
+    
+    def get_server_public_ip(self) -> Optional[str]:
+        """Get this server's public IP (cached by DNSVerifier)"""
+        return self.dns_verifier.get_server_public_ip()
+    
+    def verify_domains(self, domains: List[Tuple[str, str]]) -> List[Dict]:
+        """
+        Verify several (domain, expected_ip) pairs concurrently.
+        
+        Uncached pairs are resolved together with DNSVerifier.averify_domain,
+        so N domains cost about one DNS round trip. Successful results are
+        cached like verify_domain's.
+        
+        Returns:
+            Verification results in the order given
+        """
+        now = time.monotonic()
+        results = {}
+        with self._dns_cache_lock:
+            for domain, expected_ip in domains:
+                cached = self._dns_cache.get(('verify', domain, expected_ip))
+                if cached is not None and now - cached[0] < self.DNS_CACHE_TTL:
+                    results[(domain, expected_ip)] = cached[1]
+        
+        pending = list(dict.fromkeys(pair for pair in domains if pair not in results))
+        if pending:
+            async def verify_all():
+                return await asyncio.gather(*(
+                    self.dns_verifier.averify_domain(domain, expected_ip)
+                    for domain, expected_ip in pending
+                ))
+            
+            verified = asyncio.run(verify_all())
+            with self._dns_cache_lock:
+                for (domain, expected_ip), dns_result in zip(pending, verified):
+                    results[(domain, expected_ip)] = dns_result
+                    if dns_result['verified']:
+                        self._dns_cache[('verify', domain, expected_ip)] = (time.monotonic(), dns_result)
+        
+        return [results[pair] for pair in domains]
+    
+    @classmethod
+    def clear_dns_cache(cls) -> None:
+        """Forget cached DNS results so the next deployment queries again"""
+        with cls._dns_cache_lock:
+            cls._dns_cache.clear()
+    
+    def deploy_project_stream(self, **kwargs) -> Generator[str, None, Dict]:
+        """
+        Run deploy_project, yielding each log entry as soon as it is written.
+        
+        The deployment runs on a worker thread so callers (e.g. a streaming
+        HTTP response) can forward progress live instead of waiting for the
+        whole deployment.
+        
+        Args:
+            **kwargs: deploy_project arguments
+            
+        Returns:
+            The deploy_project result, as the generator's return value
+        """
+        entries = queue.Queue()
+        outcome = {}
+        
+        def run():
+            try:
+                outcome['result'] = self.deploy_project(**kwargs, on_log=entries.put)
+            except Exception as e:
+                outcome['error'] = e
+            finally:
+                entries.put(None)
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        
+        while (entry := entries.get()) is not None:
+            yield entry
+        
+        thread.join()
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['result']
+    
+    def deploy_projects(self, specs: List[Dict], reload_once: bool = True) -> List[Dict]:
+        """
+        Deploy several projects in one go.
+        
+        DNS for every domain is verified concurrently up front (see
+        verify_domains), so each deploy_project call hits the DNS cache
+        instead of resolving its domain serially. With reload_once, NGINX
+        is tested and reloaded a single time after all sites are written.
+        
+        Args:
+            specs: List of deploy_project keyword arguments, one per project
+            reload_once: Defer every project's NGINX test/reload to one at the end
+            
+        Returns:
+            List of deploy_project results in the same order
+        """
+        dns_specs = [spec for spec in specs if spec.get('domain') and spec.get('verify_dns', True)]
+        if dns_specs:
+            server_ip = None
+            if any(not spec.get('expected_ip') for spec in dns_specs):
+                server_ip = self.get_server_public_ip()
+            
+            pairs = [(spec['domain'], spec.get('expected_ip') or server_ip) for spec in dns_specs]
+            self.verify_domains([(domain, ip) for domain, ip in pairs if ip])
+        
+        if not reload_once:
+            return [self.deploy_project(**spec) for spec in specs]
+        
+        results = [self.deploy_project(**spec, skip_nginx_reload=True) for spec in specs]
+        
+        # Projects whose site was written share the batch's single test/reload
+        nginx_results = [result for result in results if result['nginx_config']]
+        if nginx_results:
+            batch_logs = []
+            batch_errors = []
+            self._test_and_reload_nginx(
+                lambda message, level="info": batch_logs.append(_log_entry(message, level)),
+                batch_errors
+            )
+            for result in nginx_results:
+                result['logs'].extend(batch_logs)
+                result['errors'].extend(batch_errors)
+                if batch_errors:
+                    result['success'] = False
+        
+        return results
+    
+    def _test_and_reload_nginx(self, log, errors: List[str]) -> bool:
+        """Test the NGINX configuration and reload it if the test passes"""
+        test_result = self.nginx_generator.test_config()
+        if not test_result['success']:
+            log(f"NGINX configuration test failed: {test_result['error']}", "error")
+            errors.append(f"NGINX config invalid: {test_result['error']}")
+            return False
+        
+        log("NGINX configuration test passed", "success")
+        
+        # Reload NGINX
+        reload_result = self.nginx_generator.reload_nginx()
+        if reload_result['success']:
+            log("NGINX reloaded successfully", "success")
+        else:
+            log(f"NGINX reload warning: {reload_result['error']}", "warning")
+        return True
+    
+    def rollback_deployment(self,
+                            project_id: str,
+                            project_name: str,
+                            domain: Optional[str] = None,
+                            reload_nginx: bool = True) -> Dict:
         """
         Rollback a deployment.
         
+        Stopping the backend, removing the NGINX site and deleting the
+        deployed files are independent, so they run concurrently.
+        
         Args:
             project_id: Project identifier
             project_name: Project name
             domain: Domain name (optional)
+            reload_nginx: Reload NGINX afterwards (parallel_rollback reloads once instead)
             
         Returns:
             Dict with rollback results
@@ -291,22 +735,32 @@ class DeploymentOrchestrator:
             'removed_files': False
         }
         
-        try:
-            # Stop backend
-            stop_result = self.process_manager.stop_backend(project_id, force=True)
-            result['stopped_backend'] = stop_result['success']
-            
-            # Remove NGINX configuration
-            if domain:
-                self.nginx_generator.remove_config(domain)
-                self.nginx_generator.reload_nginx()
-                result['removed_nginx'] = True
-            
-            # Remove deployed files
-            project_deploy_path = self.deployment_root / project_name
+        project_deploy_path = self.deployment_root / project_name
+        
+        def remove_files():
             if project_deploy_path.exists():
                 shutil.rmtree(project_deploy_path)
-                result['removed_files'] = True
+                return True
+            return False
+        
+        try:
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                stop_future = executor.submit(self.process_manager.stop_backend, project_id)
+                nginx_future = executor.submit(self.nginx_generator.remove_config, domain) if domain else None
+                files_future = executor.submit(remove_files)
+                
+                # Stop backend
+                result['stopped_backend'] = stop_future.result()['success']
+                
+                # Remove NGINX configuration
+                if nginx_future is not None:
+                    nginx_future.result()
+                    if reload_nginx:
+                        self.nginx_generator.reload_nginx()
+                    result['removed_nginx'] = True
+                
+                # Remove deployed files
+                result['removed_files'] = files_future.result()
             
             result['success'] = True
             result['message'] = "Rollback completed successfully"
@@ -316,35 +770,88 @@ class DeploymentOrchestrator:
         
         return result
     
+    def parallel_rollback(self, project_specs: List[Dict]) -> List[Dict]:
+        """
+        Roll back several deployments concurrently.
+        
+        Args:
+            project_specs: List of dicts with 'project_id', 'project_name'
+                and optional 'domain'
+            
+        Returns:
+            List of rollback_deployment results in the same order
+        """
+        if not project_specs:
+            return []
+        
+        def rollback(spec):
+            return self.rollback_deployment(
+                spec['project_id'], spec['project_name'], spec.get('domain'), reload_nginx=False
+            )
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(project_specs))) as executor:
+            results = list(executor.map(rollback, project_specs))
+        
+        # One NGINX reload covers every removed site
+        if any(result['removed_nginx'] for result in results):
+            self.nginx_generator.reload_nginx()
+        
+        return results
+    
     def get_deployment_status(self, project_id: str) -> Dict:
         """Get current deployment status"""
         return self.process_manager.get_process_status(project_id)
     
     @staticmethod
-    def calculate_file_hash(file_path: str) -> str:
-        """Calculate SHA256 hash of a file"""
-        sha256_hash = hashlib.sha256()
-        
+    def calculate_file_hash(file_path: str, algorithm: str = "sha256") -> str:
+        """Calculate the hash of a file (SHA256 by default, any hashlib algorithm)"""
         with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
+            if os.fstat(f.fileno()).st_size > HASH_READAHEAD_MIN_SIZE:
+                file_hash = hashlib.new(algorithm)
+                _hash_with_readahead(f, file_hash)
+                return file_hash.hexdigest()
+            
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, algorithm).hexdigest()
+            
+            # Reuse one buffer instead of allocating a bytes object per block
+            file_hash = hashlib.new(algorithm)
+            view = memoryview(bytearray(HASH_BLOCK_SIZE))
+            while (size := f.readinto(view)):
+                file_hash.update(view[:size])
         
-        return sha256_hash.hexdigest()
+        return file_hash.hexdigest()
     
     @staticmethod
     def calculate_directory_hash(directory_path: str) -> str:
-        """Calculate hash of entire directory"""
-        sha256_hash = hashlib.sha256()
+        """
+        Calculate hash of entire directory.
         
-        for root, dirs, files in os.walk(directory_path):
-            # Sort for consistency
-            for filename in sorted(files):
+        Files are hashed concurrently and the root digest combines each
+        relative path with its file digest in sorted order, so the result
+        is deterministic and changes on renames as well as content edits.
+        Unreadable files are skipped.
+        """
+        files = []
+        for root, dirs, filenames in os.walk(directory_path):
+            for filename in filenames:
                 file_path = os.path.join(root, filename)
-                try:
-                    with open(file_path, 'rb') as f:
-                        for byte_block in iter(lambda: f.read(4096), b""):
-                            sha256_hash.update(byte_block)
-                except Exception:
-                    pass
+                relative_path = os.path.relpath(file_path, directory_path).replace(os.sep, '/')
+                files.append((relative_path, file_path))
+        files.sort()
+        
+        def leaf_digest(file_path):
+            try:
+                return DeploymentOrchestrator.calculate_file_hash(file_path).encode()
+            except Exception:
+                return None
+        
+        with ThreadPoolExecutor(max_workers=min(32, os.cpu_count() or 1)) as executor:
+            digests = executor.map(leaf_digest, [file_path for _, file_path in files])
+            
+            sha256_hash = hashlib.sha256()
+            for (relative_path, _), digest in zip(files, digests):
+                if digest is not None:
+                    sha256_hash.update(relative_path.encode() + b"\0" + digest)
         
         return sha256_hash.hexdigest()
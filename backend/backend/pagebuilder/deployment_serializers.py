@@ -51,10 +51,17 @@ class ProjectSerializer(serializers.ModelSerializer):
         read_only_fields = ['user']
     
     def get_deployment_count(self, obj):
+        # Annotated by ProjectViewSet.get_queryset
+        if hasattr(obj, 'deployment_count'):
+            return obj.deployment_count
         return obj.deployments.count()
     
     def get_latest_deployment(self, obj):
-        latest = obj.deployments.first()
+        # Prefetched by ProjectViewSet.get_queryset
+        if hasattr(obj, 'latest_deployments'):
+            latest = obj.latest_deployments[0] if obj.latest_deployments else None
+        else:
+            latest = obj.deployments.first()
         if latest:
             return {
                 'id': latest.id,
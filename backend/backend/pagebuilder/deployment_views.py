@@ -5,8 +5,15 @@ REST API endpoints for project management, deployment, and monitoring.
 
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.exceptions import ValidationError
+from django.db import close_old_connections, transaction
+from django.db.models import Count, F, Prefetch, Q
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
@@ -26,7 +33,196 @@ from .deployment_orchestrator import DeploymentOrchestrator
 
 import os
 import shutil
-from pathlib import Path
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+
+try:
+    from zlib_ng import zlib_ng
+except ImportError:
+    zlib_ng = None
+
+# zlib-ng's SIMD inflate and CRC32 are drop-in replacements for zlib;
+# zipfile looks both up through its module globals
+if zlib_ng is not None:
+    zipfile.zlib = zlib_ng
+    zipfile.crc32 = zlib_ng.crc32
+
+# Archives that unpack to more than this are extracted by several threads
+ZIP_PARALLEL_MIN_SIZE = 8 * 1024 * 1024
+# Read/write size when copying a member out of the archive
+ZIP_COPY_BUFFER_SIZE = 1024 * 1024
+# Uploads that would unpack to more than this are rejected unextracted
+ZIP_MAX_EXTRACTED_SIZE = 2 * 1024 * 1024 * 1024
+
+# Deployments queued through queue_deployment run here, outside the request.
+# The pool is per process, so each API worker runs up to DEPLOYMENT_WORKERS
+# deployments, and queued jobs are lost when the process exits; the
+# fail_abandoned_deployments command fails those rows at startup
+DEPLOYMENT_WORKERS = 4
+# Unfinished deployments older than this are assumed lost (e.g. to a dev
+# auto-reload) and are failed when the next deployment is queued
+DEPLOYMENT_ABANDON_AFTER = timedelta(hours=1)
+_deployment_executor = ThreadPoolExecutor(max_workers=DEPLOYMENT_WORKERS, thread_name_prefix='deployment')
+
+# Building a DNSVerifier re-reads resolv.conf, so the views share one
+_dns_verifier = None
+
+# One orchestrator per process, so its ProcessManager keeps track of the
+# backends started by earlier requests
+_orchestrator = None
+
+
+def _streaming_content(request, lines):
+    """
+    Adapt a blocking line iterator for StreamingHttpResponse.
+    
+    Under ASGI Django buffers synchronous iterators completely before
+    sending, so each line is pulled in a worker thread by an async
+    iterator instead.
+    """
+    if not isinstance(getattr(request, '_request', request), ASGIRequest):
+        return lines
+    
+    next_line = sync_to_async(next, thread_sensitive=True)
+    
+    async def async_lines():
+        finished = object()
+        try:
+            while (line := await next_line(lines, finished)) is not finished:
+                yield line
+        finally:
+            # Run the sync iterator's cleanup on a worker thread too
+            if hasattr(lines, 'close'):
+                await sync_to_async(lines.close, thread_sensitive=True)()
+    
+    return async_lines()
+
+
+class DeploymentCursorPagination(CursorPagination):
+    """
+    Newest-first keyset pagination for deployment lists; pages are index
+    range scans however long the history grows.
+    """
+    ordering = '-started_at'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+def _get_dns_verifier():
+    """Return the shared DNSVerifier, created on first use"""
+    global _dns_verifier
+    if _dns_verifier is None:
+        _dns_verifier = DNSVerifier()
+    return _dns_verifier
+
+
+def _get_orchestrator():
+    """Return the shared DeploymentOrchestrator, created on first use"""
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = DeploymentOrchestrator()
+    return _orchestrator
+
+
+def _member_path(destination, info):
+    """
+    Path a ZIP member is extracted to, sanitized the way ZipFile.extract
+    does it (drive, absolute and '..' components are dropped).
+    """
+    arcname = info.filename.replace('/', os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = [part for part in arcname.split(os.path.sep) if part not in ('', os.path.curdir, os.path.pardir)]
+    return Path(destination, *parts)
+
+
+def _archive_opener(uploaded_file):
+    """Return a callable opening an independent ZipFile over the upload"""
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        path = uploaded_file.temporary_file_path()
+        return lambda: zipfile.ZipFile(path, 'r')
+    
+    uploaded_file.seek(0)
+    data = uploaded_file.read()
+    return lambda: zipfile.ZipFile(BytesIO(data), 'r')
+
+
+def _extract_members(zip_ref, members):
+    """Write (ZipInfo, target path) pairs whose directories already exist"""
+    for info, target in members:
+        with zip_ref.open(info) as source, open(target, 'wb') as output:
+            shutil.copyfileobj(source, output, ZIP_COPY_BUFFER_SIZE)
+
+
+def _extract_upload(uploaded_file, destination, required_files=()):
+    """
+    Extract an uploaded ZIP into destination.
+    
+    The archive listing is checked before anything is written: it must
+    unpack to at most ZIP_MAX_EXTRACTED_SIZE and, when required_files is
+    given, contain at least one file with one of those names.
+    
+    Every directory in the archive is created once up front, so writing a
+    member is just open + copy rather than extract()'s per-member makedirs.
+    Large archives are split into one shard per CPU; every worker opens its
+    own ZipFile so reads use independent offsets and zlib inflates in
+    parallel (it releases the GIL).
+    
+    Returns:
+        The archive's ZipInfo list
+    
+    Raises:
+        ValueError: If the archive fails the checks above
+        zipfile.BadZipFile: If the upload is not a ZIP archive
+    """
+    destination = Path(destination)
+    
+    # Django already spooled the upload (in memory or a temp file),
+    # so read the archive straight from it
+    with zipfile.ZipFile(uploaded_file, 'r') as zip_ref:
+        infos = zip_ref.infolist()
+        
+        if sum(info.file_size for info in infos) > ZIP_MAX_EXTRACTED_SIZE:
+            raise ValueError('Archive is too large to extract')
+        if required_files and not any(
+            PurePosixPath(info.filename).name in required_files for info in infos
+        ):
+            raise ValueError(f"Archive contains none of: {', '.join(required_files)}")
+        
+        directories = set()
+        members = []
+        for info in infos:
+            target = _member_path(destination, info)
+            if info.is_dir():
+                directories.add(target)
+            elif target != destination:
+                directories.add(target.parent)
+                members.append((info, target))
+        
+        for directory in sorted(directories):
+            directory.mkdir(parents=True, exist_ok=True)
+        
+        workers = os.cpu_count() or 1
+        if workers == 1 or sum(info.file_size for info, _ in members) <= ZIP_PARALLEL_MIN_SIZE:
+            _extract_members(zip_ref, members)
+            return infos
+    
+    open_archive = _archive_opener(uploaded_file)
+    
+    def extract_shard(shard):
+        with open_archive() as zip_ref:
+            _extract_members(zip_ref, shard)
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # list() re-raises the first worker error
+        list(executor.map(extract_shard, [members[index::workers] for index in range(workers)]))
+    
+    return infos
 
 
 class ProjectViewSet(viewsets.ModelViewSet):
@@ -37,7 +233,19 @@ class ProjectViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Project.objects.filter(user=self.request.user)
+        # Counts, the latest deployment and the nested configs are loaded
+        # up front so ProjectSerializer doesn't query per project
+        latest_deployments = Deployment.objects.only(
+            'id', 'project_id', 'status', 'started_at', 'completed_at'
+        ).order_by('-started_at')[:1]
+        return Project.objects.filter(user=self.request.user).annotate(
+            deployment_count=Count('deployments')
+        ).select_related(
+            'backend_config', 'domain_config'
+        ).prefetch_related(
+            'backend_config__api_endpoints',
+            Prefetch('deployments', queryset=latest_deployments, to_attr='latest_deployments'),
+        )
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -109,28 +317,19 @@ class ProjectViewSet(viewsets.ModelViewSet):
         
         # Handle ZIP file
         if uploaded_file.name.endswith('.zip'):
-            import zipfile
-            import tempfile
+            try:
+                infos = _extract_upload(uploaded_file, frontend_dist)
+            except (ValueError, zipfile.BadZipFile) as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as tmp:
-                for chunk in uploaded_file.chunks():
-                    tmp.write(chunk)
-                tmp_path = tmp.name
+            project.frontend_dist_path = str(frontend_dist)
+            project.save()
             
-            try:
-                with zipfile.ZipFile(tmp_path, 'r') as zip_ref:
-                    zip_ref.extractall(frontend_dist)
-                
-                project.frontend_dist_path = str(frontend_dist)
-                project.save()
-                
-                return Response({
-                    'message': 'Frontend uploaded successfully',
-                    'path': str(frontend_dist),
-                    'files_count': len(list(frontend_dist.rglob('*')))
-                })
-            finally:
-                os.unlink(tmp_path)
+            return Response({
+                'message': 'Frontend uploaded successfully',
+                'path': str(frontend_dist),
+                'files_count': sum(1 for info in infos if not info.is_dir())
+            })
         
         return Response(
             {'error': 'Only ZIP files are supported'},
@@ -159,85 +358,103 @@ class ProjectViewSet(viewsets.ModelViewSet):
         
         # Handle ZIP file
         if uploaded_file.name.endswith('.zip'):
-            import zipfile
-            import tempfile
+            try:
+                # Reject archives detection could not make sense of up front
+                _extract_upload(uploaded_file, backend_dir, BackendDetector.MANIFEST_FILES)
+            except (ValueError, zipfile.BadZipFile) as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            
+            project.backend_path = str(backend_dir)
+            project.save()
             
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as tmp:
-                for chunk in uploaded_file.chunks():
-                    tmp.write(chunk)
-                tmp_path = tmp.name
+            # The orchestrator's detection memo must not outlive the old files
+            DeploymentOrchestrator.invalidate_detection(str(backend_dir))
             
+            # Detect backend framework
             try:
-                with zipfile.ZipFile(tmp_path, 'r') as zip_ref:
-                    zip_ref.extractall(backend_dir)
+                detector = BackendDetector(str(backend_dir))
+                detection_result = detector.detect_framework()
                 
-                project.backend_path = str(backend_dir)
-                project.save()
+                # Create or update backend config
+                backend_config, created = BackendConfig.objects.get_or_create(
+                    project=project,
+                    defaults={
+                        'framework': detection_result['framework'],
+                        'detected_apis': detection_result['detected_apis'],
+                        'detected_models': detection_result['detected_models'],
+                        'start_command': detection_result['suggested_start_command'],
+                        'port': detection_result['port']
+                    }
+                )
                 
-                # Detect backend framework
-                try:
-                    detector = BackendDetector(str(backend_dir))
-                    detection_result = detector.detect_framework()
-                    
-                    # Create or update backend config
-                    backend_config, created = BackendConfig.objects.get_or_create(
-                        project=project,
-                        defaults={
-                            'framework': detection_result['framework'],
-                            'detected_apis': detection_result['detected_apis'],
-                            'detected_models': detection_result['detected_models'],
-                            'start_command': detection_result['suggested_start_command'],
-                            'port': detection_result['port']
-                        }
+                if not created:
+                    backend_config.framework = detection_result['framework']
+                    backend_config.detected_apis = detection_result['detected_apis']
+                    backend_config.detected_models = detection_result['detected_models']
+                    backend_config.start_command = detection_result['suggested_start_command']
+                    backend_config.port = detection_result['port']
+                    backend_config.save()
+                
+                # Create API endpoint entries in one INSERT; endpoints that
+                # already exist hit unique_together and are skipped
+                APIEndpoint.objects.bulk_create([
+                    APIEndpoint(
+                        backend_config=backend_config,
+                        path=api_data.get('path', api_data.get('name', '')),
+                        method=api_data.get('method', 'GET'),
+                        description=f"Auto-detected from {api_data.get('file', 'unknown')}"
                     )
-                    
-                    if not created:
-                        backend_config.framework = detection_result['framework']
-                        backend_config.detected_apis = detection_result['detected_apis']
-                        backend_config.detected_models = detection_result['detected_models']
-                        backend_config.start_command = detection_result['suggested_start_command']
-                        backend_config.port = detection_result['port']
-                        backend_config.save()
-                    
-                    # Create API endpoint entries
-                    for api_data in detection_result['detected_apis']:
-                        APIEndpoint.objects.get_or_create(
-                            backend_config=backend_config,
-                            path=api_data.get('path', api_data.get('name', '')),
-                            method=api_data.get('method', 'GET'),
-                            defaults={
-                                'description': f"Auto-detected from {api_data.get('file', 'unknown')}"
-                            }
-                        )
-                    
-                    return Response({
-                        'message': 'Backend uploaded and detected successfully',
-                        'path': str(backend_dir),
-                        'detection': BackendDetectionResultSerializer(detection_result).data
-                    })
+                    for api_data in detection_result['detected_apis']
+                ], batch_size=1000, ignore_conflicts=True)
                 
-                except Exception as e:
-                    return Response({
-                        'message': 'Backend uploaded but detection failed',
-                        'path': str(backend_dir),
-                        'error': str(e)
-                    }, status=status.HTTP_207_MULTI_STATUS)
+                return Response({
+                    'message': 'Backend uploaded and detected successfully',
+                    'path': str(backend_dir),
+                    'detection': BackendDetectionResultSerializer(detection_result).data
+                })
             
-            finally:
-                os.unlink(tmp_path)
+            except Exception as e:
+                return Response({
+                    'message': 'Backend uploaded but detection failed',
+                    'path': str(backend_dir),
+                    'error': str(e)
+                }, status=status.HTTP_207_MULTI_STATUS)
         
         return Response(
             {'error': 'Only ZIP files are supported'},
             status=status.HTTP_400_BAD_REQUEST
         )
     
+    @action(detail=False, methods=['get'])
+    def backend_health(self, request):
+        """Health check the running backends of the user's projects."""
+        process_manager = _get_orchestrator().process_manager
+        # Read from the shared registry, so backends started by other
+        # workers are included
+        running = dict(
+            BackendConfig.objects
+            .filter(project__user=request.user, is_running=True, process_id__isnull=False)
+            .values_list('project_id', 'port')
+        )
+        
+        # Checked concurrently, so one hung backend doesn't hold up the rest
+        health = process_manager.health_check_all(list(running.values()))
+        return Response(dict(zip(running, health)))
+    
     @action(detail=True, methods=['get'])
     def deployment_history(self, request, pk=None):
-        """Get deployment history for a project."""
+        """Get deployment history for a project, one page at a time."""
         project = self.get_object()
-        deployments = project.deployments.all()[:20]  # Last 20 deployments
-        serializer = DeploymentSerializer(deployments, many=True)
-        return Response(serializer.data)
+        # The related manager already supplies deployment.project, and the
+        # user comes from the same query
+        deployments = project.deployments.select_related('user').only(
+            'id', 'project', 'user__username', 'status', 'logs',
+            'frontend_hash', 'backend_hash', 'started_at', 'completed_at'
+        )
+        paginator = DeploymentCursorPagination()
+        page = paginator.paginate_queryset(deployments, request, view=self)
+        serializer = DeploymentSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class DomainConfigViewSet(viewsets.ModelViewSet):
@@ -257,7 +474,7 @@ class DomainConfigViewSet(viewsets.ModelViewSet):
         """
         domain_config = self.get_object()
         
-        verifier = DNSVerifier()
+        verifier = _get_dns_verifier()
         
         # Get server IP if not set
         if not domain_config.expected_ip:
@@ -288,7 +505,7 @@ class DomainConfigViewSet(viewsets.ModelViewSet):
         """
         domain_config = self.get_object()
         
-        verifier = DNSVerifier()
+        verifier = _get_dns_verifier()
         
         # Get server IP
         server_ip = domain_config.expected_ip
@@ -309,14 +526,20 @@ class DeploymentViewSet(viewsets.ModelViewSet):
     """
     serializer_class = DeploymentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = DeploymentCursorPagination
     
     def get_queryset(self):
-        return Deployment.objects.filter(user=self.request.user)
+        queryset = Deployment.objects.filter(user=self.request.user)
+        if self.action == 'rollback':
+            queryset = queryset.select_related('project__domain_config')
+        return queryset
     
-    @action(detail=False, methods=['post'])
-    def trigger_deployment(self, request):
+    def _start_deployment(self, request):
         """
-        Trigger a new deployment for a project.
+        Validate a trigger request and create its deployment record.
+        
+        Returns:
+            (project, deployment, validated data), or an error Response
         """
         serializer = DeploymentTriggerSerializer(data=request.data)
         
@@ -326,9 +549,9 @@ class DeploymentViewSet(viewsets.ModelViewSet):
         data = serializer.validated_data
         project_id = data['project_id']
         
-        # Get project
+        # Get project, with its domain config for _deploy_arguments
         project = get_object_or_404(
-            Project.objects.filter(user=request.user),
+            Project.objects.filter(user=request.user).select_related('domain_config'),
             id=project_id
         )
         
@@ -338,68 +561,97 @@ class DeploymentViewSet(viewsets.ModelViewSet):
             user=request.user,
             status='pending'
         )
+        return project, deployment, data
+    
+    @staticmethod
+    def _deploy_arguments(project, data):
+        """Build DeploymentOrchestrator.deploy_project arguments for a project"""
+        # Get domain config if exists
+        domain = None
+        expected_ip = None
+        ssl_enabled = False
+        ssl_cert = ""
+        ssl_key = ""
+        
+        domain_config = getattr(project, 'domain_config', None)
+        if domain_config is not None:
+            domain = domain_config.domain_name
+            expected_ip = domain_config.expected_ip
+            ssl_enabled = domain_config.ssl_enabled
+            ssl_cert = domain_config.ssl_cert_path
+            ssl_key = domain_config.ssl_key_path
+        
+        return {
+            'project_id': str(project.id),
+            'project_name': project.slug,
+            'frontend_dist_path': project.frontend_dist_path,
+            'backend_path': project.backend_path if data['deploy_backend'] else None,
+            'domain': domain if data['apply_nginx'] else None,
+            'expected_ip': expected_ip,
+            'ssl_enabled': ssl_enabled,
+            'ssl_cert_path': ssl_cert,
+            'ssl_key_path': ssl_key,
+            'verify_dns': data['verify_dns'],
+            'restart_backend': data['restart_backend'],
+        }
+    
+    @staticmethod
+    def _record_result(deployment, project, result):
+        """Store a deploy_project result on the deployment and project configs"""
+        # Update deployment record
+        deployment.logs = '\n'.join(result['logs'])
+        deployment.status = 'success' if result['success'] else 'failed'
+        deployment.completed_at = timezone.now()
+        
+        # Commit all rows together; the configs are updated column-wise in
+        # the database so concurrent deployments can't undo each other
+        with transaction.atomic():
+            if result['success']:
+                # Update backend config if backend was started
+                if result.get('backend_pid'):
+                    BackendConfig.objects.filter(project=project).update(
+                        process_id=result['backend_pid'],
+                        is_running=True,
+                        last_started=deployment.completed_at
+                    )
+                
+                # Update domain config if NGINX was applied
+                if result.get('nginx_config'):
+                    DomainConfig.objects.filter(project=project).update(
+                        nginx_config_path=result['nginx_config'],
+                        nginx_enabled=True
+                    )
+            
+            deployment.save(update_fields=['status', 'logs', 'completed_at'])
+    
+    @staticmethod
+    def _record_error(deployment, error):
+        """Mark a deployment as failed by an unexpected error"""
+        deployment.status = 'failed'
+        deployment.logs += f"\n\nDeployment error: {str(error)}"
+        deployment.completed_at = timezone.now()
+        deployment.save(update_fields=['status', 'logs', 'completed_at'])
+    
+    @action(detail=False, methods=['post'])
+    def trigger_deployment(self, request):
+        """
+        Trigger a new deployment for a project.
+        """
+        started = self._start_deployment(request)
+        if isinstance(started, Response):
+            return started
+        project, deployment, data = started
         
         # Start deployment orchestration
-        orchestrator = DeploymentOrchestrator()
+        orchestrator = _get_orchestrator()
         
         try:
             deployment.status = 'validating'
-            deployment.save()
-            
-            # Get domain config if exists
-            domain = None
-            expected_ip = None
-            ssl_enabled = False
-            ssl_cert = ""
-            ssl_key = ""
-            
-            if hasattr(project, 'domain_config'):
-                domain = project.domain_config.domain_name
-                expected_ip = project.domain_config.expected_ip
-                ssl_enabled = project.domain_config.ssl_enabled
-                ssl_cert = project.domain_config.ssl_cert_path
-                ssl_key = project.domain_config.ssl_key_path
+            deployment.save(update_fields=['status'])
             
             # Execute deployment
-            result = orchestrator.deploy_project(
-                project_id=str(project.id),
-                project_name=project.slug,
-                frontend_dist_path=project.frontend_dist_path,
-                backend_path=project.backend_path if data['deploy_backend'] else None,
-                domain=domain if data['apply_nginx'] else None,
-                expected_ip=expected_ip,
-                ssl_enabled=ssl_enabled,
-                ssl_cert_path=ssl_cert,
-                ssl_key_path=ssl_key,
-                verify_dns=data['verify_dns'],
-                restart_backend=data['restart_backend']
-            )
-            
-            # Update deployment record
-            deployment.logs = '\n'.join(result['logs'])
-            
-            if result['success']:
-                deployment.status = 'success'
-                
-                # Update backend config if backend was started
-                if result.get('backend_pid') and hasattr(project, 'backend_config'):
-                    backend_config = project.backend_config
-                    backend_config.process_id = result['backend_pid']
-                    backend_config.is_running = True
-                    backend_config.last_started = timezone.now()
-                    backend_config.save()
-                
-                # Update domain config if NGINX was applied
-                if result.get('nginx_config') and hasattr(project, 'domain_config'):
-                    domain_config = project.domain_config
-                    domain_config.nginx_config_path = result['nginx_config']
-                    domain_config.nginx_enabled = True
-                    domain_config.save()
-            else:
-                deployment.status = 'failed'
-            
-            deployment.completed_at = timezone.now()
-            deployment.save()
+            result = orchestrator.deploy_project(**self._deploy_arguments(project, data))
+            self._record_result(deployment, project, result)
             
             return Response({
                 'deployment_id': deployment.id,
@@ -409,16 +661,110 @@ class DeploymentViewSet(viewsets.ModelViewSet):
             })
         
         except Exception as e:
-            deployment.status = 'failed'
-            deployment.logs += f"\n\nDeployment error: {str(e)}"
-            deployment.completed_at = timezone.now()
-            deployment.save()
+            self._record_error(deployment, e)
             
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @classmethod
+    def _run_deployment(cls, project, deployment, data):
+        """Run a queued deployment on a worker thread and store its result"""
+        try:
+            result = _get_orchestrator().deploy_project(**cls._deploy_arguments(project, data))
+            cls._record_result(deployment, project, result)
+        except Exception as e:
+            cls._record_error(deployment, e)
+        finally:
+            # Worker threads outlive requests, so release the connection here
+            close_old_connections()
+    
+    @action(detail=False, methods=['post'])
+    def queue_deployment(self, request):
+        """
+        Queue a new deployment and return immediately.
+        
+        The deployment runs on a background worker; poll the deployment
+        (GET /deployments/<id>/) until its status is 'success' or 'failed'.
+        A deployment lost to a restart is reported as 'failed' with an
+        "abandoned" log line, at the next startup or once it is older than
+        DEPLOYMENT_ABANDON_AFTER.
+        """
+        started = self._start_deployment(request)
+        if isinstance(started, Response):
+            return started
+        project, deployment, data = started
+        
+        Deployment.fail_abandoned(timezone.now() - DEPLOYMENT_ABANDON_AFTER)
+        
+        deployment.status = 'validating'
+        deployment.save(update_fields=['status'])
+        
+        _deployment_executor.submit(self._run_deployment, project, deployment, data)
+        
+        return Response({
+            'deployment_id': deployment.id,
+            'status': deployment.status
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['post'])
+    def trigger_deployment_stream(self, request):
+        """
+        Trigger a new deployment and stream its log lines as plain text.
+        
+        Each log entry is sent as soon as the orchestrator writes it; the
+        final line reports the deployment id and status.
+        """
+        started = self._start_deployment(request)
+        if isinstance(started, Response):
+            return started
+        project, deployment, data = started
+        
+        deployment.status = 'validating'
+        deployment.save(update_fields=['status'])
+        
+        orchestrator = _get_orchestrator()
+        
+        def finish(stream):
+            """Let a deployment whose client went away run out and record it"""
+            try:
+                while True:
+                    next(stream)
+            except StopIteration as finished:
+                self._record_result(deployment, project, finished.value)
+            except Exception as e:
+                self._record_error(deployment, e)
+        
+        def lines():
+            try:
+                stream = orchestrator.deploy_project_stream(**self._deploy_arguments(project, data))
+                while True:
+                    try:
+                        entry = next(stream)
+                    except StopIteration as finished:
+                        result = finished.value
+                        break
+                    try:
+                        yield entry + '\n'
+                    except GeneratorExit:
+                        # The response was closed early; the worker thread
+                        # keeps deploying, so wait for it before giving up
+                        finish(stream)
+                        raise
+            except Exception as e:
+                self._record_error(deployment, e)
+                yield f"Deployment error: {str(e)}\n"
+                return
+            
+            self._record_result(deployment, project, result)
+            yield f"Deployment {deployment.id} {deployment.status}\n"
+        
+        return StreamingHttpResponse(
+            _streaming_content(request, lines()),
+            content_type='text/plain; charset=utf-8'
+        )
+    
     @action(detail=True, methods=['post'])
     def rollback(self, request, pk=None):
         """
@@ -427,11 +773,10 @@ class DeploymentViewSet(viewsets.ModelViewSet):
         deployment = self.get_object()
         project = deployment.project
         
-        orchestrator = DeploymentOrchestrator()
+        orchestrator = _get_orchestrator()
         
-        domain = None
-        if hasattr(project, 'domain_config'):
-            domain = project.domain_config.domain_name
+        domain_config = getattr(project, 'domain_config', None)
+        domain = domain_config.domain_name if domain_config is not None else None
         
         result = orchestrator.rollback_deployment(
             project_id=str(project.id),
@@ -445,10 +790,9 @@ class DeploymentViewSet(viewsets.ModelViewSet):
                 project=project,
                 user=request.user,
                 status='rollback',
-                logs=f"Rolled back deployment {deployment.id}\n{result['message']}"
+                logs=f"Rolled back deployment {deployment.id}\n{result['message']}",
+                completed_at=timezone.now()
             )
-            rollback_deployment.completed_at = timezone.now()
-            rollback_deployment.save()
             
             return Response({
                 'message': 'Rollback successful',
@@ -468,11 +812,17 @@ class ComponentLibraryViewSet(viewsets.ModelViewSet):
     serializer_class = ComponentLibrarySerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    # Actions that never read the (potentially large) component payload
+    PAYLOAD_FREE_ACTIONS = ('destroy', 'increment_usage')
+    
     def get_queryset(self):
         # Show user's components and public components
-        return ComponentLibrary.objects.filter(
-            user=self.request.user
-        ) | ComponentLibrary.objects.filter(is_public=True)
+        queryset = ComponentLibrary.objects.filter(
+            Q(user=self.request.user) | Q(is_public=True)
+        )
+        if self.action in self.PAYLOAD_FREE_ACTIONS:
+            queryset = queryset.defer('component_json')
+        return queryset
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -480,10 +830,17 @@ class ComponentLibraryViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def increment_usage(self, request, pk=None):
         """Increment usage count when component is used."""
-        component = self.get_object()
-        component.usage_count += 1
-        component.save()
-        return Response({'usage_count': component.usage_count})
+        # Increment in the database so concurrent uses are not lost; a
+        # malformed pk is a 404 like get_object()
+        try:
+            component = self.get_queryset().filter(pk=pk)
+            updated = component.update(usage_count=F('usage_count') + 1)
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        if not updated:
+            raise Http404
+        
+        return Response({'usage_count': component.values_list('usage_count', flat=True).get()})
 
 
 class AnimationViewSet(viewsets.ModelViewSet):
@@ -494,7 +851,10 @@ class AnimationViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Animation.objects.filter(user=self.request.user)
+        queryset = Animation.objects.filter(user=self.request.user)
+        if self.action == 'destroy':
+            queryset = queryset.defer('keyframes_json')
+        return queryset
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
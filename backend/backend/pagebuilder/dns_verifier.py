@@ -3,12 +3,31 @@ DNS Verification Service
 Verifies domain A-records point to the correct server IP before deployment.
 """
 
+import asyncio
+import dns.asyncresolver
+import dns.rdatatype
 import dns.resolver
 import dns.exception
 import socket
+import ssl
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
+
+# Record types reported by get_all_dns_records, parsed once
+RECORD_TYPES = ('A', 'AAAA', 'CNAME', 'MX', 'TXT', 'NS')
+_RDTYPES = {record_type: dns.rdatatype.from_text(record_type) for record_type in RECORD_TYPES}
+
+# Shared HTTP session so the public IP services reuse kept-alive connections
+_session = requests.Session()
+_session.headers['User-Agent'] = 'alterion-dns/1.0'
+
+# Loading the default CA bundle is comparatively slow, so every SSL check
+# shares one client context
+_ssl_context = ssl.create_default_context()
 
 
 class DNSVerifier:
@@ -16,10 +35,20 @@ class DNSVerifier:
     Handles DNS verification and domain validation for deployments.
     """
     
+    # The server's public IP rarely changes, so a successful lookup is
+    # shared by every verifier in the process for a while
+    PUBLIC_IP_CACHE_TTL = 900
+    _public_ip_cache = (None, 0.0)
+    _public_ip_lock = threading.Lock()
+    
     def __init__(self):
         self.resolver = dns.resolver.Resolver()
         self.resolver.timeout = 5
         self.resolver.lifetime = 5
+        self.async_resolver = dns.asyncresolver.Resolver()
+        self.async_resolver.timeout = 5
+        self.async_resolver.lifetime = 5
+        self.session = _session
     
     def verify_domain(self, domain: str, expected_ip: str) -> Dict:
         """
@@ -32,7 +61,42 @@ class DNSVerifier:
         Returns:
             Dict with verification results
         """
-        result = {
+        result = self._new_verification(domain, expected_ip)
+        
+        try:
+            # Query A records
+            answers = self.resolver.resolve(domain, _RDTYPES['A'])
+            self._check_answers(result, answers)
+        except Exception as e:
+            self._record_error(result, e)
+        
+        return result
+    
+    async def averify_domain(self, domain: str, expected_ip: str) -> Dict:
+        """
+        Non-blocking verify_domain, so many domains can be checked concurrently.
+        
+        Args:
+            domain: Domain name to verify (e.g., example.com)
+            expected_ip: Expected IP address
+            
+        Returns:
+            Dict with verification results
+        """
+        result = self._new_verification(domain, expected_ip)
+        
+        try:
+            answers = await self.async_resolver.resolve(domain, _RDTYPES['A'])
+            self._check_answers(result, answers)
+        except Exception as e:
+            self._record_error(result, e)
+        
+        return result
+    
+    @staticmethod
+    def _new_verification(domain: str, expected_ip: str) -> Dict:
+        """Empty verification result for a domain"""
+        return {
             'domain': domain,
             'expected_ip': expected_ip,
             'actual_ip': None,
@@ -41,38 +105,40 @@ class DNSVerifier:
             'timestamp': datetime.utcnow().isoformat(),
             'additional_records': []
         }
+    
+    @staticmethod
+    def _check_answers(result: Dict, answers) -> None:
+        """Fill a verification result from the A-record answers"""
+        domain = result['domain']
+        expected_ip = result['expected_ip']
+        ips = [str(rdata) for rdata in answers]
+        
+        result['actual_ip'] = ips[0] if ips else None
+        result['additional_records'] = ips[1:] if len(ips) > 1 else []
+        
+        # Check if expected IP is in the list
+        if expected_ip in ips:
+            result['verified'] = True
+            result['message'] = f"Domain {domain} correctly points to {expected_ip}"
+        else:
+            result['message'] = (
+                f"Domain {domain} points to {result['actual_ip']}, "
+                f"but expected {expected_ip}"
+            )
+    
+    @staticmethod
+    def _record_error(result: Dict, error: Exception) -> None:
+        """Describe a failed A-record lookup in a verification result"""
+        domain = result['domain']
         
-        try:
-            # Query A records
-            answers = self.resolver.resolve(domain, 'A')
-            ips = [str(rdata) for rdata in answers]
-            
-            result['actual_ip'] = ips[0] if ips else None
-            result['additional_records'] = ips[1:] if len(ips) > 1 else []
-            
-            # Check if expected IP is in the list
-            if expected_ip in ips:
-                result['verified'] = True
-                result['message'] = f"Domain {domain} correctly points to {expected_ip}"
-            else:
-                result['message'] = (
-                    f"Domain {domain} points to {result['actual_ip']}, "
-                    f"but expected {expected_ip}"
-                )
-        
-        except dns.resolver.NXDOMAIN:
+        if isinstance(error, dns.resolver.NXDOMAIN):
             result['message'] = f"Domain {domain} does not exist"
-        
-        except dns.resolver.NoAnswer:
+        elif isinstance(error, dns.resolver.NoAnswer):
             result['message'] = f"No A record found for {domain}"
-        
-        except dns.resolver.Timeout:
+        elif isinstance(error, dns.resolver.Timeout):
             result['message'] = f"DNS query timeout for {domain}"
-        
-        except Exception as e:
-            result['message'] = f"DNS verification error: {str(e)}"
-        
-        return result
+        else:
+            result['message'] = f"DNS verification error: {str(error)}"
     
     def get_server_public_ip(self) -> Optional[str]:
         """
@@ -81,6 +147,19 @@ class DNSVerifier:
         Returns:
             Public IP address or None if unable to determine
         """
+        with self._public_ip_lock:
+            ip, fetched_at = DNSVerifier._public_ip_cache
+        if ip and time.monotonic() - fetched_at < self.PUBLIC_IP_CACHE_TTL:
+            return ip
+        
+        ip = self._fetch_public_ip()
+        if ip:
+            with self._public_ip_lock:
+                DNSVerifier._public_ip_cache = (ip, time.monotonic())
+        return ip
+    
+    def _fetch_public_ip(self) -> Optional[str]:
+        """Ask the public IP echo services, first valid answer wins"""
         try:
             # Try multiple services for reliability
             services = [
@@ -91,7 +170,7 @@ class DNSVerifier:
             
             for service in services:
                 try:
-                    response = requests.get(service, timeout=5)
+                    response = self.session.get(service, timeout=5)
                     if response.status_code == 200:
                         ip = response.text.strip()
                         # Validate it's a valid IP
@@ -157,22 +236,20 @@ class DNSVerifier:
         Returns:
             Dict with all DNS records
         """
-        records = {
-            'domain': domain,
-            'A': [],
-            'AAAA': [],
-            'CNAME': [],
-            'MX': [],
-            'TXT': [],
-            'NS': []
-        }
-        
-        record_types = ['A', 'AAAA', 'CNAME', 'MX', 'TXT', 'NS']
-        
-        for record_type in record_types:
+        records = {'domain': domain}
+        records.update((record_type, []) for record_type in RECORD_TYPES)
+        
+        # The lookups are independent, so query every type at once instead
+        # of paying up to one timeout per missing record type
+        with ThreadPoolExecutor(max_workers=len(RECORD_TYPES)) as executor:
+            futures = {
+                record_type: executor.submit(self.resolver.resolve, domain, _RDTYPES[record_type])
+                for record_type in RECORD_TYPES
+            }
+        
+        for record_type, future in futures.items():
             try:
-                answers = self.resolver.resolve(domain, record_type)
-                records[record_type] = [str(rdata) for rdata in answers]
+                records[record_type] = [str(rdata) for rdata in future.result()]
             except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.Timeout):
                 pass
             except Exception:
@@ -252,21 +329,44 @@ class DNSVerifier:
         Returns:
             List of verification results
         """
-        results = []
+        pairs = [
+            (domain_config.get('domain'), domain_config.get('expected_ip'))
+            for domain_config in domains
+        ]
+        pairs = [(domain, expected_ip) for domain, expected_ip in pairs if domain and expected_ip]
+        if not pairs:
+            return []
+        
+        # Each lookup mostly waits on the network; map() keeps input order
+        with ThreadPoolExecutor(max_workers=min(32, len(pairs))) as executor:
+            return list(executor.map(lambda pair: self.verify_domain(*pair), pairs))
+    
+    def check_ssl_certificate(self, domain: str, port: int = 443) -> Dict:
+        """
+        Check SSL certificate status for a domain.
         
-        for domain_config in domains:
-            domain = domain_config.get('domain')
-            expected_ip = domain_config.get('expected_ip')
+        Args:
+            domain: Domain name
+            port: SSL port (default 443)
             
-            if domain and expected_ip:
-                result = self.verify_domain(domain, expected_ip)
-                results.append(result)
+        Returns:
+            Dict with SSL certificate information
+        """
+        result = self._new_ssl_check(domain, port)
         
-        return results
+        try:
+            with socket.create_connection((domain, port), timeout=5) as sock:
+                with _ssl_context.wrap_socket(sock, server_hostname=domain) as ssock:
+                    self._check_certificate(result, ssock.getpeercert())
+        except Exception as e:
+            self._record_ssl_error(result, e)
+        
+        return result
     
-    def check_ssl_certificate(self, domain: str, port: int = 443) -> Dict:
+    async def acheck_ssl_certificate(self, domain: str, port: int = 443) -> Dict:
         """
-        Check SSL certificate status for a domain.
+        Non-blocking check_ssl_certificate, so many domains can be checked
+        concurrently.
         
         Args:
             domain: Domain name
@@ -275,10 +375,44 @@ class DNSVerifier:
         Returns:
             Dict with SSL certificate information
         """
-        import ssl
-        import datetime
+        result = self._new_ssl_check(domain, port)
         
-        result = {
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(domain, port, ssl=_ssl_context, server_hostname=domain),
+                timeout=5
+            )
+            try:
+                self._check_certificate(result, writer.get_extra_info('peercert'))
+            finally:
+                writer.close()
+        except Exception as e:
+            self._record_ssl_error(result, e)
+        
+        return result
+    
+    def bulk_check_ssl(self, domains: List[str], port: int = 443) -> List[Dict]:
+        """
+        Check SSL certificates for several domains at once.
+        
+        Args:
+            domains: Domain names
+            port: SSL port (default 443)
+            
+        Returns:
+            List of SSL certificate results, in the order given
+        """
+        async def check_all():
+            return await asyncio.gather(*(
+                self.acheck_ssl_certificate(domain, port) for domain in domains
+            ))
+        
+        return asyncio.run(check_all()) if domains else []
+    
+    @staticmethod
+    def _new_ssl_check(domain: str, port: int) -> Dict:
+        """Empty SSL check result for a domain"""
+        return {
             'domain': domain,
             'port': port,
             'has_ssl': False,
@@ -287,35 +421,30 @@ class DNSVerifier:
             'expires': None,
             'message': ''
         }
-        
-        try:
-            context = ssl.create_default_context()
-            with socket.create_connection((domain, port), timeout=5) as sock:
-                with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                    cert = ssock.getpeercert()
-                    
-                    result['has_ssl'] = True
-                    result['issuer'] = dict(x[0] for x in cert['issuer'])
-                    
-                    # Parse expiration date
-                    not_after = cert['notAfter']
-                    expire_date = datetime.datetime.strptime(not_after, '%b %d %H:%M:%S %Y %Z')
-                    result['expires'] = expire_date.isoformat()
-                    
-                    # Check if certificate is still valid
-                    if expire_date > datetime.datetime.now():
-                        result['valid'] = True
-                        result['message'] = f"Valid SSL certificate (expires {expire_date.date()})"
-                    else:
-                        result['message'] = f"SSL certificate expired on {expire_date.date()}"
-        
-        except ssl.SSLError as e:
-            result['message'] = f"SSL error: {str(e)}"
-        
-        except socket.timeout:
-            result['message'] = f"Connection to {domain}:{port} timed out"
-        
-        except Exception as e:
-            result['message'] = f"SSL check error: {str(e)}"
-        
-        return result
+    
+    @staticmethod
+    def _check_certificate(result: Dict, cert: Dict) -> None:
+        """Fill an SSL check result from the peer certificate"""
+        result['has_ssl'] = True
+        result['issuer'] = dict(x[0] for x in cert['issuer'])
+        
+        # Parse expiration date (notAfter is in UTC)
+        expire_date = datetime.fromtimestamp(ssl.cert_time_to_seconds(cert['notAfter']), tz=timezone.utc)
+        result['expires'] = expire_date.isoformat()
+        
+        # Check if certificate is still valid
+        if expire_date > datetime.now(timezone.utc):
+            result['valid'] = True
+            result['message'] = f"Valid SSL certificate (expires {expire_date.date()})"
+        else:
+            result['message'] = f"SSL certificate expired on {expire_date.date()}"
+    
+    @staticmethod
+    def _record_ssl_error(result: Dict, error: Exception) -> None:
+        """Describe a failed SSL check in its result"""
+        if isinstance(error, ssl.SSLError):
+            result['message'] = f"SSL error: {str(error)}"
+        elif isinstance(error, (socket.timeout, asyncio.TimeoutError)):
+            result['message'] = f"Connection to {result['domain']}:{result['port']} timed out"
+        else:
+            result['message'] = f"SSL check error: {str(error)}"
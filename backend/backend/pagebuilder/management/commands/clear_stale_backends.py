@@ -0,0 +1,14 @@
+"""
+Management command to unregister backends that no longer run
+"""
+from django.core.management.base import BaseCommand
+
+from pagebuilder.process_manager import ProcessRegistry
+
+
+class Command(BaseCommand):
+    help = 'Clear running-backend records whose process is gone or whose PID was reused (run at startup)'
+
+    def handle(self, *args, **options):
+        count = ProcessRegistry().prune()
+        self.stdout.write(self.style.SUCCESS(f'✓ Cleared {count} stale backend record(s)'))
@@ -0,0 +1,30 @@
+"""
+Management command to fail deployments left unfinished by a restart
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from pagebuilder.deployment_models import Deployment
+
+
+class Command(BaseCommand):
+    help = 'Mark pending/validating deployments as failed (run before the API workers start)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=None,
+            metavar='MINUTES',
+            help='Only fail deployments started more than MINUTES ago',
+        )
+
+    def handle(self, *args, **options):
+        started_before = None
+        if options['older_than'] is not None:
+            started_before = timezone.now() - timedelta(minutes=options['older_than'])
+
+        count = Deployment.fail_abandoned(started_before)
+        self.stdout.write(self.style.SUCCESS(f'✓ Marked {count} abandoned deployment(s) as failed'))
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagebuilder', '0002_project_domainconfig_deployment_componentlibrary_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='backendconfig',
+            name='is_running',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name='componentlibrary',
+            name='is_public',
+            field=models.BooleanField(db_index=True, default=False, help_text='Share with other users'),
+        ),
+        migrations.AlterField(
+            model_name='deployment',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('validating', 'Validating Files'), ('configuring', 'Configuring Services'), ('starting_backend', 'Starting Backend'), ('deploying_frontend', 'Deploying Frontend'), ('applying_nginx', 'Applying NGINX Config'), ('success', 'Success'), ('failed', 'Failed'), ('rollback', 'Rolled Back')], db_index=True, default='pending', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='domainconfig',
+            name='dns_verified',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AddIndex(
+            model_name='deployment',
+            index=models.Index(fields=['project', '-started_at'], name='pagebuilder_project_9405dd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['user', '-updated_at'], name='pagebuilder_user_id_225dc7_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagebuilder', '0003_deployment_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='deployment',
+            index=models.Index(fields=['user', '-started_at'], name='pagebuilder_user_id_f43053_idx'),
+        ),
+    ]
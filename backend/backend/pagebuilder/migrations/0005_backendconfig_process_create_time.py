@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagebuilder', '0004_deployment_user_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backendconfig',
+            name='process_create_time',
+            field=models.FloatField(blank=True, help_text='Start time of that process, to detect PID reuse', null=True),
+        ),
+    ]
@@ -3,23 +3,283 @@ Backend Process Manager
 Manages starting, stopping, and monitoring backend processes (Django, FastAPI, Node.js).
 """
 
+import compileall
+import functools
 import os
+import re
+import selectors
+import shlex
+import shutil
 import signal
+import socket
 import subprocess
 import psutil
+import requests
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Q
+from django.utils import timezone
+
+from .deployment_models import BackendConfig
+
+
+# Frameworks whose backends are byte-compiled before starting (see prewarm_backend)
+PREWARM_FRAMEWORKS = ('django', 'fastapi')
+
+# Dependency and VCS directories skipped when pre-compiling a backend
+PREWARM_SKIP_RE = re.compile(r'[\\/](node_modules|\.git|\.venv|venv|site-packages)([\\/]|$)')
+
+# Health checks reuse kept-alive connections to the local backends; the
+# pools are shared by health_check_all's threads, and transient connection
+# errors are retried briefly
+_health_session = requests.Session()
+_health_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.1))
+_health_session.mount('http://', _health_adapter)
+_health_session.mount('https://', _health_adapter)
+
+# A registered backend is only adopted if its PID's process started within
+# this many seconds of the recorded start time; otherwise the PID was reused
+PROCESS_CREATE_TIME_TOLERANCE = 1.0
+
+# Kernel socket tables listing local TCP sockets (Linux)
+PROC_NET_TCP_TABLES = ('/proc/net/tcp', '/proc/net/tcp6')
+TCP_LISTEN_STATE = '0A'
+
+
+@functools.lru_cache(maxsize=256)
+def _split_command(command: str) -> tuple:
+    """Split a start command shell-style, so quoted arguments stay whole"""
+    return tuple(shlex.split(command))
+
+
+def _registered_process(pid: Optional[int], create_time: Optional[float]) -> Optional[psutil.Process]:
+    """
+    Return a handle to a registered backend process if it is still the same one.
+    
+    Returns:
+        The psutil handle, or None if the PID is gone or now belongs to
+        another process (or the row predates create time tracking)
+    """
+    if pid is None or create_time is None:
+        return None
+    try:
+        proc = psutil.Process(pid)
+        if abs(proc.create_time() - create_time) > PROCESS_CREATE_TIME_TOLERANCE:
+            return None
+    except psutil.Error:
+        return None
+    return proc
+
+
+def _listening_ports() -> Optional[set]:
+    """
+    Return the local TCP ports in LISTEN state, read from /proc/net.
+    
+    Returns:
+        Set of port numbers, or None if the tables can't be read
+    """
+    ports = set()
+    found_table = False
+    
+    for table in PROC_NET_TCP_TABLES:
+        try:
+            with open(table) as f:
+                next(f, None)  # header
+                for line in f:
+                    fields = line.split()
+                    if len(fields) > 3 and fields[3] == TCP_LISTEN_STATE:
+                        ports.add(int(fields[1].rsplit(':', 1)[1], 16))
+            found_table = True
+        except OSError:
+            continue
+    
+    return ports if found_table else None
+
+
+class ProcessRegistry:
+    """
+    Shared record of running backends, kept on each project's BackendConfig.
+    
+    Every worker of the API sees the same rows, so a backend started by one
+    worker can be found, monitored and stopped from another, and is not lost
+    when the worker that spawned it restarts.
+    """
+    
+    # A start claimed by a worker that died before finishing it expires
+    # after this long
+    CLAIM_TIMEOUT = timedelta(seconds=60)
+    
+    def get(self, project_id: str) -> Optional[Dict]:
+        """
+        Look up the registered backend of a project.
+        
+        Returns:
+            Process info without a Popen handle, or None if none is registered
+        """
+        try:
+            config = (
+                BackendConfig.objects
+                .select_related('project')
+                .only('framework', 'port', 'start_command', 'process_id', 'process_create_time',
+                      'last_started', 'project__backend_path')
+                .get(project_id=project_id, is_running=True, process_id__isnull=False)
+            )
+        except (BackendConfig.DoesNotExist, ValueError, DatabaseError):
+            return None
+        
+        started_at = config.last_started
+        return {
+            'pid': config.process_id,
+            'create_time': config.process_create_time,
+            'framework': config.framework,
+            'port': config.port,
+            'command': config.start_command,
+            # Local naive time, like the entries created by start_backend
+            'started_at': datetime.fromtimestamp(started_at.timestamp()) if started_at else datetime.now(),
+            'process': None,
+            'backend_path': config.project.backend_path
+        }
+    
+    def project_ids(self) -> List[str]:
+        """IDs of the projects with a registered backend"""
+        try:
+            return [
+                str(project_id) for project_id in
+                BackendConfig.objects.filter(is_running=True, process_id__isnull=False)
+                .values_list('project_id', flat=True)
+            ]
+        except DatabaseError:
+            return []
+    
+    def claim(self, project_id: str) -> bool:
+        """
+        Mark a project's backend as starting, unless it already is (or runs).
+        
+        The conditional UPDATE is atomic, so when several workers start the
+        same backend at once only one of them gets True. Projects without a
+        BackendConfig can't be coordinated and are always claimable.
+        """
+        now = timezone.now()
+        try:
+            configs = BackendConfig.objects.filter(project_id=project_id)
+            claimed = configs.filter(
+                Q(is_running=False) | Q(process_id__isnull=True, last_started__lt=now - self.CLAIM_TIMEOUT)
+            ).update(is_running=True, process_id=None, process_create_time=None, last_started=now)
+            return bool(claimed) or not configs.exists()
+        except (ValueError, DatabaseError):
+            return True
+    
+    def add(self, project_id: str, pid: int, port: int, create_time: Optional[float] = None) -> None:
+        """Register a started backend, with its process's create_time()"""
+        try:
+            BackendConfig.objects.filter(project_id=project_id).update(
+                process_id=pid,
+                process_create_time=create_time,
+                port=port,
+                is_running=True,
+                last_started=timezone.now()
+            )
+        except (ValueError, DatabaseError):
+            pass
+    
+    def remove(self, project_id: str) -> None:
+        """Unregister a stopped (or vanished) backend"""
+        try:
+            BackendConfig.objects.filter(project_id=project_id, is_running=True).update(
+                process_id=None,
+                process_create_time=None,
+                is_running=False,
+                last_stopped=timezone.now()
+            )
+        except (ValueError, DatabaseError):
+            pass
+    
+    def prune(self) -> int:
+        """
+        Unregister backends whose process is gone or whose PID was reused.
+        
+        Run at startup: after a host or container restart the recorded PIDs
+        may belong to unrelated processes, which must never be adopted.
+        
+        Returns:
+            Number of backends unregistered
+        """
+        stale = [
+            project_id for project_id, pid, create_time in
+            BackendConfig.objects.filter(is_running=True, process_id__isnull=False)
+            .values_list('project_id', 'process_id', 'process_create_time')
+            if _registered_process(pid, create_time) is None
+        ]
+        for project_id in stale:
+            self.remove(project_id)
+        return len(stale)
 
 
 class ProcessManager:
     """
     Manages backend server processes with health checking and automatic restart.
+    
+    Running backends are registered in the database; self.processes only
+    caches this worker's handles to them.
     """
     
-    def __init__(self):
+    # A new backend counts as started once it listens on its port; one that
+    # is still alive but not listening after this long counts as started too
+    STARTUP_GRACE_PERIOD = 5.0
+    STARTUP_POLL_INTERVAL = 0.025
+    
+    # Backend logs are rotated past LOG_MAX_SIZE; reads return at most the
+    # last LOG_TAIL_SIZE bytes
+    LOG_MAX_SIZE = 10 * 1024 * 1024
+    LOG_TAIL_SIZE = 64 * 1024
+    
+    # How long stop_backend waits for a SIGKILLed backend to go away
+    KILL_TIMEOUT = 2.0
+    
+    def __init__(self, log_dir: Optional[str] = None):
         self.processes: Dict[str, Dict] = {}  # project_id -> process info
+        self.log_dir = Path(log_dir) if log_dir else Path(settings.LOG_DIR) / 'backends'
+        self.registry = ProcessRegistry()
+    
+    def _lookup(self, project_id: str) -> Optional[Dict]:
+        """
+        Find the process info of a project's backend.
+        
+        Backends started by another worker (or before a restart) are adopted
+        from the registry if their PID still belongs to the process that was
+        started; rows whose process is gone or whose PID was reused are cleared.
+        """
+        process_info = self.processes.get(project_id)
+        if process_info is not None:
+            return process_info
+        
+        process_info = self.registry.get(project_id)
+        if process_info is None:
+            return None
+        
+        proc = _registered_process(process_info['pid'], process_info['create_time'])
+        if proc is None:
+            self.registry.remove(project_id)
+            return None
+        
+        # Keep the verified handle, so is_running() keeps checking for reuse
+        process_info['psutil'] = proc
+        proc.cpu_percent(interval=None)
+        self.processes[project_id] = process_info
+        return process_info
+    
+    def _forget(self, project_id: str) -> None:
+        """Drop a backend from the cache and the registry"""
+        self.processes.pop(project_id, None)
+        self.registry.remove(project_id)
     
     def start_backend(self, 
                      project_id: str,
@@ -50,15 +310,20 @@ class ProcessManager:
         }
         
         # Check if process already running
-        if project_id in self.processes:
-            existing = self.processes[project_id]
-            if self.is_process_running(existing['pid']):
+        existing = self._lookup(project_id)
+        if existing is not None:
+            if self._is_alive(existing):
                 result['message'] = f"Backend already running with PID {existing['pid']}"
                 result['pid'] = existing['pid']
                 return result
             else:
                 # Clean up dead process
-                del self.processes[project_id]
+                self._forget(project_id)
+        
+        # Another worker may be starting the same backend right now
+        if not self.registry.claim(project_id):
+            result['message'] = "Backend is already being started"
+            return result
         
         try:
             # Prepare environment
@@ -70,7 +335,7 @@ class ProcessManager:
             env['PORT'] = str(port)
             
             # Parse start command
-            cmd_parts = start_command.split()
+            cmd_parts = list(_split_command(start_command))
             
             # Special handling for different frameworks
             if framework == 'django':
@@ -96,21 +361,31 @@ class ProcessManager:
                 elif 'node' in start_command:
                     pass  # Use as is
             
-            # Start process
-            process = subprocess.Popen(
-                cmd_parts,
-                cwd=backend_path,
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                stdin=subprocess.PIPE,
-                start_new_session=True  # Detach from parent
-            )
+            # Something else already listening on the port would make the
+            # new process look ready, so only watch a free port
+            watch_port = None if self._port_accepting(port) else port
+            
+            # Output goes to a per-project log file rather than pipes nobody
+            # reads, so a chatty backend can't block on a full pipe
+            log_path = self._log_path(project_id)
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._cap_log(log_path)
             
-            # Wait a moment to check if process started successfully
-            time.sleep(2)
+            # Start process
+            with open(log_path, 'ab') as log_file:
+                log_start = log_file.tell()
+                process = subprocess.Popen(
+                    cmd_parts,
+                    cwd=backend_path,
+                    env=env,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    stdin=subprocess.PIPE,
+                    start_new_session=True  # Detach from parent
+                )
             
-            if process.poll() is None:
+            # Wait until it listens, exits, or survives the grace period
+            if self._wait_for_startup(process, watch_port):
                 # Process is running
                 self.processes[project_id] = {
                     'pid': process.pid,
@@ -121,6 +396,13 @@ class ProcessManager:
                     'process': process,
                     'backend_path': backend_path
                 }
+                # Keep one psutil handle (and start its CPU sampling window);
+                # its create time lets other workers tell PID reuse apart
+                try:
+                    create_time = self._psutil_process(self.processes[project_id]).create_time()
+                except psutil.NoSuchProcess:
+                    create_time = None
+                self.registry.add(project_id, process.pid, port, create_time)
                 
                 result['success'] = True
                 result['pid'] = process.pid
@@ -128,8 +410,8 @@ class ProcessManager:
                 result['message'] = f"Backend started successfully on port {port}"
             else:
                 # Process died immediately
-                stdout, stderr = process.communicate()
-                result['message'] = f"Backend failed to start: {stderr.decode()}"
+                process.stdin.close()
+                result['message'] = f"Backend failed to start: {self._read_log(log_path, log_start)}"
         
         except FileNotFoundError as e:
             result['message'] = f"Command not found: {str(e)}"
@@ -137,15 +419,133 @@ class ProcessManager:
         except Exception as e:
             result['message'] = f"Failed to start backend: {str(e)}"
         
+        if not result['success']:
+            self.registry.remove(project_id)
+        
         return result
     
-    def stop_backend(self, project_id: str, force: bool = False) -> Dict:
+    def _wait_for_startup(self, process: subprocess.Popen, port: Optional[int]) -> bool:
+        """
+        Wait for a freshly spawned backend to settle.
+        
+        Returns as soon as port (if given) accepts connections instead of
+        always sleeping out the grace period; a process that crashes on
+        startup is noticed (through its pidfd) the moment it exits, and
+        reaped.
+        
+        Returns:
+            False if the process exited, True otherwise
+        """
+        deadline = time.monotonic() + self.STARTUP_GRACE_PERIOD
+        
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except (AttributeError, OSError):
+            pidfd = None
+        
+        try:
+            with selectors.DefaultSelector() as selector:
+                if pidfd is not None:
+                    selector.register(pidfd, selectors.EVENT_READ)
+                
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return True
+                    
+                    if pidfd is not None:
+                        selector.select(min(self.STARTUP_POLL_INTERVAL, remaining))
+                    else:
+                        time.sleep(min(self.STARTUP_POLL_INTERVAL, remaining))
+                    
+                    if self._has_exited(process, pidfd):
+                        process.wait()
+                        return False
+                    
+                    if port is not None and self._port_accepting(port):
+                        return True
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+    
+    def _has_exited(self, process: subprocess.Popen, pidfd: Optional[int]) -> bool:
+        """
+        Check if a child has exited without reaping it.
+        
+        WNOWAIT leaves the zombie for Popen to reap, so its returncode stays
+        correct.
+        """
+        if pidfd is None:
+            return process.poll() is not None
+        return os.waitid(os.P_PIDFD, pidfd, os.WEXITED | os.WNOHANG | os.WNOWAIT) is not None
+    
+    def _log_path(self, project_id: str) -> Path:
+        """Path of the file a project's backend logs to"""
+        return self.log_dir / f'{project_id}.log'
+    
+    def _cap_log(self, log_path: Path) -> None:
+        """
+        Rotate a backend log that has outgrown LOG_MAX_SIZE.
+        
+        The content is copied to <name>.1 and the file truncated in place
+        (logrotate's copytruncate), since a running backend keeps writing
+        to it in append mode.
+        """
+        try:
+            if log_path.stat().st_size > self.LOG_MAX_SIZE:
+                shutil.copyfile(log_path, log_path.with_name(log_path.name + '.1'))
+                os.truncate(log_path, 0)
+        except FileNotFoundError:
+            pass
+    
+    def _read_log(self, log_path: Path, start: int = 0) -> str:
+        """Read a backend log from start, at most its last LOG_TAIL_SIZE bytes"""
+        with open(log_path, 'rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            f.seek(max(start, end - self.LOG_TAIL_SIZE))
+            return f.read().decode('utf-8', errors='replace')
+    
+    def _port_accepting(self, port: int) -> bool:
+        """Check if something accepts TCP connections on a local port"""
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=self.STARTUP_POLL_INTERVAL):
+                return True
+        except OSError:
+            return False
+    
+    def prewarm_backend(self, framework: str, backend_path: str) -> bool:
+        """
+        Byte-compile a Python backend ahead of start_backend.
+        
+        The first start of a fresh checkout otherwise compiles every module
+        it imports before it can serve; doing that while the rest of the
+        deployment runs takes it off the startup path.
+        
+        Args:
+            framework: Backend framework (only django and fastapi are compiled)
+            backend_path: Path to backend directory
+            
+        Returns:
+            True if every source compiled
+        """
+        if framework not in PREWARM_FRAMEWORKS:
+            return False
+        
+        try:
+            return bool(compileall.compile_dir(backend_path, rx=PREWARM_SKIP_RE, quiet=2))
+        except Exception:
+            return False
+    
+    def stop_backend(self, project_id: str, grace: float = 3.0) -> Dict:
         """
         Stop a backend server process.
         
+        The backend's process group gets SIGTERM, and SIGKILL if it is still
+        running after the grace period, so nothing is left holding the port.
+        
         Args:
             project_id: Project identifier
-            force: Force kill if graceful shutdown fails
+            grace: Seconds to wait for a graceful shutdown before killing
             
         Returns:
             Dict with stop result
@@ -155,37 +555,34 @@ class ProcessManager:
             'message': ''
         }
         
-        if project_id not in self.processes:
+        process_info = self._lookup(project_id)
+        if process_info is None:
             result['message'] = f"No backend process found for project {project_id}"
             return result
         
-        process_info = self.processes[project_id]
         pid = process_info['pid']
         
         try:
-            if not self.is_process_running(pid):
+            if not self._is_alive(process_info):
                 result['message'] = f"Process {pid} is not running"
-                del self.processes[project_id]
+                self._forget(project_id)
                 result['success'] = True
                 return result
             
             # Try graceful shutdown first
             try:
-                proc = psutil.Process(pid)
-                proc.terminate()
+                proc = self._psutil_process(process_info)
+                popen = process_info.get('process')
+                self._signal_group(proc, signal.SIGTERM)
                 
-                # Wait up to 10 seconds for graceful shutdown
                 try:
-                    proc.wait(timeout=10)
-                    result['success'] = True
+                    self._wait_for_exit(proc, popen, timeout=grace)
                     result['message'] = f"Backend stopped gracefully (PID {pid})"
                 except psutil.TimeoutExpired:
-                    if force:
-                        proc.kill()
-                        result['success'] = True
-                        result['message'] = f"Backend force killed (PID {pid})"
-                    else:
-                        result['message'] = f"Backend did not stop gracefully (PID {pid})"
+                    self._signal_group(proc, signal.SIGKILL)
+                    self._wait_for_exit(proc, popen, timeout=self.KILL_TIMEOUT)
+                    result['message'] = f"Backend force killed (PID {pid})"
+                result['success'] = True
             
             except psutil.NoSuchProcess:
                 result['success'] = True
@@ -193,13 +590,60 @@ class ProcessManager:
             
             # Clean up
             if result['success']:
-                del self.processes[project_id]
+                self._forget(project_id)
         
         except Exception as e:
             result['message'] = f"Error stopping backend: {str(e)}"
         
         return result
     
+    def _signal_group(self, proc: psutil.Process, sig: int) -> None:
+        """
+        Signal a backend and everything it spawned.
+        
+        Backends lead their own session (start_new_session), so their
+        process group is signalled; otherwise just the process itself.
+        """
+        try:
+            if os.getpgid(proc.pid) == proc.pid:
+                os.killpg(proc.pid, sig)
+                return
+        except (AttributeError, ProcessLookupError, PermissionError):
+            pass
+        proc.send_signal(sig)
+    
+    def _wait_for_exit(self, proc: psutil.Process, popen: Optional[subprocess.Popen], timeout: float) -> None:
+        """
+        Wait for a process to exit.
+        
+        On Linux a pidfd becomes readable when the process exits, so the
+        wait is a single blocking select() instead of psutil's sleep/poll
+        loop. Our own children are then reaped through their Popen handle.
+        
+        Raises:
+            psutil.TimeoutExpired: If the process is still running after timeout
+        """
+        try:
+            pidfd = os.pidfd_open(proc.pid)
+        except ProcessLookupError:
+            pidfd = None
+        except (AttributeError, OSError):
+            # No pidfd support (non-Linux or kernel < 5.3)
+            proc.wait(timeout=timeout)
+            return
+        
+        if pidfd is not None:
+            try:
+                with selectors.DefaultSelector() as selector:
+                    selector.register(pidfd, selectors.EVENT_READ)
+                    if not selector.select(timeout):
+                        raise psutil.TimeoutExpired(timeout, proc.pid)
+            finally:
+                os.close(pidfd)
+        
+        if popen is not None:
+            popen.wait()
+    
     def restart_backend(self, project_id: str) -> Dict:
         """
         Restart a backend server process.
@@ -210,21 +654,21 @@ class ProcessManager:
         Returns:
             Dict with restart result
         """
-        if project_id not in self.processes:
+        # Get process info before stopping
+        process_info = self._lookup(project_id)
+        if process_info is None:
             return {
                 'success': False,
                 'message': f"No backend process found for project {project_id}"
             }
         
-        # Get process info before stopping
-        process_info = self.processes[project_id]
         framework = process_info['framework']
         backend_path = process_info['backend_path']
         command = process_info['command']
         port = process_info['port']
         
         # Stop the process
-        stop_result = self.stop_backend(project_id, force=True)
+        stop_result = self.stop_backend(project_id)
         
         if not stop_result['success']:
             return stop_result
@@ -251,36 +695,42 @@ class ProcessManager:
         Returns:
             Dict with process status
         """
-        if project_id not in self.processes:
+        process_info = self._lookup(project_id)
+        if process_info is None:
             return {
                 'running': False,
                 'message': 'No process found'
             }
         
-        process_info = self.processes[project_id]
         pid = process_info['pid']
         
-        if not self.is_process_running(pid):
+        if not self._is_alive(process_info):
             return {
                 'running': False,
                 'pid': pid,
                 'message': 'Process not running (may have crashed)'
             }
         
+        # Status is polled regularly, so this keeps a running backend's log bounded
+        self._cap_log(self._log_path(project_id))
+        
         try:
-            proc = psutil.Process(pid)
+            proc = self._psutil_process(process_info)
             
-            return {
-                'running': True,
-                'pid': pid,
-                'port': process_info['port'],
-                'framework': process_info['framework'],
-                'started_at': process_info['started_at'].isoformat(),
-                'cpu_percent': proc.cpu_percent(interval=0.1),
-                'memory_mb': proc.memory_info().rss / 1024 / 1024,
-                'status': proc.status(),
-                'uptime_seconds': (datetime.now() - process_info['started_at']).total_seconds()
-            }
+            # The handle was primed at spawn, so cpu_percent() reports usage
+            # since the previous call instead of sampling for 100ms
+            with proc.oneshot():
+                return {
+                    'running': True,
+                    'pid': pid,
+                    'port': process_info['port'],
+                    'framework': process_info['framework'],
+                    'started_at': process_info['started_at'].isoformat(),
+                    'cpu_percent': proc.cpu_percent(interval=None),
+                    'memory_mb': proc.memory_info().rss / 1024 / 1024,
+                    'status': proc.status(),
+                    'uptime_seconds': (datetime.now() - process_info['started_at']).total_seconds()
+                }
         
         except Exception as e:
             return {
@@ -289,6 +739,27 @@ class ProcessManager:
                 'message': f"Error getting status: {str(e)}"
             }
     
+    def _psutil_process(self, process_info: Dict) -> psutil.Process:
+        """Return the psutil handle kept for a managed process"""
+        proc = process_info.get('psutil')
+        if proc is None:
+            proc = process_info['psutil'] = psutil.Process(process_info['pid'])
+            proc.cpu_percent(interval=None)
+        return proc
+    
+    def _is_alive(self, process_info: Dict) -> bool:
+        """
+        Check if a managed process is running.
+        
+        Uses the kept psutil handle, whose is_running() also notices if the
+        PID has been reused by another process.
+        """
+        try:
+            proc = self._psutil_process(process_info)
+            return proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE
+        except psutil.NoSuchProcess:
+            return False
+    
     def is_process_running(self, pid: int) -> bool:
         """Check if a process is running"""
         try:
@@ -299,8 +770,6 @@ class ProcessManager:
     
     def check_port_available(self, port: int) -> bool:
         """Check if a port is available"""
-        import socket
-        
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             try:
                 s.bind(('127.0.0.1', port))
@@ -310,8 +779,12 @@ class ProcessManager:
     
     def find_available_port(self, start_port: int = 8000, end_port: int = 9000) -> Optional[int]:
         """Find an available port in range"""
+        # One read of the kernel's socket tables rules out every listening
+        # port; the bind check then only runs on the first candidate(s)
+        listening = _listening_ports() or set()
+        
         for port in range(start_port, end_port):
-            if self.check_port_available(port):
+            if port not in listening and self.check_port_available(port):
                 return port
         return None
     
@@ -326,8 +799,6 @@ class ProcessManager:
         Returns:
             Dict with health check result
         """
-        import requests
-        
         result = {
             'healthy': False,
             'status_code': None,
@@ -339,7 +810,7 @@ class ProcessManager:
         
         try:
             start_time = time.time()
-            response = requests.get(url, timeout=5)
+            response = _health_session.get(url, timeout=5)
             response_time = time.time() - start_time
             
             result['status_code'] = response.status_code
@@ -362,11 +833,35 @@ class ProcessManager:
         
         return result
     
+    def health_check_all(self, ports: List[int], endpoint: str = '/') -> List[Dict]:
+        """
+        Health check several backends at once.
+        
+        Checks run concurrently, so one slow backend no longer delays the
+        rest; the whole batch takes about as long as the slowest check.
+        
+        Args:
+            ports: Server ports
+            endpoint: Health check endpoint
+            
+        Returns:
+            Health check results in the order given
+        """
+        if not ports:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(32, len(ports))) as executor:
+            return list(executor.map(lambda port: self.health_check(port, endpoint), ports))
+    
+    def _project_ids(self) -> List[str]:
+        """IDs of the backends managed by this worker or any other"""
+        return list(dict.fromkeys([*self.processes, *self.registry.project_ids()]))
+    
     def get_all_processes(self) -> List[Dict]:
         """Get status of all managed processes"""
         statuses = []
         
-        for project_id in list(self.processes.keys()):
+        for project_id in self._project_ids():
             status = self.get_process_status(project_id)
             status['project_id'] = project_id
             statuses.append(status)
@@ -380,8 +875,8 @@ class ProcessManager:
             'failed': []
         }
         
-        for project_id in list(self.processes.keys()):
-            result = self.stop_backend(project_id, force=True)
+        for project_id in self._project_ids():
+            result = self.stop_backend(project_id)
             if result['success']:
                 results['stopped'].append(project_id)
             else:
@@ -403,39 +898,25 @@ class ProcessManager:
         Returns:
             Dict with logs
         """
-        if project_id not in self.processes:
-            return {
-                'success': False,
-                'message': 'Process not found'
-            }
-        
-        process_info = self.processes[project_id]
-        process = process_info.get('process')
-        
-        if not process:
-            return {
-                'success': False,
-                'message': 'Process handle not available'
-            }
+        log_path = self._log_path(project_id)
         
         try:
-            # Read from stdout and stderr (non-blocking)
-            import select
-            
-            stdout_lines = []
-            stderr_lines = []
-            
-            # This is a simplified version - in production you'd want to
-            # continuously log output to a file and read from there
-            
+            self._cap_log(log_path)
+            output = self._read_log(log_path)
+        except FileNotFoundError:
             return {
-                'success': True,
-                'stdout': ''.join(stdout_lines[-lines:]),
-                'stderr': ''.join(stderr_lines[-lines:])
+                'success': False,
+                'message': 'No logs found'
             }
-        
-        except Exception as e:
+        except OSError as e:
             return {
                 'success': False,
                 'message': f"Error reading logs: {str(e)}"
             }
+        
+        return {
+            'success': True,
+            # stderr is logged together with stdout
+            'stdout': ''.join(output.splitlines(keepends=True)[-lines:]),
+            'stderr': ''
+        }
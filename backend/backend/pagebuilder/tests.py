@@ -1,3 +1,885 @@
-from django.test import TestCase
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import psutil
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import Http404
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from . import backend_detector, deployment_views, process_manager
+from .backend_detector import BackendDetector
+from .deployment_models import BackendConfig, ComponentLibrary, Deployment, DomainConfig, Project
+from .deployment_orchestrator import DeploymentOrchestrator
+from .deployment_serializers import ProjectSerializer
+from .deployment_views import ComponentLibraryViewSet, DeploymentViewSet, ProjectViewSet, _extract_upload
+from .dns_verifier import DNSVerifier
+from .models import Page
+from .process_manager import ProcessManager
+from .views import PageViewSet
+
+User = get_user_model()
+
+
+class PageJSXExportTests(SimpleTestCase):
+    """Test suite for exporting pages as JSX"""
+
+    def test_blocks_render_with_defaults(self):
+        """Test that each block type renders, falling back to default props"""
+        page = Page(slug='landing-page', blocks_json=[
+            {'type': 'heading', 'props': {'text': 'Welcome', 'level': 'h2'}},
+            {'type': 'button', 'props': {'href': '/signup'}},
+            {'type': 'container'},
+            {'type': 'unknown'},
+        ])
+
+        jsx = PageViewSet().generate_jsx(page)
+
+        self.assertIn('const Landing_Page = () => {', jsx)
+        self.assertIn(
+            "    <div className=\"page-container\">\n"
+            "  <h2 style={ color: '#ffffff' }>Welcome</h2>\n"
+            "  <a href=\"/signup\" style={ background: '#3b82f6', padding: '10px 20px', "
+            "borderRadius: '6px', textDecoration: 'none', color: 'white' }>Button</a>\n"
+            "  <div style={ padding: '20px', background: 'rgba(255,255,255,0.05)' }>\n"
+            "    {/* Add nested content here */}\n"
+            "  </div>\n"
+            "    </div>\n",
+            jsx
+        )
+
+
+    def test_props_are_escaped(self):
+        """Test that user-supplied props can't break out of the generated markup"""
+        page = Page(slug='page', blocks_json=[
+            {'type': 'heading', 'props': {'text': '<b>{x}</b>', 'level': 'script', 'color': "red'}} />"}},
+            {'type': 'image', 'props': {'src': '" onError="alert(1)', 'alt': 'A & B'}},
+        ])
+
+        jsx = PageViewSet().generate_jsx(page)
+
+        self.assertIn("  <h1 style={ color: 'red\\'}} />' }>&lt;b&gt;&#123;x&#125;&lt;/b&gt;</h1>", jsx)
+        self.assertIn('  <img src="&quot; onError=&quot;alert(1)" alt="A &amp; B"', jsx)
+
+
+class BackendDetectorTests(SimpleTestCase):
+    """Test suite for framework detection on small on-disk projects"""
+
+    def setUp(self):
+        """Create a scratch directory for each project fixture"""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name) / 'project'
+        self.root.mkdir()
+
+        # Keep the detector's on-disk result cache inside the scratch directory
+        self.cache_dir = Path(self._tmp.name) / 'cache'
+        patcher = mock.patch.object(backend_detector, 'DETECTOR_CACHE_DIR', self.cache_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, relative_path, content):
+        """Write a fixture file below the scratch directory"""
+        path = self.root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        return path
+
+    def test_detects_django_project(self):
+        """Test that a Django project is detected with its urls, views and models"""
+        self.write('manage.py', "import os\nos.environ.setdefault('DJANGO_SETTINGS_MODULE', 'proj.settings')\n")
+        self.write('proj/wsgi.py', 'from django.core.wsgi import get_wsgi_application\n')
+        self.write('app/urls.py', "urlpatterns = [path('items/', views.ItemList.as_view(), name='item-list')]\n")
+        self.write('app/views.py', (
+            'class ItemList(APIView):\n'
+            '    def get(self, request): pass\n'
+            '    def post(self, request): pass\n'
+        ))
+        self.write('app/models.py', (
+            'from django.db import models\n'
+            'class Item(models.Model):\n'
+            '    name = models.CharField(max_length=10)\n'
+        ))
+
+        result = BackendDetector(str(self.root)).detect_framework()
+
+        self.assertEqual(result['framework'], 'django')
+        self.assertEqual(sorted(result['detected_files']), ['manage.py', 'proj/wsgi.py'])
+        self.assertIn({
+            'path': '/api/items/',
+            'name': 'item-list',
+            'file': 'app/urls.py',
+            'methods': ['GET', 'POST', 'PUT', 'DELETE'],
+        }, result['detected_apis'])
+        self.assertIn({
+            'name': 'ItemList',
+            'file': 'app/views.py',
+            'methods': ['GET', 'POST'],
+            'type': 'APIView',
+        }, result['detected_apis'])
+        self.assertEqual(result['detected_models'], [{
+            'name': 'Item',
+            'file': 'app/models.py',
+            'fields': [{'name': 'name', 'type': 'CharField'}],
+        }])
+
+    def test_django_routes_without_name_and_re_path(self):
+        """Test that re_path/url routes and routes without a name are extracted"""
+        self.write('manage.py', 'import django\n')
+        self.write('app/urls.py', (
+            'urlpatterns = [\n'
+            "    re_path(r'^legacy/$', views.legacy, name='legacy'),\n"
+            "    url(r'^old/$', views.old),\n"
+            "    path('health/', views.Health.as_view()),\n"
+            ']\n'
+        ))
+
+        result = BackendDetector(str(self.root)).detect_framework()
+
+        routes = {(api['path'], api['name']) for api in result['detected_apis']}
+        self.assertEqual(routes, {
+            ('/api/^legacy/$', 'legacy'),
+            ('/api/^old/$', ''),
+            ('/api/health/', ''),
+        })
+
+    def test_detects_fastapi_project(self):
+        """Test that FastAPI routes and Pydantic models are extracted"""
+        self.write('main.py', (
+            'from fastapi import FastAPI\n'
+            'app = FastAPI()\n'
+            'class Item(BaseModel):\n'
+            '    name: str\n'
+            '@app.get("/items")\n'
+            'def list_items(): pass\n'
+        ))
+
+        result = BackendDetector(str(self.root)).detect_framework()
+
+        self.assertEqual(result['framework'], 'fastapi')
+        self.assertEqual(result['detected_apis'], [{'path': '/items', 'method': 'GET', 'file': 'main.py'}])
+        self.assertEqual(result['detected_models'], [{
+            'name': 'Item',
+            'file': 'main.py',
+            'fields': [{'name': 'name', 'type': 'str'}],
+        }])
+
+    def test_detects_nodejs_project(self):
+        """Test that Express routes and Mongoose schemas are extracted"""
+        self.write('package.json', '{"name": "api"}\n')
+        self.write('server.js', (
+            "const express = require('express');\n"
+            'const app = express();\n'
+            "app.get('/health', handler);\n"
+            'app.listen(3000);\n'
+        ))
+        self.write('models/user.js', 'const UserSchema = new mongoose.Schema({ name: String });\n')
+
+        result = BackendDetector(str(self.root)).detect_framework()
+
+        self.assertEqual(result['framework'], 'nodejs')
+        self.assertEqual(result['port'], 3000)
+        self.assertEqual(result['detected_apis'], [{'path': '/health', 'method': 'GET', 'file': 'server.js'}])
+        self.assertEqual(result['detected_models'], [{
+            'name': 'user',
+            'file': 'models/user.js',
+            'fields': [{'name': 'name', 'type': 'String'}],
+        }])
+
+    def test_vendor_directories_are_ignored(self):
+        """Test that routes inside node_modules are not reported as project APIs"""
+        self.write('package.json', '{"name": "api"}\n')
+        self.write('server.js', "const app = express();\napp.get('/health', handler);\n")
+        self.write('node_modules/lib/index.js', "router.get('/vendored', handler);\n")
+
+        result = BackendDetector(str(self.root)).detect_framework()
+
+        self.assertEqual([api['path'] for api in result['detected_apis']], ['/health'])
+
+    def test_results_are_cached_until_fingerprint_changes(self):
+        """Test that repeat detection is served from cache and invalidated by signature file changes"""
+        self.write('manage.py', 'import django\n')
+
+        first = BackendDetector(str(self.root)).detect_framework()
+        self.assertEqual(first['framework'], 'django')
+        self.assertEqual(len(list(self.cache_dir.glob('*.json'))), 1)
+
+        with mock.patch.object(BackendDetector, '_detect_framework_uncached') as scan:
+            cached = BackendDetector(str(self.root)).detect_framework()
+        scan.assert_not_called()
+        self.assertEqual(cached, first)
+
+        self.write('manage.py', 'import django\nimport sys\n')
+        with mock.patch.object(BackendDetector, '_detect_framework_uncached', return_value={}) as scan:
+            BackendDetector(str(self.root)).detect_framework()
+        scan.assert_called_once()
+
+    def test_nested_source_edits_invalidate_cache(self):
+        """Test that editing a file below the top level is picked up on the next detection"""
+        self.write('manage.py', 'import django\n')
+        self.write('app/urls.py', "urlpatterns = [path('a/', view, name='a')]\n")
+
+        first = BackendDetector(str(self.root)).detect_framework()
+        self.assertEqual([api['path'] for api in first['detected_apis']], ['/api/a/'])
+
+        self.write('app/urls.py', (
+            "urlpatterns = [path('a/', view, name='a'), path('b/', view, name='b')]\n"
+        ))
+        second = BackendDetector(str(self.root)).detect_framework()
+
+        self.assertEqual([api['path'] for api in second['detected_apis']], ['/api/a/', '/api/b/'])
+
+    def test_unknown_project(self):
+        """Test that a directory without framework markers is reported as other"""
+        self.write('README.md', 'nothing to see\n')
+
+        result = BackendDetector(str(self.root)).detect_framework()
+
+        self.assertEqual(result['framework'], 'other')
+        self.assertEqual(result['confidence'], 0.0)
+
+    def test_missing_path_raises(self):
+        """Test that a nonexistent backend path is rejected"""
+        with self.assertRaises(ValueError):
+            BackendDetector(str(self.root / 'missing'))
+
+
+class DeploymentOrchestratorTests(SimpleTestCase):
+    """Test suite for frontend deployment without backend or domain"""
+
+    def setUp(self):
+        """Create a dist folder and an orchestrator rooted in a scratch directory"""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        root = Path(self._tmp.name)
+        self.dist = root / 'dist'
+        (self.dist / 'assets').mkdir(parents=True)
+        (self.dist / 'index.html').write_text('<html></html>')
+        (self.dist / 'assets' / 'app.js').write_text('console.log(1)')
+        self.orchestrator = DeploymentOrchestrator(
+            deployment_root=str(root / 'www'),
+            nginx_sites_available=str(root / 'sites-available'),
+            nginx_sites_enabled=str(root / 'sites-enabled'),
+        )
+
+    def deploy(self):
+        """Deploy the scratch dist folder as project 'site'"""
+        return self.orchestrator.deploy_project('1', 'site', str(self.dist))
+
+    def test_unchanged_frontend_is_not_copied_again(self):
+        """Test that a redeploy of an identical dist skips the copy and a changed one is copied"""
+        first = self.deploy()
+        self.assertTrue(first['success'])
+        deployed = Path(first['deployment_path'])
+        self.assertEqual((deployed / 'assets' / 'app.js').read_text(), 'console.log(1)')
+
+        with mock.patch('pagebuilder.deployment_orchestrator._fast_copytree') as copytree:
+            second = self.deploy()
+        copytree.assert_not_called()
+        self.assertTrue(second['success'])
+        self.assertTrue(any('Frontend unchanged' in line for line in second['logs']))
+
+        (self.dist / 'assets' / 'app.js').write_text('console.log(2)')
+        self.deploy()
+        self.assertEqual((deployed / 'assets' / 'app.js').read_text(), 'console.log(2)')
+
+    def test_frontend_failure_does_not_wait_for_prewarm(self):
+        """Test that a failed frontend copy returns without waiting for backend pre-compilation"""
+        backend = Path(self._tmp.name) / 'backend'
+        backend.mkdir()
+        release = threading.Event()
+        self.addCleanup(release.set)
+        detected = {
+            'framework': 'django', 'confidence': 1.0, 'detected_apis': [], 'detected_models': [],
+            'suggested_start_command': 'python manage.py runserver', 'port': 8000,
+        }
+
+        with mock.patch.object(self.orchestrator, 'detect_backend', return_value=detected), \
+                mock.patch.object(self.orchestrator.process_manager, 'prewarm_backend', side_effect=lambda *args: release.wait(10)), \
+                mock.patch('pagebuilder.deployment_orchestrator._fast_copytree', side_effect=OSError('disk full')):
+            started = time.monotonic()
+            result = self.orchestrator.deploy_project('1', 'site', str(self.dist), backend_path=str(backend))
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertFalse(result['success'])
+        self.assertTrue(any('disk full' in error for error in result['errors']))
+
+    def test_detection_memo_follows_nested_edits(self):
+        """Test that detect_backend re-scans after a file below the top level changes"""
+        backend = Path(self._tmp.name) / 'backend'
+        (backend / 'app').mkdir(parents=True)
+        (backend / 'manage.py').write_text('import django\n')
+        urls = backend / 'app' / 'urls.py'
+        urls.write_text("urlpatterns = [path('a/', view, name='a')]\n")
+        self.addCleanup(DeploymentOrchestrator.invalidate_detection, str(backend))
+
+        with mock.patch.object(backend_detector, 'DETECTOR_CACHE_DIR', Path(self._tmp.name) / 'cache'):
+            first = self.orchestrator.detect_backend(str(backend))
+            urls.write_text("urlpatterns = [path('a/', view, name='a'), path('b/', view, name='b')]\n")
+            second = self.orchestrator.detect_backend(str(backend))
+
+        self.assertEqual([api['path'] for api in first['detected_apis']], ['/api/a/'])
+        self.assertEqual([api['path'] for api in second['detected_apis']], ['/api/a/', '/api/b/'])
+
+
+class ProjectListQueryTests(TestCase):
+    """Test suite for the project list queryset's query count"""
+
+    def setUp(self):
+        """Create a user with several projects, each with deployments"""
+        self.user = User.objects.create_user(username='builder', password='testpass123')
+        for index in range(5):
+            project = Project.objects.create(user=self.user, name=f'Site {index}', slug=f'site-{index}')
+            BackendConfig.objects.create(project=project, framework='django')
+            for status_value in ('failed', 'success'):
+                Deployment.objects.create(project=project, user=self.user, status=status_value)
+
+        self.view = ProjectViewSet()
+        self.view.request = mock.Mock(user=self.user)
+
+    def test_serializing_projects_does_not_query_per_project(self):
+        """Test that counts, latest deployments and configs come from the list queries"""
+        with self.assertNumQueries(3):
+            projects = ProjectSerializer(self.view.get_queryset(), many=True).data
+
+        self.assertEqual(len(projects), 5)
+        for project in projects:
+            self.assertEqual(project['deployment_count'], 2)
+            self.assertEqual(project['latest_deployment']['status'], 'success')
+            self.assertEqual(project['backend_config']['framework'], 'django')
+            self.assertIsNone(project['domain_config'])
+
+    def test_deployment_history_is_a_single_query(self):
+        """Test that history rows carry their user and project without extra queries"""
+        project = Project.objects.get(slug='site-0')
+        self.view.get_object = mock.Mock(return_value=project)
+
+        request = Request(APIRequestFactory().get('/history/'))
+
+        with self.assertNumQueries(1):
+            history = self.view.deployment_history(request).data['results']
+
+        self.assertEqual([entry['status'] for entry in history], ['success', 'failed'])
+        self.assertEqual({entry['user_username'] for entry in history}, {'builder'})
+        self.assertEqual({entry['project_name'] for entry in history}, {'Site 0'})
+
+
+class DeploymentRecordTests(TestCase):
+    """Test suite for storing deployment results"""
+
+    def setUp(self):
+        """Create a project with backend and domain configs and a running deployment"""
+        user = User.objects.create_user(username='builder', email='builder@example.com', password='testpass123')
+        self.project = Project.objects.create(user=user, name='Site', slug='site')
+        BackendConfig.objects.create(project=self.project, framework='django')
+        DomainConfig.objects.create(project=self.project, domain_name='example.com', expected_ip='203.0.113.7')
+        self.deployment = Deployment.objects.create(project=self.project, user=user, status='validating')
+
+    def test_successful_result_updates_deployment_and_configs(self):
+        """Test that a successful result marks the backend running and nginx enabled"""
+        DeploymentViewSet._record_result(self.deployment, self.project, {
+            'success': True,
+            'logs': ['one', 'two'],
+            'backend_pid': 4321,
+            'nginx_config': '/etc/nginx/sites-available/site',
+        })
+
+        self.deployment.refresh_from_db()
+        self.assertEqual(self.deployment.status, 'success')
+        self.assertEqual(self.deployment.logs, 'one\ntwo')
+        self.assertIsNotNone(self.deployment.completed_at)
+
+        backend_config = BackendConfig.objects.get(project=self.project)
+        self.assertEqual(backend_config.process_id, 4321)
+        self.assertTrue(backend_config.is_running)
+        self.assertEqual(backend_config.last_started, self.deployment.completed_at)
+
+        domain_config = DomainConfig.objects.get(project=self.project)
+        self.assertEqual(domain_config.nginx_config_path, '/etc/nginx/sites-available/site')
+        self.assertTrue(domain_config.nginx_enabled)
+
+    def test_deploy_arguments_use_the_selected_domain_config(self):
+        """Test that deploy arguments need no queries once the domain config is joined"""
+        data = {'deploy_backend': True, 'apply_nginx': True, 'verify_dns': False, 'restart_backend': False}
+        project = Project.objects.select_related('domain_config').get(pk=self.project.pk)
+
+        with self.assertNumQueries(0):
+            arguments = DeploymentViewSet._deploy_arguments(project, data)
+        self.assertEqual(arguments['domain'], 'example.com')
+        self.assertEqual(arguments['expected_ip'], '203.0.113.7')
+
+        DomainConfig.objects.filter(project=self.project).delete()
+        project = Project.objects.select_related('domain_config').get(pk=self.project.pk)
+        with self.assertNumQueries(0):
+            arguments = DeploymentViewSet._deploy_arguments(project, data)
+        self.assertIsNone(arguments['domain'])
+
+    def test_closed_stream_still_records_result(self):
+        """Test that a stream closed after the first line records the finished deployment"""
+        def deploy_project_stream(**kwargs):
+            yield 'one'
+            yield 'two'
+            return {'success': True, 'logs': ['one', 'two']}
+
+        view = DeploymentViewSet()
+        orchestrator = mock.Mock(deploy_project_stream=deploy_project_stream)
+        request = mock.Mock()
+        with mock.patch.object(view, '_start_deployment', return_value=(self.project, self.deployment, {})), \
+                mock.patch.object(DeploymentViewSet, '_deploy_arguments', return_value={}), \
+                mock.patch.object(deployment_views, '_get_orchestrator', return_value=orchestrator):
+            response = view.trigger_deployment_stream(request)
+            content = iter(response.streaming_content)
+            self.assertEqual(next(content), b'one\n')
+            response.close()
+
+        self.deployment.refresh_from_db()
+        self.assertEqual(self.deployment.status, 'success')
+        self.assertEqual(self.deployment.logs, 'one\ntwo')
+
+    def test_abandoned_deployments_are_failed(self):
+        """Test that unfinished deployments older than the cutoff are failed with a log line"""
+        old = Deployment.objects.create(project=self.project, user=self.deployment.user, status='pending')
+        Deployment.objects.filter(pk=old.pk).update(started_at=timezone.now() - timedelta(hours=2))
+
+        self.assertEqual(Deployment.fail_abandoned(timezone.now() - timedelta(hours=1)), 1)
+        old.refresh_from_db()
+        self.assertEqual(old.status, 'failed')
+        self.assertIn('Deployment abandoned', old.logs)
+        self.assertIsNotNone(old.completed_at)
+        self.deployment.refresh_from_db()
+        self.assertEqual(self.deployment.status, 'validating')
+
+        call_command('fail_abandoned_deployments', stdout=StringIO())
+        self.deployment.refresh_from_db()
+        self.assertEqual(self.deployment.status, 'failed')
+
+    def test_failed_result_leaves_configs_alone(self):
+        """Test that a failed result only updates the deployment"""
+        DeploymentViewSet._record_result(self.deployment, self.project, {
+            'success': False,
+            'logs': ['boom'],
+            'backend_pid': 4321,
+        })
+
+        self.deployment.refresh_from_db()
+        self.assertEqual(self.deployment.status, 'failed')
+        self.assertFalse(BackendConfig.objects.get(project=self.project).is_running)
+
+
+class ComponentLibraryTests(TestCase):
+    """Test suite for component library usage counting"""
+
+    def setUp(self):
+        """Create a user, another user's private component and the viewset"""
+        self.user = User.objects.create_user(username='builder', email='builder@example.com', password='testpass123')
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        self.component = ComponentLibrary.objects.create(user=self.user, name='Hero', component_json={})
+        self.private = ComponentLibrary.objects.create(user=other, name='Secret', component_json={})
+
+        self.view = ComponentLibraryViewSet(action='increment_usage')
+        self.request = mock.Mock(user=self.user)
+        self.view.request = self.request
+
+    def test_increment_usage_updates_in_place(self):
+        """Test that each use increments the stored count and returns it"""
+        self.view.increment_usage(self.request, pk=self.component.pk)
+        response = self.view.increment_usage(self.request, pk=self.component.pk)
+
+        self.assertEqual(response.data, {'usage_count': 2})
+        self.component.refresh_from_db()
+        self.assertEqual(self.component.usage_count, 2)
+
+    def test_increment_usage_of_hidden_component_is_404(self):
+        """Test that another user's private component cannot be counted"""
+        with self.assertRaises(Http404):
+            self.view.increment_usage(self.request, pk=self.private.pk)
+        self.private.refresh_from_db()
+        self.assertEqual(self.private.usage_count, 0)
+
+    def test_increment_usage_with_malformed_pk_is_404(self):
+        """Test that a non-numeric pk is reported as not found rather than raising"""
+        with self.assertRaises(Http404):
+            self.view.increment_usage(self.request, pk='abc')
+
+
+class UploadExtractionTests(SimpleTestCase):
+    """Test suite for extracting uploaded ZIP archives"""
+
+    def setUp(self):
+        """Build an in-memory archive and a scratch destination"""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.destination = Path(self._tmp.name) / 'dist'
+        self.destination.mkdir()
+
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('index.html', '<html></html>')
+            archive.writestr('assets/', '')
+            for index in range(20):
+                archive.writestr(f'assets/js/chunk-{index}.js', f'console.log({index})')
+            archive.writestr('../escape.txt', 'outside')
+        self.upload = SimpleUploadedFile('dist.zip', buffer.getvalue())
+
+    def assert_extracted(self, infos):
+        """Check the archive landed in the destination and nowhere else"""
+        self.assertEqual(len(infos), 23)
+        self.assertEqual((self.destination / 'index.html').read_text(), '<html></html>')
+        self.assertEqual((self.destination / 'assets' / 'js' / 'chunk-7.js').read_text(), 'console.log(7)')
+        self.assertEqual((self.destination / 'escape.txt').read_text(), 'outside')
+        self.assertFalse((self.destination.parent / 'escape.txt').exists())
+
+    def test_small_archive_is_extracted(self):
+        """Test that a small archive is extracted in one pass"""
+        self.assert_extracted(_extract_upload(self.upload, self.destination))
+
+    def test_archive_is_checked_before_extraction(self):
+        """Test that oversized archives or ones missing a required file write nothing"""
+        with self.assertRaisesRegex(ValueError, 'manage.py'):
+            _extract_upload(self.upload, self.destination, ('manage.py',))
+
+        with mock.patch.object(deployment_views, 'ZIP_MAX_EXTRACTED_SIZE', 100):
+            with self.assertRaisesRegex(ValueError, 'too large'):
+                _extract_upload(self.upload, self.destination)
+
+        self.assertEqual(list(self.destination.iterdir()), [])
+
+        infos = _extract_upload(self.upload, self.destination, ('index.html',))
+        self.assertEqual(len(infos), 23)
+
+    def test_backend_manifests_of_other_stacks_are_accepted(self):
+        """Test that a nested go.mod passes the backend manifest check like any other stack"""
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('service/go.mod', 'module example.com/api\n')
+            archive.writestr('service/main.go', 'package main\n')
+        upload = SimpleUploadedFile('backend.zip', buffer.getvalue())
+
+        infos = _extract_upload(upload, self.destination, BackendDetector.MANIFEST_FILES)
+
+        self.assertEqual(len(infos), 2)
+        self.assertTrue((self.destination / 'service' / 'go.mod').exists())
+
+    def test_large_archive_is_extracted_in_parallel(self):
+        """Test that sharded extraction writes every member inside the destination"""
+        with mock.patch.object(deployment_views, 'ZIP_PARALLEL_MIN_SIZE', 0), \
+                mock.patch.object(deployment_views.os, 'cpu_count', return_value=4):
+            self.assert_extracted(_extract_upload(self.upload, self.destination))
+
+
+class DNSVerifierTests(SimpleTestCase):
+    """Test suite for DNSVerifier lookups that avoid the network"""
+
+    def setUp(self):
+        """Start every test with an empty public IP cache"""
+        patcher = mock.patch.object(DNSVerifier, '_public_ip_cache', (None, 0.0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_public_ip_is_cached_across_verifiers(self):
+        """Test that a successful public IP lookup is reused until the TTL expires"""
+        with mock.patch.object(DNSVerifier, '_fetch_public_ip', return_value='203.0.113.7') as fetch:
+            self.assertEqual(DNSVerifier().get_server_public_ip(), '203.0.113.7')
+            self.assertEqual(DNSVerifier().get_server_public_ip(), '203.0.113.7')
+            fetch.assert_called_once()
+
+            with mock.patch.object(DNSVerifier, 'PUBLIC_IP_CACHE_TTL', 0):
+                DNSVerifier().get_server_public_ip()
+            self.assertEqual(fetch.call_count, 2)
+
+    def test_failed_public_ip_lookup_is_not_cached(self):
+        """Test that a lookup which found no IP is retried on the next call"""
+        with mock.patch.object(DNSVerifier, '_fetch_public_ip', return_value=None) as fetch:
+            self.assertIsNone(DNSVerifier().get_server_public_ip())
+            self.assertIsNone(DNSVerifier().get_server_public_ip())
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_bulk_verify_keeps_order_and_skips_incomplete_entries(self):
+        """Test that concurrent bulk verification returns results in input order"""
+        domains = [
+            {'domain': f'site{index}.example.com', 'expected_ip': '203.0.113.7'}
+            for index in range(10)
+        ]
+        domains.insert(3, {'domain': 'missing-ip.example.com'})
+
+        with mock.patch.object(DNSVerifier, 'verify_domain', side_effect=lambda domain, ip: {'domain': domain}):
+            results = DNSVerifier().bulk_verify_domains(domains)
+
+        self.assertEqual(
+            [result['domain'] for result in results],
+            [f'site{index}.example.com' for index in range(10)]
+        )
+
+    def test_certificate_expiry_is_parsed(self):
+        """Test that notAfter is parsed and compared against the current time"""
+        result = DNSVerifier._new_ssl_check('example.com', 443)
+        DNSVerifier._check_certificate(result, {
+            'issuer': ((('organizationName', 'Example CA'),),),
+            'notAfter': 'Jan  1 00:00:00 2001 GMT',
+        })
+
+        self.assertTrue(result['has_ssl'])
+        self.assertFalse(result['valid'])
+        self.assertEqual(result['issuer'], {'organizationName': 'Example CA'})
+        self.assertEqual(result['expires'], '2001-01-01T00:00:00+00:00')
+
+    def test_bulk_ssl_check_reports_connection_failures(self):
+        """Test that concurrent SSL checks return one result per domain in order"""
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            closed_port = sock.getsockname()[1]
+
+        results = DNSVerifier().bulk_check_ssl(['127.0.0.1', 'localhost'], port=closed_port)
+
+        self.assertEqual([result['domain'] for result in results], ['127.0.0.1', 'localhost'])
+        for result in results:
+            self.assertFalse(result['has_ssl'])
+            self.assertTrue(result['message'].startswith('SSL check error'))
+
+
+class ProcessManagerTests(TestCase):
+    """Test suite for starting backend processes"""
+
+    def setUp(self):
+        """Create a process manager and a scratch backend directory"""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.manager = ProcessManager(log_dir=self._tmp.name)
+        self.addCleanup(self.manager.stop_all)
+
+    def free_port(self):
+        """Pick a local port nothing listens on"""
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    def test_listening_backend_is_ready_before_grace_period(self):
+        """Test that start_backend returns once the backend accepts connections"""
+        port = self.free_port()
+        with mock.patch.object(ProcessManager, 'STARTUP_GRACE_PERIOD', 30):
+            result = self.manager.start_backend(
+                'site', 'other', self._tmp.name, f'{sys.executable} -m http.server {port} --bind 127.0.0.1', port
+            )
+
+        self.assertTrue(result['success'], result['message'])
+        self.assertIn('site', self.manager.processes)
+
+    def test_crashing_backend_fails_without_waiting(self):
+        """Test that a backend which exits on startup is reported as failed"""
+        with mock.patch.object(ProcessManager, 'STARTUP_GRACE_PERIOD', 30):
+            result = self.manager.start_backend(
+                'site', 'other', self._tmp.name, f'{sys.executable} -c raise_on_startup', self.free_port()
+            )
+
+        self.assertFalse(result['success'])
+        self.assertIn('NameError', result['message'])
+        self.assertNotIn('site', self.manager.processes)
+
+    def test_crash_report_does_not_wait_for_inherited_stderr(self):
+        """Test that a crashed backend is reported while a child still holds its stderr open"""
+        Path(self._tmp.name, 'crash.py').write_text(
+            'import subprocess, sys\n'
+            'subprocess.Popen([sys.executable, "-c", "import time; time.sleep(3)"])\n'
+            'sys.exit("boom")\n'
+        )
+        started = time.monotonic()
+        result = self.manager.start_backend('site', 'other', self._tmp.name, f'{sys.executable} crash.py', self.free_port())
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertFalse(result['success'])
+        self.assertIn('boom', result['message'])
+
+    def test_start_command_keeps_quoted_arguments(self):
+        """Test that a quoted argument in the start command is passed as one"""
+        result = self.manager.start_backend(
+            'site', 'other', self._tmp.name, f'{sys.executable} -c "import sys; sys.exit(\'quoted arg\')"', self.free_port()
+        )
+
+        self.assertFalse(result['success'])
+        self.assertIn('quoted arg', result['message'])
+
+    def test_backend_output_is_logged_to_file(self):
+        """Test that backend output is written to its log file and read back"""
+        Path(self._tmp.name, 'noisy.py').write_text(
+            'import sys\n'
+            'for line in range(5000):\n'
+            '    print(f"line {line}", file=sys.stderr if line % 2 else sys.stdout)\n'
+            'sys.exit("done")\n'
+        )
+        self.manager.start_backend('site', 'other', self._tmp.name, f'{sys.executable} -u noisy.py', self.free_port())
+
+        logs = self.manager.get_process_logs('site', lines=3)
+
+        self.assertTrue(logs['success'])
+        self.assertEqual(logs['stdout'], 'line 4998\nline 4999\ndone\n')
+
+    def test_stop_backend_waits_for_exit_and_reaps(self):
+        """Test that a stopped backend is waited for and leaves no zombie behind"""
+        port = self.free_port()
+        self.manager.start_backend(
+            'site', 'other', self._tmp.name, f'{sys.executable} -m http.server {port} --bind 127.0.0.1', port
+        )
+        process = self.manager.processes['site']['process']
+
+        result = self.manager.stop_backend('site')
+
+        self.assertTrue(result['success'], result['message'])
+        self.assertIsNotNone(process.returncode)
+        self.assertNotIn('site', self.manager.processes)
+
+    def test_stop_backend_kills_after_grace_period(self):
+        """Test that a backend ignoring SIGTERM is killed once the grace period is up"""
+        Path(self._tmp.name, 'stubborn.py').write_text(
+            'import signal, time\n'
+            'signal.signal(signal.SIGTERM, signal.SIG_IGN)\n'
+            'time.sleep(30)\n'
+        )
+        with mock.patch.object(ProcessManager, 'STARTUP_GRACE_PERIOD', 0.5):
+            self.manager.start_backend('site', 'other', self._tmp.name, f'{sys.executable} stubborn.py', self.free_port())
+        process = self.manager.processes['site']['process']
+
+        started = time.monotonic()
+        result = self.manager.stop_backend('site', grace=0.2)
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertTrue(result['success'], result['message'])
+        self.assertEqual(process.returncode, -9)
+
+    def test_backend_started_elsewhere_is_adopted_and_stopped(self):
+        """Test that a backend registered by another worker can be stopped by this one"""
+        user = User.objects.create_user(username='builder', email='builder@example.com', password='testpass123')
+        project = Project.objects.create(user=user, name='Site', slug='site', backend_path=self._tmp.name)
+        config = BackendConfig.objects.create(project=project, framework='other', start_command='serve')
+        port = self.free_port()
+        ProcessManager(log_dir=self._tmp.name).start_backend(
+            str(project.id), 'other', self._tmp.name, f'{sys.executable} -m http.server {port} --bind 127.0.0.1', port
+        )
+        config.refresh_from_db()
+        self.assertTrue(config.is_running)
+
+        status = self.manager.get_process_status(str(project.id))
+        result = self.manager.stop_backend(str(project.id))
+
+        self.assertEqual(status['pid'], config.process_id)
+        self.assertTrue(result['success'], result['message'])
+        config.refresh_from_db()
+        self.assertFalse(config.is_running)
+        self.assertIsNone(config.process_id)
+
+    def test_reused_pid_is_not_adopted(self):
+        """Test that a registered PID now held by another process is cleared instead of signalled"""
+        user = User.objects.create_user(username='builder', email='builder@example.com', password='testpass123')
+        project = Project.objects.create(user=user, name='Site', slug='site', backend_path=self._tmp.name)
+        # This test process stands in for an unrelated process that got the PID
+        config = BackendConfig.objects.create(
+            project=project, framework='other', start_command='serve',
+            is_running=True, process_id=os.getpid(), process_create_time=1.0
+        )
+
+        with mock.patch('os.killpg') as killpg, mock.patch.object(psutil.Process, 'send_signal') as send_signal:
+            result = self.manager.stop_backend(str(project.id))
+
+        killpg.assert_not_called()
+        send_signal.assert_not_called()
+        self.assertFalse(result['success'])
+        config.refresh_from_db()
+        self.assertFalse(config.is_running)
+        self.assertIsNone(config.process_id)
+
+    def test_prune_clears_only_stale_backends(self):
+        """Test that the startup prune keeps live backends and clears reused or legacy PIDs"""
+        user = User.objects.create_user(username='builder', email='builder@example.com', password='testpass123')
+        child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'], start_new_session=True)
+        self.addCleanup(child.wait)
+        self.addCleanup(child.kill)
+        configs = {}
+        for slug, create_time in [('live', psutil.Process(child.pid).create_time()), ('reused', 1.0), ('legacy', None)]:
+            project = Project.objects.create(user=user, name=slug, slug=slug)
+            configs[slug] = BackendConfig.objects.create(
+                project=project, framework='other', start_command='serve',
+                is_running=True, process_id=child.pid, process_create_time=create_time
+            )
+
+        call_command('clear_stale_backends', stdout=StringIO())
+
+        running = {slug for slug, config in configs.items() if BackendConfig.objects.get(pk=config.pk).is_running}
+        self.assertEqual(running, {'live'})
+
+    def test_concurrent_start_is_claimed_once(self):
+        """Test that only one worker gets to start a project's backend"""
+        user = User.objects.create_user(username='builder', email='builder@example.com', password='testpass123')
+        project = Project.objects.create(user=user, name='Site', slug='site')
+        BackendConfig.objects.create(project=project, framework='other', start_command='serve')
+        other_worker = ProcessManager(log_dir=self._tmp.name)
+
+        self.assertTrue(other_worker.registry.claim(str(project.id)))
+        result = self.manager.start_backend(str(project.id), 'other', self._tmp.name, 'serve', self.free_port())
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['message'], 'Backend is already being started')
+
+    def test_find_available_port_skips_listening_ports(self):
+        """Test that listening ports are ruled out without a bind attempt each"""
+        with socket.socket() as listener:
+            listener.bind(('127.0.0.1', 0))
+            listener.listen()
+            port = listener.getsockname()[1]
+
+            with mock.patch.object(ProcessManager, 'check_port_available', return_value=True) as check:
+                found = self.manager.find_available_port(port, port + 2)
+
+        self.assertEqual(found, port + 1)
+        check.assert_called_once_with(port + 1)
+
+    def test_status_reuses_the_spawn_time_psutil_handle(self):
+        """Test that status queries use the kept psutil handle without sampling delays"""
+        port = self.free_port()
+        self.manager.start_backend(
+            'site', 'other', self._tmp.name, f'{sys.executable} -m http.server {port} --bind 127.0.0.1', port
+        )
+        handle = self.manager.processes['site']['psutil']
+
+        with mock.patch.object(handle, 'cpu_percent', return_value=1.5) as cpu_percent:
+            status = self.manager.get_process_status('site')
+
+        cpu_percent.assert_called_once_with(interval=None)
+        self.assertTrue(status['running'])
+        self.assertEqual(status['cpu_percent'], 1.5)
+
+    def test_health_session_pools_and_retries_connections(self):
+        """Test that health checks share a pooled adapter that retries transient failures"""
+        adapter = process_manager._health_session.get_adapter('http://127.0.0.1:8000/')
+
+        self.assertEqual(adapter._pool_maxsize, 16)
+        self.assertEqual(adapter.max_retries.total, 2)
+
+    def test_health_check_all_runs_checks_concurrently(self):
+        """Test that batched health checks overlap and keep the port order"""
+        def slow_check(port, endpoint='/'):
+            time.sleep(0.2)
+            return {'port': port}
+
+        with mock.patch.object(self.manager, 'health_check', side_effect=slow_check):
+            started = time.monotonic()
+            results = self.manager.health_check_all([8001, 8002, 8003, 8004])
+            elapsed = time.monotonic() - started
+
+        self.assertEqual([result['port'] for result in results], [8001, 8002, 8003, 8004])
+        self.assertLess(elapsed, 0.6)
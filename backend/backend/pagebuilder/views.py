@@ -1,3 +1,6 @@
+import functools
+from string import Template
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -5,6 +8,89 @@ from .models import Page
 from .serializers import PageSerializer
 
 
+# JSX emitted per block type, compiled once; props fill the placeholders
+JSX_BLOCK_TEMPLATES = {
+    'heading': Template("  <$level style={ color: '$color' }>$text</$level>"),
+    'text': Template("  <p style={ fontSize: '$fontSize', color: '$color' }>$text</p>"),
+    'image': Template("  <img src=\"$src\" alt=\"$alt\" style={ width: '$width' } />"),
+    'button': Template(
+        "  <a href=\"$href\" style={ background: '$color', padding: '10px 20px', "
+        "borderRadius: '6px', textDecoration: 'none', color: 'white' }>$text</a>"
+    ),
+    'container': Template(
+        "  <div style={ padding: '$padding', background: '$background' }>\n"
+        "    {/* Add nested content here */}\n"
+        "  </div>"
+    ),
+}
+
+# Values used for props a block doesn't set
+JSX_BLOCK_DEFAULTS = {
+    'heading': {'level': 'h1', 'text': '', 'color': '#ffffff'},
+    'text': {'text': '', 'fontSize': '16px', 'color': '#ffffff'},
+    'image': {'src': '', 'alt': 'Image', 'width': '100%'},
+    'button': {'text': 'Button', 'href': '#', 'color': '#3b82f6'},
+    'container': {'padding': '20px', 'background': 'rgba(255,255,255,0.05)'},
+}
+
+# Escaping for props placed in JSX text and quoted attributes, where
+# entities are decoded and braces would open an expression
+JSX_ESCAPE = str.maketrans({
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;', '{': '&#123;', '}': '&#125;',
+})
+
+# Style props land inside single-quoted JS strings, which don't decode entities
+JSX_STYLE_PROPS = {'color', 'fontSize', 'width', 'padding', 'background'}
+JS_STRING_ESCAPE = str.maketrans({
+    '\\': '\\\\', "'": "\\'", '\n': '\\n', '\r': '\\r', '\u2028': '\\u2028', '\u2029': '\\u2029',
+})
+
+JSX_HEADING_LEVELS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+JSX_PAGE_TEMPLATE = Template("""import React from 'react';
+
+const $component = () => {
+  return (
+    <div className="page-container">
+$components
+    </div>
+  );
+};
+
+export default $component;
+""")
+
+
+def _render_block(block):
+    """Render one block as JSX, from its props or their defaults"""
+    props = block.get('props', {})
+    values = tuple(
+        (key, str(props.get(key, default)))
+        for key, default in JSX_BLOCK_DEFAULTS[block['type']].items()
+    )
+    return _render_block_values(block['type'], values)
+
+
+@functools.lru_cache(maxsize=1024)
+def _render_block_values(block_type, values):
+    """
+    Escape a block's (name, value) pairs into its template.
+    
+    Cached, so repeated identical blocks (common in templated pages) are
+    only escaped and substituted once.
+    """
+    escaped = {
+        key: value.translate(JS_STRING_ESCAPE if key in JSX_STYLE_PROPS else JSX_ESCAPE)
+        for key, value in values
+    }
+    
+    # The level becomes the tag name, so only real headings are allowed
+    if escaped.get('level', 'h1') not in JSX_HEADING_LEVELS:
+        escaped['level'] = 'h1'
+    
+    return JSX_BLOCK_TEMPLATES[block_type].substitute(escaped)
+
+
 class PageViewSet(viewsets.ModelViewSet):
     """
     ViewSet for CRUD operations on Page model.
@@ -44,59 +130,13 @@ class PageViewSet(viewsets.ModelViewSet):
 
     def generate_jsx(self, page):
         """Generate React JSX code from blocks_json"""
-        blocks = page.blocks_json
-        components_code = []
-        
-        for block in blocks:
-            block_type = block.get('type')
-            props = block.get('props', {})
-            
-            if block_type == 'heading':
-                level = props.get('level', 'h1')
-                text = props.get('text', '')
-                color = props.get('color', '#ffffff')
-                components_code.append(f"  <{level} style={{ color: '{color}' }}>{text}</{level}>")
-            
-            elif block_type == 'text':
-                text = props.get('text', '')
-                fontSize = props.get('fontSize', '16px')
-                color = props.get('color', '#ffffff')
-                components_code.append(f"  <p style={{ fontSize: '{fontSize}', color: '{color}' }}>{text}</p>")
-            
-            elif block_type == 'image':
-                src = props.get('src', '')
-                alt = props.get('alt', 'Image')
-                width = props.get('width', '100%')
-                components_code.append(f"  <img src=\"{src}\" alt=\"{alt}\" style={{ width: '{width}' }} />")
-            
-            elif block_type == 'button':
-                text = props.get('text', 'Button')
-                href = props.get('href', '#')
-                color = props.get('color', '#3b82f6')
-                components_code.append(
-                    f"  <a href=\"{href}\" style={{ background: '{color}', padding: '10px 20px', "
-                    f"borderRadius: '6px', textDecoration: 'none', color: 'white' }}>{text}</a>"
-                )
-            
-            elif block_type == 'container':
-                padding = props.get('padding', '20px')
-                background = props.get('background', 'rgba(255,255,255,0.05)')
-                components_code.append(f"  <div style={{ padding: '{padding}', background: '{background}' }}>")
-                components_code.append("    {/* Add nested content here */}")
-                components_code.append("  </div>")
+        components_str = '\n'.join(
+            _render_block(block)
+            for block in page.blocks_json
+            if block.get('type') in JSX_BLOCK_TEMPLATES
+        )
         
-        components_str = '\n'.join(components_code)
-        
-        jsx = f"""import React from 'react';
-
-const {page.slug.replace('-', '_').title()} = () => {{
-  return (
-    <div className="page-container">
-{components_str}
-    </div>
-  );
-}};
-
-export default {page.slug.replace('-', '_').title()};
-"""
-        return jsx
+        return JSX_PAGE_TEMPLATE.substitute(
+            component=page.slug.replace('-', '_').title(),
+            components=components_str
+        )
@@ -1,13 +1,28 @@
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class SecretManagerClient:
+    # Seconds an environment's secrets are reused before being fetched again
+    ENV_CACHE_TTL = 60
+
     def __init__(self, api_url, client_id, client_secret, decrypt_func=None):
         self.api_url = api_url.rstrip('/')
         self.client_id = client_id
         self.client_secret = client_secret
         self.decrypt_func = decrypt_func
         self.access_token = None
+        # One session per client keeps connections to the API alive between
+        # calls; dropped connections are retried briefly
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.1))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # environment_id -> (fetched at, {key: encrypted value})
+        self._env_cache = {}
 
     def authenticate(self, username, password):
         token_url = f"{self.api_url}/oauth/token"
@@ -18,31 +33,42 @@ class SecretManagerClient:
             "username": username,
             "password": password
         }
-        resp = requests.post(token_url, data=data)
+        resp = self.session.post(token_url, data=data)
         resp.raise_for_status()
         token_data = resp.json()
         self.access_token = token_data.get("access_token")
         if not self.access_token:
             raise Exception("Failed to obtain access token")
+        self.session.headers["Authorization"] = f"Bearer {self.access_token}"
+        self._env_cache.clear()
 
     def get_secret(self, environment_id, secret_key):
         if not self.access_token:
             raise Exception("Authenticate first to obtain access token.")
+        secrets = self._environment_secrets(environment_id)
+        if secret_key not in secrets:
+            raise KeyError(f"Secret '{secret_key}' not found in environment '{environment_id}'")
+        value = secrets[secret_key]
+        if self.decrypt_func:
+            try:
+                value = self.decrypt_func(value)
+            except Exception:
+                value = '[Decryption Failed]'
+        return value
+
+    def _environment_secrets(self, environment_id):
+        # One fetch serves every lookup in the environment for ENV_CACHE_TTL;
+        # values stay encrypted until requested
+        now = time.monotonic()
+        entry = self._env_cache.get(environment_id)
+        if entry and now - entry[0] < self.ENV_CACHE_TTL:
+            return entry[1]
         url = f"{self.api_url}/environments/{environment_id}/secrets/"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-        resp = requests.get(url, headers=headers)
+        resp = self.session.get(url)
         resp.raise_for_status()
-        secrets = resp.json()
-        for secret in secrets:
-            if secret['key'] == secret_key:
-                value = secret['value']
-                if self.decrypt_func:
-                    try:
-                        value = self.decrypt_func(value)
-                    except Exception:
-                        value = '[Decryption Failed]'
-                return value
-        raise KeyError(f"Secret '{secret_key}' not found in environment '{environment_id}'")
+        secrets = {secret['key']: secret['value'] for secret in resp.json()}
+        self._env_cache[environment_id] = (now, secrets)
+        return secrets
 
 # Example usage:
 # from crypto_utils import decrypt_value
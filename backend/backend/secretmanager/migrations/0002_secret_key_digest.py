@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:55
+
+from django.db import migrations, models
+
+
+def backfill_key_digests(apps, schema_editor):
+    """
+    Digest the decrypted key of every existing secret.
+    
+    Encrypted keys never matched, so an environment may already hold the
+    same key twice; only its most recently updated row gets the digest.
+    """
+    from crypto_utils import decrypt_value, digest_value
+
+    Secret = apps.get_model('secretmanager', 'Secret')
+    seen = set()
+    changed = []
+    for secret in Secret.objects.order_by('environment_id', '-updated_at').iterator():
+        try:
+            digest = digest_value(decrypt_value(secret.key))
+        except Exception:
+            continue
+        if (secret.environment_id, digest) in seen:
+            continue
+        seen.add((secret.environment_id, digest))
+        secret.key_digest = digest
+        changed.append(secret)
+    Secret.objects.bulk_update(changed, ['key_digest'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('secretmanager', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='secret',
+            name='key_digest',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_key_digests, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='secret',
+            unique_together={('environment', 'key_digest'), ('environment', 'key')},
+        ),
+    ]
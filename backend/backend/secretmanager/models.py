@@ -48,6 +48,8 @@ class Secret(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     environment = models.ForeignKey(SecretEnvironment, on_delete=models.CASCADE, related_name='secrets')
     key = models.CharField(max_length=255)
+    # Encrypted keys differ on every write, so duplicates are found by digest
+    key_digest = models.CharField(max_length=64, null=True, blank=True, editable=False)
     value = models.TextField()  # Encrypted value
     description = models.TextField(blank=True, null=True)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='created_secrets')
@@ -58,7 +60,7 @@ class Secret(models.Model):
     class Meta:
         db_table = 'secrets'
         ordering = ['key']
-        unique_together = ['environment', 'key']
+        unique_together = [['environment', 'key'], ['environment', 'key_digest']]
     
     def __str__(self):
         return f"{self.environment.project.name}/{self.environment.name}/{self.key}"
@@ -1,7 +1,22 @@
+import datetime
+
+from django.utils import timezone
+from oauth2_provider.models import AccessToken
 from rest_framework import serializers
 from .models import SecretProject, SecretEnvironment, Secret, SecretVersion
 
 
+# Project access tokens are issued for 10 years; one with less than 9 left
+# is treated as expired and no longer handed out
+PROJECT_TOKEN_LIFETIME = datetime.timedelta(days=365 * 10)
+PROJECT_TOKEN_MIN_REMAINING = datetime.timedelta(days=365 * 9)
+
+
+def long_lived_tokens():
+    """Access tokens still valid for PROJECT_TOKEN_MIN_REMAINING, oldest first"""
+    return AccessToken.objects.filter(expires__gt=timezone.now() + PROJECT_TOKEN_MIN_REMAINING).order_by('id')
+
+
 class SecretEnvironmentSerializer(serializers.ModelSerializer):
     secret_count = serializers.SerializerMethodField()
     
@@ -10,62 +25,56 @@ class SecretEnvironmentSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug', 'position', 'created_at', 'secret_count']
     
     def get_secret_count(self, obj):
+        # Annotated by SecretProjectViewSet.get_queryset
+        if hasattr(obj, 'secret_count'):
+            return obj.secret_count
         return obj.secrets.count()
 
 
-class SecretProjectSerializer(serializers.ModelSerializer):
-    environments = SecretEnvironmentSerializer(many=True, read_only=True)
+class SecretProjectListSerializer(serializers.ModelSerializer):
+    """Project summary without environments or credentials, for compact lists"""
     secret_count = serializers.SerializerMethodField()
     created_by_name = serializers.SerializerMethodField()
-    client_id = serializers.SerializerMethodField()
-    client_secret = serializers.SerializerMethodField()
-    access_token = serializers.SerializerMethodField()
 
     class Meta:
         model = SecretProject
         fields = ['id', 'name', 'description', 'created_by', 'created_by_name',
-                  'created_at', 'updated_at', 'environments', 'secret_count', 'client_id', 'client_secret', 'access_token']
+                  'created_at', 'updated_at', 'secret_count']
         read_only_fields = ['created_by', 'created_at', 'updated_at']
 
-    def get_access_token(self, obj):
-        # Generate a permanent access token for the linked Application
-        try:
-            app = obj.application
-            if not app:
-                return None
-            from oauth2_provider.models import AccessToken
-            from django.utils import timezone
-            from django.contrib.auth import get_user_model
-            import datetime
-            User = get_user_model()
-            user = app.user if app.user else User.objects.first()
-            # Check for existing valid token (permanent)
-            token_obj = AccessToken.objects.filter(application=app, user=user, expires__gt=timezone.now() + datetime.timedelta(days=365*9)).first()
-            if token_obj:
-                return token_obj.token
-            # Otherwise, create a new permanent token
-            from oauthlib.common import generate_token
-            token = generate_token()
-            # Set expiry to 10 years from now
-            expires = timezone.now() + datetime.timedelta(days=365*10)
-            scope = app.scope if hasattr(app, 'scope') else ''
-            token_obj = AccessToken.objects.create(
-                user=user,
-                application=app,
-                token=token,
-                expires=expires,
-                scope=scope
-            )
-            return token_obj.token
-        except Exception:
-            return None
-
     def get_secret_count(self, obj):
+        # Annotated by SecretProjectViewSet.get_queryset
+        if hasattr(obj, 'secret_count'):
+            return obj.secret_count
         return Secret.objects.filter(environment__project=obj).count()
 
     def get_created_by_name(self, obj):
         return obj.created_by.username if obj.created_by else None
 
+
+class SecretProjectSerializer(SecretProjectListSerializer):
+    environments = SecretEnvironmentSerializer(many=True, read_only=True)
+    client_id = serializers.SerializerMethodField()
+    client_secret = serializers.SerializerMethodField()
+    access_token = serializers.SerializerMethodField()
+
+    class Meta(SecretProjectListSerializer.Meta):
+        fields = ['id', 'name', 'description', 'created_by', 'created_by_name',
+                  'created_at', 'updated_at', 'environments', 'secret_count', 'client_id', 'client_secret', 'access_token']
+
+    def get_access_token(self, obj):
+        # Tokens are minted when the project is created (and by the
+        # rotate_token action), never while serializing
+        app = obj.application
+        if not app:
+            return None
+        # Prefetched by SecretProjectViewSet.get_queryset
+        if hasattr(app, 'long_lived_tokens'):
+            tokens = app.long_lived_tokens
+        else:
+            tokens = long_lived_tokens().filter(application=app)[:1]
+        return tokens[0].token if tokens else None
+
     def get_client_id(self, obj):
         # Use the linked Application model
         try:
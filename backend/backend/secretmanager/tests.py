@@ -1,3 +1,234 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.test import SimpleTestCase, TestCase
+from oauth2_provider.models import AccessToken, Application
+from crypto_utils import decrypt_value, encrypt_value
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .client import SecretManagerClient
+from .models import Secret, SecretEnvironment, SecretProject, SecretVersion
+from .views import SecretEnvironmentViewSet, SecretProjectViewSet, SecretViewSet, issue_project_token
+
+User = get_user_model()
+
+
+class SecretProjectListTests(TestCase):
+    """Test suite for listing secret projects"""
+
+    def setUp(self):
+        """Create projects with a few environments and secrets each"""
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='testpass123')
+        for index in range(3):
+            project = SecretProject.objects.create(name=f'Project {index}', created_by=self.user)
+            for position, slug in enumerate(['dev', 'prod']):
+                environment = SecretEnvironment.objects.create(
+                    project=project, name=slug.title(), slug=slug, position=position
+                )
+                for key in range(position + 1):
+                    Secret.objects.create(environment=environment, key=f'KEY_{key}', value='encrypted')
+            project.application = Application.objects.create(
+                name=f'Project {index} Client',
+                user=self.user,
+                client_type=Application.CLIENT_CONFIDENTIAL,
+                authorization_grant_type=Application.GRANT_CLIENT_CREDENTIALS
+            )
+            project.save()
+            issue_project_token(project.application, self.user)
+
+    def list_projects(self, **params):
+        """List the user's projects through the viewset"""
+        request = APIRequestFactory().get('/api/secrets/projects/', params)
+        force_authenticate(request, user=self.user)
+        return SecretProjectViewSet.as_view({'get': 'list'})(request)
+
+    def test_list_query_count_is_constant(self):
+        """Test that secret counts don't cost a query per project or environment"""
+        # Projects (with annotated counts), their environments and tokens
+        with self.assertNumQueries(3):
+            response = self.list_projects()
+
+        self.assertEqual(response.status_code, 200)
+        for project in response.data:
+            self.assertEqual(project['secret_count'], 3)
+            self.assertEqual([env['secret_count'] for env in project['environments']], [1, 2])
+
+    def test_compact_list_leaves_out_environments_and_credentials(self):
+        """Test that ?compact=true lists project summaries from a single query"""
+        with self.assertNumQueries(1):
+            response = self.list_projects(compact='true')
+
+        self.assertEqual(len(response.data), 3)
+        for project in response.data:
+            self.assertEqual(project['secret_count'], 3)
+            self.assertNotIn('environments', project)
+            self.assertNotIn('access_token', project)
+
+    def test_listing_does_not_mint_tokens(self):
+        """Test that projects are listed with their existing tokens, creating none"""
+        tokens = set(AccessToken.objects.values_list('token', flat=True))
+
+        response = self.list_projects()
+
+        self.assertEqual({project['access_token'] for project in response.data}, tokens)
+        self.assertEqual(AccessToken.objects.count(), 3)
+
+    def test_rotate_token_replaces_the_token(self):
+        """Test that rotating a project's token issues a new one in its place"""
+        project = SecretProject.objects.first()
+        old_token = AccessToken.objects.get(application=project.application).token
+        request = APIRequestFactory().post(f'/api/secrets/projects/{project.id}/rotate_token/')
+        force_authenticate(request, user=self.user)
+
+        response = SecretProjectViewSet.as_view({'post': 'rotate_token'})(request, pk=project.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(AccessToken.objects.get(application=project.application).token, response.data['access_token'])
+        self.assertNotEqual(response.data['access_token'], old_token)
+
+
+
+class SecretWriteTests(TestCase):
+    """Test suite for adding and updating secrets"""
+
+    def setUp(self):
+        """Create an environment to write secrets to"""
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='testpass123')
+        project = SecretProject.objects.create(name='Project', created_by=self.user)
+        self.environment = SecretEnvironment.objects.create(project=project, name='Dev', slug='dev')
+
+    def bulk_update(self, secrets):
+        """Post secrets to the environment's bulk_update action"""
+        request = APIRequestFactory().post(
+            f'/api/secrets/environments/{self.environment.id}/bulk_update/', {'secrets': secrets}, format='json'
+        )
+        force_authenticate(request, user=self.user)
+        view = SecretEnvironmentViewSet.as_view({'post': 'bulk_update'})
+        return view(request, pk=self.environment.id)
+
+    def test_versions_are_recorded_for_every_secret(self):
+        """Test that each written secret gets a version entry"""
+        response = self.bulk_update([
+            {'key': f'KEY_{index}', 'value': f'value {index}'} for index in range(5)
+        ] + [{'key': '', 'value': 'orphan'}])
+
+        self.assertEqual(response.data['created'], 5)
+        self.assertEqual(len(response.data['errors']), 1)
+        self.assertEqual(SecretVersion.objects.filter(change_type='created').count(), 5)
+        self.assertFalse(Secret.objects.exclude(created_by=self.user).exists())
+
+    def test_repeated_key_in_one_request_updates_the_same_secret(self):
+        """Test that a key given twice in one request ends up as one secret"""
+        response = self.bulk_update([
+            {'key': 'API_KEY', 'value': 'first', 'description': 'shared'},
+            {'key': 'API_KEY', 'value': 'second', 'description': 'shared'},
+        ])
+
+        self.assertEqual((response.data['created'], response.data['updated']), (1, 1))
+        self.assertEqual(self.environment.secrets.count(), 1)
+        self.assertEqual(SecretVersion.objects.count(), 2)
+
+    def test_stored_key_is_updated_not_duplicated(self):
+        """Test that bulk updating a key saved by an earlier request updates that secret"""
+        self.bulk_update([{'key': 'API_KEY', 'value': 'first'}])
+
+        response = self.bulk_update([{'key': 'API_KEY', 'value': 'second'}])
+
+        self.assertEqual((response.data['created'], response.data['updated']), (0, 1))
+        self.assertEqual(self.environment.secrets.count(), 1)
+        self.assertEqual(decrypt_value(self.environment.secrets.get().value), 'second')
+        self.assertEqual(SecretVersion.objects.filter(change_type='updated').count(), 1)
+
+    def test_bulk_write_failure_saves_nothing(self):
+        """Test that a database error during the bulk write is a 500 with no partial writes"""
+        Secret.objects.create(environment=self.environment, key='encrypted-key', value='encrypted')
+
+        with mock.patch.object(SecretVersion.objects, 'bulk_create', side_effect=DatabaseError('boom')):
+            response = self.bulk_update([
+                {'key': 'NEW_KEY', 'value': 'value'},
+                {'key': '', 'value': 'orphan'},
+            ])
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.data['error'], 'Failed to save secrets; no changes were made')
+        self.assertEqual(len(response.data['errors']), 1)
+        self.assertEqual(self.environment.secrets.count(), 1)
+
+    def add_secret(self, key, value):
+        """Post a secret to the environment's add_secret action"""
+        request = APIRequestFactory().post(
+            f'/api/secrets/environments/{self.environment.id}/add_secret/', {'key': key, 'value': value}, format='json'
+        )
+        force_authenticate(request, user=self.user)
+        view = SecretEnvironmentViewSet.as_view({'post': 'add_secret'})
+        return view(request, pk=self.environment.id)
+
+    def test_add_secret_rejects_duplicate_key(self):
+        """Test that adding a key the environment already has is a 400, not an error"""
+        self.assertEqual(self.add_secret('API_KEY', 'first').status_code, 201)
+
+        response = self.add_secret('API_KEY', 'second')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.environment.secrets.count(), 1)
+        self.assertEqual(decrypt_value(self.environment.secrets.get().value), 'first')
+        self.assertEqual(self.add_secret('OTHER_KEY', 'third').status_code, 201)
+
+    def test_update_echoes_sent_fields_and_decrypts_the_rest(self):
+        """Test that an update response holds plaintext for every field"""
+        secret = Secret.objects.create(
+            environment=self.environment, key=encrypt_value('API_KEY'), value=encrypt_value('old'),
+            description=encrypt_value('Service key')
+        )
+        request = APIRequestFactory().patch(f'/api/secrets/{secret.id}/', {'value': 'new'}, format='json')
+        force_authenticate(request, user=self.user)
+
+        response = SecretViewSet.as_view({'patch': 'update'})(request, pk=secret.id)
+
+        self.assertEqual(
+            (response.data['key'], response.data['value'], response.data['description']),
+            ('API_KEY', 'new', 'Service key')
+        )
+        secret.refresh_from_db()
+        self.assertEqual(decrypt_value(secret.value), 'new')
+
+    def test_environment_secrets_query_count_is_constant(self):
+        """Test that listing an environment's secrets doesn't look up users per secret"""
+        for index in range(5):
+            Secret.objects.create(
+                environment=self.environment, key=encrypt_value(f'KEY_{index}'), value=encrypt_value('value'),
+                created_by=self.user, updated_by=self.user
+            )
+        request = APIRequestFactory().get(f'/api/secrets/environments/{self.environment.id}/secrets/')
+        force_authenticate(request, user=self.user)
+        view = SecretEnvironmentViewSet.as_view({'get': 'secrets'})
+
+        # The environment, then its secrets joined with their users
+        with self.assertNumQueries(2):
+            response = view(request, pk=self.environment.id)
+
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual({secret['created_by_name'] for secret in response.data}, {'owner'})
+
+
+class SecretManagerClientTests(SimpleTestCase):
+    """Test suite for the secret manager API client"""
+
+    def test_environment_is_fetched_once_per_ttl(self):
+        """Test that lookups in the same environment reuse one fetch until it expires"""
+        client = SecretManagerClient('https://panel.example.com/api', 'id', 'secret', decrypt_func=str.upper)
+        client.access_token = 'token'
+        response = mock.Mock()
+        response.json.return_value = [{'key': 'DB_USER', 'value': 'app'}, {'key': 'DB_PASSWORD', 'value': 'hunter2'}]
+
+        with mock.patch.object(client.session, 'get', return_value=response) as get:
+            self.assertEqual(client.get_secret('prod', 'DB_USER'), 'APP')
+            self.assertEqual(client.get_secret('prod', 'DB_PASSWORD'), 'HUNTER2')
+            with self.assertRaises(KeyError):
+                client.get_secret('prod', 'MISSING')
+            self.assertEqual(get.call_count, 1)
+
+            with mock.patch.object(SecretManagerClient, 'ENV_CACHE_TTL', 0):
+                client.get_secret('prod', 'DB_USER')
+            self.assertEqual(get.call_count, 2)
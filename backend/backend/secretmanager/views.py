@@ -3,19 +3,53 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from django.db import transaction
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import Count, Prefetch
 from .models import SecretProject, SecretEnvironment, Secret, SecretVersion
-from oauth2_provider.models import Application
+from oauth2_provider.models import AccessToken, Application
+from oauthlib.common import generate_token
+from django.utils import timezone
 from .serializers import (
-    SecretProjectSerializer, SecretEnvironmentSerializer, 
-    SecretSerializer, SecretVersionSerializer
+    SecretProjectSerializer, SecretProjectListSerializer, SecretEnvironmentSerializer, 
+    SecretSerializer, SecretVersionSerializer,
+    PROJECT_TOKEN_LIFETIME, long_lived_tokens
 )
-from crypto_utils import encrypt_value, decrypt_value
+from crypto_utils import encrypt_value, decrypt_value, digest_value
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+SECRET_FIELDS = ('key', 'value', 'description')
+
+
+def decrypt_secret_fields(data, fields=SECRET_FIELDS):
+    """Decrypt a serialized secret's encrypted fields in place"""
+    for field in fields:
+        encrypted = data.get(field)
+        if not encrypted:
+            data[field] = ''
+            continue
+        try:
+            data[field] = decrypt_value(encrypted)
+        except Exception as e:
+            logger.error(f"Failed to decrypt {field}: {e}")
+            data[field] = '[Decryption Failed]'
+    return data
+
+
+def issue_project_token(app, user):
+    """Mint a long-lived access token for a project's OAuth2 application"""
+    return AccessToken.objects.create(
+        user=app.user or user,
+        application=app,
+        token=generate_token(),
+        expires=timezone.now() + PROJECT_TOKEN_LIFETIME,
+        scope=getattr(app, 'scope', '')
+    )
+
+
 class SecretProjectViewSet(viewsets.ModelViewSet):
     """ViewSet for managing secret projects"""
     queryset = SecretProject.objects.all()
@@ -24,9 +58,32 @@ class SecretProjectViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Exclude Node SSH Credentials project from UI (identified by internal marker)"""
-        return SecretProject.objects.exclude(
+        # Secret counts are annotated and related rows fetched up front, so
+        # listing projects doesn't cost queries per project and environment
+        queryset = SecretProject.objects.exclude(
             description__contains="_ssh_node_creds_internal_"
-        ).filter(created_by=self.request.user)
+        ).filter(created_by=self.request.user).select_related(
+            'created_by'
+        ).annotate(
+            secret_count=Count('environments__secrets', distinct=True)
+        )
+        if self._compact_list():
+            return queryset
+        
+        return queryset.select_related('application').prefetch_related(
+            Prefetch('environments', queryset=SecretEnvironment.objects.annotate(secret_count=Count('secrets'))),
+            Prefetch('application__accesstoken_set', queryset=long_lived_tokens(), to_attr='long_lived_tokens')
+        )
+    
+    def get_serializer_class(self):
+        """Summaries only (no environments or credentials) for ?compact=true lists"""
+        if self._compact_list():
+            return SecretProjectListSerializer
+        return SecretProjectSerializer
+    
+    def _compact_list(self):
+        """Whether this is a list request asking for summaries only"""
+        return self.action == 'list' and self.request.query_params.get('compact', 'false').lower() == 'true'
     
     @transaction.atomic
     def perform_create(self, serializer):
@@ -53,6 +110,7 @@ class SecretProjectViewSet(viewsets.ModelViewSet):
             )
             project.application = app
             project.save()
+            issue_project_token(app, self.request.user)
         except Exception as e:
             logger.error(f"Failed to create OAuth2 app for project {project.id}: {e}")
             # Don't fail the whole transaction, just log it
@@ -69,12 +127,28 @@ class SecretProjectViewSet(viewsets.ModelViewSet):
         
         super().perform_destroy(instance)
     
+    @action(detail=True, methods=['post'])
+    @transaction.atomic
+    def rotate_token(self, request, pk=None):
+        """Replace the project's access token with a new one"""
+        project = self.get_object()
+        app = project.application
+        if not app:
+            return Response(
+                {'error': 'Project has no OAuth2 application'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        long_lived_tokens().filter(application=app).delete()
+        token = issue_project_token(app, request.user)
+        return Response({'access_token': token.token})
+    
     @action(detail=True, methods=['get'])
     def environments(self, request, pk=None):
         """Get all environments for a project"""
         project = self.get_object()
         # Exclude hidden environments (like SSH)
-        environments = project.environments.filter(is_hidden=False)
+        environments = project.environments.filter(is_hidden=False).annotate(secret_count=Count('secrets'))
         serializer = SecretEnvironmentSerializer(environments, many=True)
         return Response(serializer.data)
     
@@ -100,13 +174,13 @@ class SecretEnvironmentViewSet(viewsets.ModelViewSet):
         return SecretEnvironment.objects.filter(
             is_hidden=False,
             project__created_by=self.request.user
-        )
+        ).annotate(secret_count=Count('secrets'))
     
     @action(detail=True, methods=['get'])
     def secrets(self, request, pk=None):
         """Get all secrets in an environment"""
         environment = self.get_object()
-        secrets = environment.secrets.all()
+        secrets = environment.secrets.select_related('created_by', 'updated_by')
         serializer = SecretSerializer(secrets, many=True)
         
         # Decrypt secrets
@@ -154,22 +228,24 @@ class SecretEnvironmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
-        # Check if secret already exists
-        if Secret.objects.filter(environment=environment, key=encrypted_key).exists():
+        # Create secret; the (environment, key_digest) unique constraint
+        # catches duplicates, so there is no separate existence query
+        try:
+            secret = Secret.objects.create(
+                environment=environment,
+                key=encrypted_key,
+                key_digest=digest_value(key),
+                value=encrypted_value,
+                description=encrypted_description,
+                created_by=request.user
+            )
+        except IntegrityError:
+            transaction.set_rollback(True)
             return Response(
                 {'error': f'Secret with key "{key}" already exists in this environment'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Create secret
-        secret = Secret.objects.create(
-            environment=environment,
-            key=encrypted_key,
-            value=encrypted_value,
-            description=encrypted_description,
-            created_by=request.user
-        )
-        
         # Create version history
         SecretVersion.objects.create(
             secret=secret,
@@ -192,7 +268,13 @@ class SecretEnvironmentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     @transaction.atomic
     def bulk_update(self, request, pk=None):
-        """Bulk update/create secrets in an environment"""
+        """
+        Bulk update/create secrets in an environment.
+        
+        Invalid items are reported in 'errors' and skipped. The valid ones
+        are written together: if the database rejects the write, nothing is
+        saved and the response is a 500.
+        """
         environment = self.get_object()
         secrets_data = request.data.get('secrets', [])
         
@@ -209,6 +291,10 @@ class SecretEnvironmentViewSet(viewsets.ModelViewSet):
             )
         
         results = {'created': 0, 'updated': 0, 'errors': []}
+        entries = []
+        # Repeated keys and descriptions in one request are encrypted once.
+        # Values never are, and the cache is dropped with the request.
+        encrypt_cached = functools.lru_cache(maxsize=None)(encrypt_value)
         
         for secret_data in secrets_data:
             key = secret_data.get('key', '').strip()
@@ -223,58 +309,77 @@ class SecretEnvironmentViewSet(viewsets.ModelViewSet):
                 continue
             
             try:
-                encrypted_key = encrypt_value(key)
-                encrypted_value = encrypt_value(value)
-                encrypted_description = encrypt_value(description) if description else ''
-                
-                secret, created = Secret.objects.update_or_create(
+                entries.append((
+                    digest_value(key),
+                    encrypt_cached(key),
+                    encrypt_value(value),
+                    encrypt_cached(description) if description else ''
+                ))
+            except Exception as e:
+                logger.error(f"Failed to process secret {key}: {e}")
+                results['errors'].append({'key': key, 'error': 'Processing failed'})
+        
+        # Existing rows are looked up once by key digest (ciphertexts never
+        # match), then new and changed secrets are written in bulk; new rows
+        # get created_by on INSERT, with no follow-up save()
+        secrets = {
+            secret.key_digest: secret
+            for secret in environment.secrets.filter(key_digest__in=[entry[0] for entry in entries])
+        }
+        new_secrets = []
+        changed_secrets = []
+        new_versions = []
+        now = timezone.now()
+        
+        for key_digest, encrypted_key, encrypted_value, encrypted_description in entries:
+            secret = secrets.get(key_digest)
+            if secret is None:
+                secret = secrets[key_digest] = Secret(
                     environment=environment,
                     key=encrypted_key,
-                    defaults={
-                        'value': encrypted_value,
-                        'description': encrypted_description,
-                        'updated_by': request.user
-                    }
-                )
-                
-                if created:
-                    secret.created_by = request.user
-                    secret.save()
-                    results['created'] += 1
-                    change_type = 'created'
-                else:
-                    results['updated'] += 1
-                    change_type = 'updated'
-                
-                # Create version history
-                SecretVersion.objects.create(
-                    secret=secret,
+                    key_digest=key_digest,
                     value=encrypted_value,
-                    changed_by=request.user,
-                    change_type=change_type
+                    description=encrypted_description,
+                    created_by=request.user,
+                    updated_by=request.user
                 )
-                
-            except Exception as e:
-                logger.error(f"Failed to process secret {key}: {e}")
-                results['errors'].append({'key': key, 'error': 'Processing failed'})
+                new_secrets.append(secret)
+                results['created'] += 1
+                change_type = 'created'
+            else:
+                secret.value = encrypted_value
+                secret.description = encrypted_description
+                secret.updated_by = request.user
+                secret.updated_at = now
+                if not secret._state.adding and secret not in changed_secrets:
+                    changed_secrets.append(secret)
+                results['updated'] += 1
+                change_type = 'updated'
+            
+            new_versions.append(SecretVersion(
+                secret=secret,
+                value=encrypted_value,
+                changed_by=request.user,
+                change_type=change_type
+            ))
+        
+        try:
+            Secret.objects.bulk_create(new_secrets, batch_size=100)
+            Secret.objects.bulk_update(changed_secrets, ['value', 'description', 'updated_by', 'updated_at'], batch_size=100)
+            SecretVersion.objects.bulk_create(new_versions, batch_size=100)
+        except DatabaseError as e:
+            transaction.set_rollback(True)
+            logger.error(f"Failed to save secrets in bulk: {e}")
+            return Response(
+                {'error': 'Failed to save secrets; no changes were made', 'errors': results['errors']},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
         
         return Response(results)
     
     def _decrypt_secret_data(self, secret_data):
         """Helper method to decrypt secret data"""
-        result = secret_data.copy()
-        
-        for field in ['key', 'value', 'description']:
-            if field in result and result[field]:
-                try:
-                    result[field] = decrypt_value(result[field])
-                except Exception as e:
-                    logger.error(f"Failed to decrypt {field}: {e}")
-                    result[field] = '[Decryption Failed]'
-            else:
-                result[field] = ''
-        
-        return result
+        return decrypt_secret_fields(secret_data.copy())
 
 
 class SecretViewSet(viewsets.ModelViewSet):
@@ -287,7 +392,7 @@ class SecretViewSet(viewsets.ModelViewSet):
         """Filter secrets by user's projects"""
         return Secret.objects.filter(
             environment__project__created_by=self.request.user
-        )
+        ).select_related('environment', 'created_by', 'updated_by')
     
     @action(detail=False, methods=['get'], permission_classes=[])
     def get_by_key(self, request):
@@ -344,18 +449,7 @@ class SecretViewSet(viewsets.ModelViewSet):
         """Get a single secret with decrypted data"""
         secret = self.get_object()
         serializer = self.get_serializer(secret)
-        data = serializer.data
-        
-        # Decrypt all fields
-        for field in ['key', 'value', 'description']:
-            if field in data and data[field]:
-                try:
-                    data[field] = decrypt_value(data[field])
-                except Exception as e:
-                    logger.error(f"Failed to decrypt {field}: {e}")
-                    data[field] = '[Decryption Failed]'
-        
-        return Response(data)
+        return Response(decrypt_secret_fields(serializer.data))
     
     @transaction.atomic
     def update(self, request, *args, **kwargs):
@@ -371,17 +465,18 @@ class SecretViewSet(viewsets.ModelViewSet):
                 secret.value = encrypt_value(value)
             
             if key is not None:
-                encrypted_key = encrypt_value(key)
+                key_digest = digest_value(key)
                 # Check for duplicates
                 if Secret.objects.filter(
                     environment=secret.environment,
-                    key=encrypted_key
+                    key_digest=key_digest
                 ).exclude(id=secret.id).exists():
                     return Response(
                         {'error': 'A secret with this key already exists'},
                         status=status.HTTP_400_BAD_REQUEST
                     )
-                secret.key = encrypted_key
+                secret.key = encrypt_value(key)
+                secret.key_digest = key_digest
             
             if description is not None:
                 secret.description = encrypt_value(description) if description else ''
@@ -404,33 +499,14 @@ class SecretViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
-        # Return decrypted values
+        # Return decrypted values; fields that were sent are echoed back
+        # rather than decrypted again
         serializer = self.get_serializer(secret)
-        response_data = serializer.data
-        
-        if key is not None:
-            response_data['key'] = key
-        else:
-            try:
-                response_data['key'] = decrypt_value(secret.key)
-            except:
-                response_data['key'] = '[Decryption Failed]'
-        
-        if value is not None:
-            response_data['value'] = value
-        else:
-            try:
-                response_data['value'] = decrypt_value(secret.value)
-            except:
-                response_data['value'] = '[Decryption Failed]'
-        
-        if description is not None:
-            response_data['description'] = description
-        else:
-            try:
-                response_data['description'] = decrypt_value(secret.description) if secret.description else ''
-            except:
-                response_data['description'] = ''
+        sent = {'key': key, 'value': value, 'description': description}
+        response_data = decrypt_secret_fields(
+            serializer.data, [field for field in SECRET_FIELDS if sent[field] is None]
+        )
+        response_data.update({field: plaintext for field, plaintext in sent.items() if plaintext is not None})
         
         return Response(response_data)
     
@@ -453,7 +529,7 @@ class SecretViewSet(viewsets.ModelViewSet):
     def history(self, request, pk=None):
         """Get version history for a secret"""
         secret = self.get_object()
-        versions = secret.versions.all()[:20]  # Last 20 versions
+        versions = secret.versions.select_related('changed_by')[:20]  # Last 20 versions
         serializer = SecretVersionSerializer(versions, many=True)
         
         # Decrypt values
@@ -85,6 +85,11 @@ echo ""
 echo "[6/7] Running database migrations..."
 python manage.py migrate --noinput || true
 
+# Queued deployments do not survive a restart; fail the ones left behind
+python manage.py fail_abandoned_deployments || echo "⚠ Could not clean up abandoned deployments, continuing..."
+# Recorded backend PIDs may belong to other processes after a restart
+python manage.py clear_stale_backends || echo "⚠ Could not clear stale backend records, continuing..."
+
 # Step 7: Create OAuth application (after migrations)
 echo ""
 echo "[7/8] Setting up OAuth application..."